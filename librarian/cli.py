@@ -1,16 +1,52 @@
+import importlib
+from typing import Dict, List, Optional
+
 import click
 
-from .collections.books.cli import cli as books_cli
-from .collections.vinyl.cli import cli as vinyl_cli
+# The collections' command groups, which are only imported when they're used
+# so that running one collection's commands doesn't pay for importing the
+# others' dependencies.
+COMMANDS: Dict[str, str] = {
+    "books": "librarian.collections.books.cli:cli",
+    "vinyl": "librarian.collections.vinyl.cli:cli",
+}
+
+
+class LazyGroup(click.Group):
+    """
+    A click group that imports its subcommands the first time they're used.
+    """
+
+    def __init__(self, *args, lazy_commands: Dict[str, str], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_commands])
 
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:
+        if cmd_name in self.lazy_commands:
+            return self.load_command(cmd_name)
 
-@click.group()
+        return super().get_command(ctx, cmd_name)
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        module_name, attribute = self.lazy_commands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"{self.lazy_commands[cmd_name]} is not a click command."
+            )
+
+        return command
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
 @click.version_option()
 def cli():
     """
     Translate the library's collection into a SQLite database.
     """
-
-
-cli.add_command(books_cli, name="books")  # type: ignore
-cli.add_command(vinyl_cli, name="vinyl")  # type: ignore
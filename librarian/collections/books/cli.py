@@ -1,7 +1,15 @@
+import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
 import click
 
-from ...integrations.openlibrary import OpenLibraryClient
+from ...integrations.openlibrary import (
+    OpenLibraryDumpIndex,
+    get_openlibrary_client,
+)
 from ...settings import Settings
+from ...utils.compression import compress_table, decompress_table
 from ...utils.database import get_database
 from . import constants, service
 
@@ -19,10 +27,10 @@ def cli():
 )
 def add_book(isbn: str):
     """Add a book to the library's collection."""
-    db = get_database(Settings.BOOK_DB_PATH)
+    db = get_database(Settings.BOOK_DB_PATH, preset="import")
     service.build_database(db=db)
 
-    client = OpenLibraryClient()
+    client = get_openlibrary_client()
 
     book, works, authors = service.fetch_book_and_related_data(
         isbn,
@@ -35,29 +43,141 @@ def add_book(isbn: str):
 
 
 @cli.command(name="multi-add")
-def add_books():
+@click.option(
+    "--concurrency",
+    help="Number of books to fetch from OpenLibrary at the same time.",
+    default=constants.FETCH_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+def add_books(concurrency: int = constants.FETCH_CONCURRENCY):
     """
     Add multiple books to the library's collection through a text editor.
     """
-    db = get_database(Settings.BOOK_DB_PATH)
+    db = get_database(Settings.BOOK_DB_PATH, preset="import")
     service.build_database(db=db)
 
-    client = OpenLibraryClient()
+    client = get_openlibrary_client(pool_size=concurrency)
 
     # Capture the user's input from their text editor.
-    raw_isbns = click.edit()
+    raw_isbns = click.edit() or ""
 
     # Split the input into a list of ISBNs, removing any empty lines.
-    isbns = filter(lambda item: item, raw_isbns.splitlines())
-
-    for isbn in isbns:
-        book, works, authors = service.fetch_book_and_related_data(
-            isbn, client=client
+    isbns = [isbn.strip() for isbn in raw_isbns.splitlines() if isbn.strip()]
+
+    # The books are fetched concurrently, but they are all written to the
+    # database from this thread in a single transaction.
+    def on_missing(isbn_or_key: str):
+        click.echo(
+            f"We couldn't find {isbn_or_key} on OpenLibrary, "
+            "so it was skipped.",
+            err=True,
         )
 
-        service.upsert_book_and_related_data(
-            book=book, works=works, authors=authors, db=db
-        )
+    results = service.fetch_books_and_related_data(
+        isbns,
+        client=client,
+        db=db,
+        concurrency=concurrency,
+        on_missing=on_missing,
+    )
+    service.upsert_books_and_related_data(results, db=db)
+
+
+@cli.command(name="refresh")
+@click.option(
+    "--max-age",
+    help=(
+        "Refetch the books, works, and authors that haven't been fetched in "
+        "this many days."
+    ),
+    default=constants.OPENLIBRARY_ENTITY_MAX_AGE.days,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--concurrency",
+    help="Number of requests to make to OpenLibrary at the same time.",
+    default=constants.FETCH_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+def refresh_books(
+    max_age: int = constants.OPENLIBRARY_ENTITY_MAX_AGE.days,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+):
+    """
+    Refresh the stale books, works, and authors from OpenLibrary.
+    """
+    db = get_database(Settings.BOOK_DB_PATH, preset="import")
+    service.build_database(db=db)
+
+    client = get_openlibrary_client(pool_size=concurrency)
+
+    def on_missing(key: str):
+        click.echo(f"We couldn't refetch {key} from OpenLibrary.", err=True)
+
+    fetched, changed = service.refresh_books(
+        db=db,
+        client=client,
+        max_age=datetime.timedelta(days=max_age),
+        concurrency=concurrency,
+        on_missing=on_missing,
+    )
+
+    click.echo(f"Refetched {fetched} entities, {changed} of them had changed.")
+
+
+@cli.command(name="import-dump")
+@click.argument(
+    "dumps",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--processes",
+    help="Number of processes to parse the dumps with, one per CPU by default.",
+    default=None,
+    type=click.IntRange(min=1),
+)
+def import_dump(dumps: Tuple[Path, ...], processes: Optional[int] = None):
+    """
+    Import OpenLibrary's editions, works, and authors dumps into a local
+    index, which is used before OpenLibrary's API when adding books.
+    """
+    index = OpenLibraryDumpIndex(path=Settings.OPENLIBRARY_DUMP_INDEX_PATH)
+
+    for dump in dumps:
+        count = index.import_dump(dump, processes=processes)
+        click.echo(f"Imported {count} entities from {dump.name}.")
+
+
+@cli.command(name="compress")
+@click.option(
+    "--decompress",
+    help="Rewrite the compressed data as plain JSON, and stop compressing it.",
+    is_flag=True,
+    default=False,
+)
+def compress(decompress: bool = False):
+    """
+    Compress the OpenLibrary entities' data, with a dictionary trained on
+    them, to shrink the database. New entities are compressed as they're
+    added once the data has been compressed.
+    """
+    db = get_database(Settings.BOOK_DB_PATH, preset="import")
+    service.build_database(db=db)
+
+    if decompress:
+        count = decompress_table(db, "openlibrary_entities", pk="key")
+    else:
+        count = compress_table(db, "openlibrary_entities", pk="key")
+
+    # Reclaim the space freed by compressing the rows.
+    db.vacuum()
+
+    click.echo(f"Rewrote {count} OpenLibrary entities.")
 
 
 @cli.command(name="list")
@@ -75,9 +195,11 @@ def list_books(output_format: str = ""):
 
     books = service.list_books(db=db)
 
-    # If the user specified a format, output the results in that format.
+    # If the user specified a format, output the results in that format. The
+    # output is streamed as the books are read from the database.
     if output_format in constants.OUTPUT_FORMATS:
-        click.echo(service.format_books(books, output_format))
+        for chunk in service.format_books(books, output_format):
+            click.echo(chunk, nl=False)
     else:
         click.echo_via_pager(service.format_books_as_table(books))
 
@@ -91,15 +213,34 @@ def list_books(output_format: str = ""):
     type=click.Choice(choices=constants.OUTPUT_FORMATS),
     help="Format to output the results.",
 )
-def search_books(query: str, output_format: str = ""):
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    default=None,
+    help="The maximum number of results to output.",
+)
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    help="The number of results to skip.",
+)
+def search_books(
+    query: str,
+    output_format: str = "",
+    limit: Optional[int] = None,
+    offset: int = 0,
+):
     """Search the library's collection."""
     db = get_database(Settings.BOOK_DB_PATH)
     service.build_database(db=db)
 
-    books = service.search_books(query, db=db)
+    books = service.search_books(query, db=db, limit=limit, offset=offset)
 
-    # If the user specified a format, output the results in that format.
+    # If the user specified a format, output the results in that format. The
+    # output is streamed as the books are read from the database.
     if output_format in constants.OUTPUT_FORMATS:
-        click.echo(service.format_books_as_csv(books))
+        for chunk in service.format_books(books, output_format):
+            click.echo(chunk, nl=False)
     else:
         click.echo_via_pager(service.format_books_as_table(books))
@@ -1,11 +1,21 @@
+import datetime
 from typing import Final
 
 OUTPUT_FORMAT_CSV: Final = "csv"
 OUTPUT_FORMAT_JSON: Final = "json"
+OUTPUT_FORMAT_JSON_LINES: Final = "jsonl"
 OUTPUT_FORMAT_MARKDOWN: Final = "markdown"
 
 OUTPUT_FORMATS: Final = [
     OUTPUT_FORMAT_CSV,
     OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSON_LINES,
     OUTPUT_FORMAT_MARKDOWN,
 ]
+
+# The number of books to fetch from OpenLibrary at the same time.
+FETCH_CONCURRENCY: Final = 8
+
+# How long the OpenLibrary entities saved in the database are reused for,
+# before they are fetched from OpenLibrary again.
+OPENLIBRARY_ENTITY_MAX_AGE: Final = datetime.timedelta(days=30)
@@ -1,12 +1,26 @@
 import datetime
 import typing as t
+from concurrent.futures import Executor, ThreadPoolExecutor
 
-from pandas import DataFrame
+from requests import HTTPError
 from sqlite_utils.db import Database, Table
-from tabulate import tabulate
 
 from ...integrations import openlibrary
-from ...utils.database import get_table, get_view
+from ...utils import formatters
+from ...utils.compression import DataCompressor, register_functions
+from ...utils.database import (
+    CONTENT_HASH_COLUMN,
+    LOOKUP_CHUNK_SIZE,
+    add_content_hash,
+    add_fetched_at_column,
+    add_missing_columns,
+    create_unique_index,
+    get_ids_by_column,
+    get_rows_by_column,
+    get_table,
+    mark_fetched,
+    upsert_records,
+)
 from . import constants
 
 
@@ -83,6 +97,28 @@ def build_database(*, db: Database):
             ),
         )
 
+    # Unique indexes on the natural keys, which the upserts use to detect
+    # conflicts. These are created outside the table creation so existing
+    # databases get them too, once their duplicates are removed.
+    create_unique_index(
+        books_table,
+        "openlibrary_key",
+        references=[(books_authors_table.name, "book_id")],
+    )
+    create_unique_index(
+        authors_table,
+        "openlibrary_key",
+        references=[(books_authors_table.name, "author_id")],
+    )
+
+    # The content hashes the upserts use to skip unchanged rows, added
+    # outside the table creation so existing databases get them too.
+    for table in (openlibrary_entities_table, books_table, authors_table):
+        add_missing_columns(table, {CONTENT_HASH_COLUMN: str})
+
+    # When the entities were last fetched, which their staleness is based on.
+    add_fetched_at_column(openlibrary_entities_table)
+
     # Views
     db.create_view(
         name="list_books_and_authors",
@@ -107,6 +143,123 @@ def build_database(*, db: Database):
         replace=True,
     )
 
+    build_books_listing(db=db)
+
+    # The SQL function to read the, optionally compressed, data columns.
+    register_functions(db.conn)
+
+
+# Rebuilds the `books_listing` rows of the books matching the where clause,
+# used by the triggers below to keep the listing up to date.
+BOOKS_LISTING_REFRESH_SQL = """
+insert into books_listing (id, title, description, isbn, authors)
+select
+    books.id,
+    books.title,
+    books.description,
+    iif(books.isbn_13, books.isbn_13, books.isbn_10),
+    (
+        select group_concat(authors.name, ', ')
+        from books_authors
+        join authors on authors.id = books_authors.author_id
+        where books_authors.book_id = books.id
+    )
+from books
+where {where}
+on conflict (id) do update set
+    title = excluded.title,
+    description = excluded.description,
+    isbn = excluded.isbn,
+    authors = excluded.authors;
+"""
+
+# The columns of the `books_listing` search index, and how much a match in
+# each of them counts towards a book's rank.
+BOOKS_LISTING_SEARCH_COLUMNS = ["title", "authors", "description"]
+BOOKS_LISTING_SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+BOOKS_LISTING_TRIGGERS = {
+    "books_listing_books_ai": (
+        "after insert on books",
+        BOOKS_LISTING_REFRESH_SQL.format(where="books.id = new.id"),
+    ),
+    "books_listing_books_au": (
+        "after update on books",
+        BOOKS_LISTING_REFRESH_SQL.format(where="books.id = new.id"),
+    ),
+    "books_listing_books_ad": (
+        "after delete on books",
+        "delete from books_listing where id = old.id;",
+    ),
+    "books_listing_books_authors_ai": (
+        "after insert on books_authors",
+        BOOKS_LISTING_REFRESH_SQL.format(where="books.id = new.book_id"),
+    ),
+    "books_listing_books_authors_ad": (
+        "after delete on books_authors",
+        BOOKS_LISTING_REFRESH_SQL.format(where="books.id = old.book_id"),
+    ),
+    "books_listing_authors_au": (
+        "after update of name on authors",
+        BOOKS_LISTING_REFRESH_SQL.format(
+            where="books.id in (select book_id from books_authors "
+            "where author_id = new.id)"
+        ),
+    ),
+    "books_listing_authors_ad": (
+        "after delete on authors",
+        BOOKS_LISTING_REFRESH_SQL.format(
+            where="books.id in (select book_id from books_authors "
+            "where author_id = old.id)"
+        ),
+    ),
+}
+
+
+def build_books_listing(*, db: Database):
+    """
+    Build the `books_listing` table, a denormalised copy of each book with
+    its authors that the list and search commands read from.
+
+    The table is kept up to date by triggers on the books, authors and
+    books_authors tables, so it never needs to be aggregated at read time.
+    """
+    books_listing_table: Table = db.table("books_listing")  # type: ignore
+
+    if books_listing_table.exists() is False:
+        books_listing_table.create(
+            columns={
+                "id": int,
+                "title": str,
+                "description": str,
+                "isbn": int,
+                "authors": str,
+            },
+            pk="id",
+            foreign_keys=(("id", "books", "id"),),
+        )
+
+        # Fill the table in from any books that are already in the database.
+        with db.conn:
+            db.execute(BOOKS_LISTING_REFRESH_SQL.format(where="1"))
+
+    books_listing_table.create_index(["title"], if_not_exists=True)
+
+    # The search index covers the title, authors and description of each book,
+    # so a search is a single ranked query against it.
+    if books_listing_table.detect_fts() is None:
+        books_listing_table.enable_fts(
+            BOOKS_LISTING_SEARCH_COLUMNS, create_triggers=True
+        )
+
+    db.executescript(
+        "\n".join(
+            f"create trigger if not exists [{name}] {event} "
+            f"begin {statement} end;"
+            for name, (event, statement) in BOOKS_LISTING_TRIGGERS.items()
+        )
+    )
+
 
 def get_openlibrary_book_cover_url(
     book: openlibrary.OpenLibraryBook,
@@ -129,6 +282,34 @@ OpenLibraryEntities = t.Union[
 ]
 
 
+def transform_openlibrary_entity(
+    entity: OpenLibraryEntities,
+    compressor: t.Optional[DataCompressor] = None,
+) -> t.Dict[str, t.Any]:
+    """
+    Transform an OpenLibrary entity to something that can be safely inserted
+    to the openlibrary_entities table on the database, compressing its data
+    if a compressor is given.
+
+    The content hash is of the uncompressed data, so it doesn't change when
+    the table is compressed, or recompressed with a new dictionary.
+    """
+    record: t.Dict[str, t.Any] = add_content_hash(
+        {
+            "key": entity.key,
+            "type": entity.type_key,
+            "data": entity.data,
+            "updated_at": datetime.datetime.utcnow(),
+        },
+        pk="key",
+    )
+
+    if compressor is not None:
+        record["data"] = compressor.encode("openlibrary_entities", entity.data)
+
+    return record
+
+
 def upsert_openlibrary_entities(
     entities: t.Iterable[OpenLibraryEntities],
     *,
@@ -138,42 +319,132 @@ def upsert_openlibrary_entities(
     Upsert all the entities from OpenLibrary into the SQLite database.
     """
     table = get_table("openlibrary_entities", db=db)
+    compressor = DataCompressor(db.conn)
+
+    records = [
+        transform_openlibrary_entity(entity, compressor) for entity in entities
+    ]
 
-    records = []
-    for entity in entities:
-        records.append(
-            {
-                "key": entity.key,
-                "type": entity.type_key,
-                "data": entity.data,
-                "updated_at": datetime.datetime.utcnow(),
-            }
+    with db.conn:
+        upsert_records(
+            records, table=table, pk="key", hash_column=CONTENT_HASH_COLUMN
+        )
+        mark_fetched(
+            [record["key"] for record in records], table=table, pk="key"
         )
 
-    table.upsert_all(records, pk="key")
 
+def get_openlibrary_entities(
+    keys: t.Iterable[str],
+    *,
+    db: Database,
+    fetched_after: t.Optional[datetime.datetime] = None,
+) -> t.Dict[str, t.Dict[str, t.Any]]:
+    """
+    Get the API responses saved in the SQLite database for the given
+    OpenLibrary keys, optionally only the ones fetched after a given time.
+    """
+    table: Table = db.table("openlibrary_entities")  # type: ignore
+    if table.exists() is False:
+        return {}
 
-def upsert_book_from_open_library(
-    book: openlibrary.OpenLibraryBook,
-    works: t.List[openlibrary.OpenLibraryWork],
+    rows = get_rows_by_column(
+        "key", keys, table=table, select="key, data, fetched_at"
+    )
+    compressor = DataCompressor(db.conn)
+
+    return {
+        row["key"]: compressor.load(row["data"])
+        for row in rows
+        if fetched_after is None
+        or (
+            row["fetched_at"] is not None
+            and row["fetched_at"] >= fetched_after.isoformat()
+        )
+    }
+
+
+def get_fresh_openlibrary_entities(
+    keys: t.List[str],
     *,
     db: Database,
-) -> t.Dict[str, t.Any]:
+    max_age: datetime.timedelta = constants.OPENLIBRARY_ENTITY_MAX_AGE,
+) -> t.Dict[str, t.Dict[str, t.Any]]:
     """
-    Upsert a book into the SQLite database.
+    Get the API responses saved in the SQLite database for the given
+    OpenLibrary keys, if they were fetched within the max age.
     """
-    table = get_table("books", db=db)
+    return get_openlibrary_entities(
+        keys,
+        db=db,
+        fetched_after=datetime.datetime.utcnow() - max_age,
+    )
+
 
-    existing_book_ids = list(
-        table.pks_and_rows_where(
-            where="openlibrary_key = :key", where_args={"key": book.key}
+def get_stale_openlibrary_entities(
+    *,
+    db: Database,
+    max_age: datetime.timedelta = constants.OPENLIBRARY_ENTITY_MAX_AGE,
+) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Get the API responses saved in the SQLite database that haven't been
+    fetched within the max age.
+    """
+    table = get_table("openlibrary_entities", db=db)
+    fetched_before = datetime.datetime.utcnow() - max_age
+
+    return list(
+        table.rows_where(
+            where="fetched_at is null or fetched_at < ?",
+            where_args=[fetched_before.isoformat()],
+            select="key, type, data",
         )
     )
 
-    existing_book_id: t.Optional[int] = None
-    if existing_book_ids:
-        existing_book_id, _ = existing_book_ids[0]
 
+def get_openlibrary_editions_of_works(
+    work_keys: t.Iterable[str],
+    *,
+    db: Database,
+) -> t.Dict[str, t.Dict[str, t.Any]]:
+    """
+    Get the API responses saved in the SQLite database for the editions of
+    the given works.
+    """
+    work_keys = [f"/works/{work_key}" for work_key in dict.fromkeys(work_keys)]
+    compressor = DataCompressor(db.conn)
+
+    editions: t.Dict[str, t.Dict[str, t.Any]] = {}
+    for index in range(0, len(work_keys), LOOKUP_CHUNK_SIZE):
+        chunk = work_keys[index : index + LOOKUP_CHUNK_SIZE]
+        rows = db.query(
+            """
+            select key, data from openlibrary_entities
+            where type = 'edition' and exists (
+                select 1 from json_each(
+                    decompress_data(openlibrary_entities.data), '$.works'
+                )
+                where json_extract(json_each.value, '$.key') in ({})
+            )
+            """.format(
+                ",".join("?" * len(chunk))
+            ),
+            chunk,
+        )
+        for row in rows:
+            editions[row["key"]] = compressor.load(row["data"])
+
+    return editions
+
+
+def transform_openlibrary_book(
+    book: openlibrary.OpenLibraryBook,
+    works: t.List[openlibrary.OpenLibraryWork],
+) -> t.Dict[str, t.Any]:
+    """
+    Transform an OpenLibraryBook dataclass, and its works, to something that
+    can be safely inserted to the books table on the database.
+    """
     record: t.Dict[str, t.Any] = {
         "openlibrary_key": book.key,
         "title": book.title,
@@ -192,44 +463,113 @@ def upsert_book_from_open_library(
         work = works[0]
         record["description"] = work.description
 
-    if existing_book_id is not None:
-        record["id"] = existing_book_id
-        table = table.upsert(record, pk="id")
-    else:
-        record["created_at"] = datetime.datetime.utcnow()
-        table = table.insert(record)
+    return record
 
-    return table.get(table.last_pk)  # type: ignore
+
+def upsert_book_from_open_library(
+    book: openlibrary.OpenLibraryBook,
+    works: t.List[openlibrary.OpenLibraryWork],
+    *,
+    db: Database,
+) -> t.Dict[str, t.Any]:
+    """
+    Upsert a book into the SQLite database.
+    """
+    table = get_table("books", db=db)
+
+    record = transform_openlibrary_book(book, works)
+    record["created_at"] = datetime.datetime.utcnow()
+
+    with db.conn:
+        upsert_records(
+            [record],
+            table=table,
+            pk="openlibrary_key",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+
+    return next(table.rows_where("openlibrary_key = ?", [book.key]))
 
 
 def get_book_from_openlibrary(
     isbn: str,
     *,
     client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
 ) -> openlibrary.OpenLibraryBook:
     """
-    Get a book from OpenLibrary's API.
+    Get a book from the OpenLibrary dump index, if given, or else
+    OpenLibrary's API.
     """
+    if index is not None:
+        book = index.get_book_from_isbn(isbn)
+        if book is not None:
+            return book
+
     if client is None:
-        client = openlibrary.OpenLibraryClient()
+        client = openlibrary.get_openlibrary_client()
 
     return client.get_book_from_isbn(isbn=isbn)
 
 
+def get_books_from_openlibrary(
+    isbns: t.List[str],
+    *,
+    client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
+) -> t.Dict[str, openlibrary.OpenLibraryBook]:
+    """
+    Get multiple books from the OpenLibrary dump index, if given, and
+    OpenLibrary's API for the rest, keyed by their ISBN.
+    """
+    books: t.Dict[str, openlibrary.OpenLibraryBook] = {}
+    if index is not None:
+        books = index.get_books_from_isbns(isbns)
+        isbns = [isbn for isbn in isbns if isbn not in books]
+        if not isbns:
+            return books
+
+    if client is None:
+        client = openlibrary.get_openlibrary_client()
+
+    return {**books, **client.get_books_from_isbns(isbns=isbns)}
+
+
 def get_work_from_openlibrary(
     openlibrary_key: str,
     *,
     client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
 ) -> openlibrary.OpenLibraryWork:
     """
-    Get a work from OpenLibrary's API.
+    Get a work from the OpenLibrary dump index, if given, or else
+    OpenLibrary's API.
     """
+    if index is not None:
+        work = index.get_work(openlibrary_key)
+        if work is not None:
+            return work
+
     if client is None:
-        client = openlibrary.OpenLibraryClient()
+        client = openlibrary.get_openlibrary_client()
 
     return client.get_work(key=openlibrary_key)
 
 
+def transform_openlibrary_author(
+    author: openlibrary.OpenLibraryAuthor,
+) -> t.Dict[str, t.Any]:
+    """
+    Transform an OpenLibraryAuthor dataclass to something that can be safely
+    inserted to the authors table on the database.
+    """
+    return {
+        "openlibrary_key": author.key,
+        "name": author.name,
+        "updated_at": datetime.datetime.utcnow(),
+    }
+
+
 def upset_author_from_openlibrary(
     author: openlibrary.OpenLibraryAuthor,
     *,
@@ -240,42 +580,37 @@ def upset_author_from_openlibrary(
     """
     table = get_table("authors", db=db)
 
-    existing_author_ids = list(
-        table.pks_and_rows_where(
-            where="openlibrary_key = :key", where_args={"key": author.key}
-        )
-    )
-
-    existing_author_id: t.Optional[int] = None
-    if existing_author_ids:
-        existing_author_id, _ = existing_author_ids[0]
+    record = transform_openlibrary_author(author)
+    record["created_at"] = datetime.datetime.utcnow()
 
-    record: t.Dict[str, t.Any] = {
-        "openlibrary_key": author.key,
-        "name": author.name,
-        "updated_at": datetime.datetime.utcnow(),
-    }
-
-    if existing_author_id is not None:
-        record["id"] = existing_author_id
-        table = table.upsert(record, pk="id")
-    else:
-        record["created_at"] = datetime.datetime.utcnow()
-        table = table.insert(record)
+    with db.conn:
+        upsert_records(
+            [record],
+            table=table,
+            pk="openlibrary_key",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
 
-    return table.get(table.last_pk)  # type: ignore
+    return next(table.rows_where("openlibrary_key = ?", [author.key]))
 
 
 def get_author_from_openlibrary(
     openlibrary_key: str,
     *,
     client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
 ) -> openlibrary.OpenLibraryAuthor:
     """
-    Add an author to the collection.
+    Get an author from the OpenLibrary dump index, if given, or else
+    OpenLibrary's API.
     """
+    if index is not None:
+        author = index.get_author(openlibrary_key)
+        if author is not None:
+            return author
+
     if client is None:
-        client = openlibrary.OpenLibraryClient()
+        client = openlibrary.get_openlibrary_client()
 
     return client.get_author(key=openlibrary_key)
 
@@ -306,38 +641,282 @@ FETCH_BOOK_AND_RELATED_DATA_RETURN = t.Tuple[
 ]
 
 
-def fetch_book_and_related_data(
-    isbn: str,
+FETCH_RELATED_DATA_RETURN = t.Tuple[
+    t.List[openlibrary.OpenLibraryWork],
+    t.List[openlibrary.OpenLibraryAuthor],
+]
+
+
+def get_author_keys(
+    book: openlibrary.OpenLibraryBook,
+    works: t.List[openlibrary.OpenLibraryWork],
+) -> t.List[str]:
+    """
+    Get the keys of a book's authors, preferring the authors of its works.
+    """
+    if works:
+        return [author_key for work in works for author_key in work.author_keys]
+
+    return book.author_keys
+
+
+def fetch_related_data(
+    book: openlibrary.OpenLibraryBook,
     *,
     client: t.Optional[openlibrary.OpenLibraryClient] = None,
-) -> FETCH_BOOK_AND_RELATED_DATA_RETURN:
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
+) -> FETCH_RELATED_DATA_RETURN:
     """
-    Fetch a book and all it's related data from OpenLibrary.
+    Fetch a book's works and authors from OpenLibrary.
     """
     if client is None:
-        client = openlibrary.OpenLibraryClient()
+        client = openlibrary.get_openlibrary_client()
 
-    book = get_book_from_openlibrary(isbn=isbn, client=client)
     works = [
-        get_work_from_openlibrary(work_key, client=client)
+        get_work_from_openlibrary(work_key, client=client, index=index)
         for work_key in book.work_keys
     ]
 
-    if works:
-        author_keys = [
-            author_key for work in works for author_key in work.author_keys
-        ]
-    else:
-        author_keys = book.author_keys
-
     authors = [
-        get_author_from_openlibrary(openlibrary_key=author_key, client=client)
-        for author_key in author_keys
+        get_author_from_openlibrary(
+            openlibrary_key=author_key, client=client, index=index
+        )
+        for author_key in get_author_keys(book, works)
     ]
 
+    return works, authors
+
+
+def fetch_book_and_related_data(
+    isbn: str,
+    *,
+    client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
+) -> FETCH_BOOK_AND_RELATED_DATA_RETURN:
+    """
+    Fetch a book and all it's related data from OpenLibrary.
+
+    The book, works, and authors are looked up in the OpenLibrary dump index
+    first, defaulting to the imported one, and only fetched from the API if
+    they aren't there.
+    """
+    if client is None:
+        client = openlibrary.get_openlibrary_client()
+
+    if index is None:
+        index = openlibrary.get_openlibrary_dump_index()
+
+    book = get_book_from_openlibrary(isbn=isbn, client=client, index=index)
+    works, authors = fetch_related_data(book, client=client, index=index)
+
     return book, works, authors
 
 
+OpenLibraryEntity = t.TypeVar(
+    "OpenLibraryEntity",
+    openlibrary.OpenLibraryAuthor,
+    openlibrary.OpenLibraryWork,
+)
+
+
+class OpenLibraryEntityResolver:
+    """
+    Resolves the works and authors for a batch of books, fetching each unique
+    key from OpenLibrary once and reusing the fresh entities already saved in
+    the SQLite database, or in the OpenLibrary dump index.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: openlibrary.OpenLibraryClient,
+        executor: Executor,
+        db: t.Optional[Database] = None,
+        index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
+        max_age: datetime.timedelta = constants.OPENLIBRARY_ENTITY_MAX_AGE,
+        on_missing: t.Optional[t.Callable[[str], None]] = None,
+    ):
+        self.client = client
+        self.executor = executor
+        self.db = db
+        self.index = index
+        self.max_age = max_age
+        self.on_missing = on_missing
+
+    def get_works(
+        self, keys: t.Iterable[str]
+    ) -> t.Dict[str, openlibrary.OpenLibraryWork]:
+        """
+        Resolve the works for the given keys.
+        """
+        return self.resolve(
+            keys,
+            fetch=self.client.get_work,
+            from_data=openlibrary.OpenLibraryWork.from_data,
+            lookup=self.index.get_work if self.index is not None else None,
+        )
+
+    def get_authors(
+        self, keys: t.Iterable[str]
+    ) -> t.Dict[str, openlibrary.OpenLibraryAuthor]:
+        """
+        Resolve the authors for the given keys.
+        """
+        return self.resolve(
+            keys,
+            fetch=self.client.get_author,
+            from_data=openlibrary.OpenLibraryAuthor.from_data,
+            lookup=self.index.get_author if self.index is not None else None,
+        )
+
+    def resolve(
+        self,
+        keys: t.Iterable[str],
+        *,
+        fetch: t.Callable[[str], OpenLibraryEntity],
+        from_data: t.Callable[[t.Dict[str, t.Any]], OpenLibraryEntity],
+        lookup: t.Optional[
+            t.Callable[[str], t.Optional[OpenLibraryEntity]]
+        ] = None,
+    ) -> t.Dict[str, OpenLibraryEntity]:
+        """
+        Resolve the entities for the given keys, from the database if they
+        are fresh, then the dump index, and from OpenLibrary if they aren't
+        in either. Keys OpenLibrary fails to return are left out, and passed
+        to `on_missing` if it's given, so they don't stop the rest.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+
+        entities: t.Dict[str, OpenLibraryEntity] = {}
+
+        if self.db is not None:
+            saved_entities = get_fresh_openlibrary_entities(
+                unique_keys, db=self.db, max_age=self.max_age
+            )
+            for key, data in saved_entities.items():
+                entities[key] = from_data(data)
+
+        if lookup is not None:
+            for key in unique_keys:
+                if key in entities:
+                    continue
+
+                entity = lookup(key)
+                if entity is not None:
+                    entities[key] = entity
+
+        def fetch_entity(key: str) -> t.Optional[OpenLibraryEntity]:
+            try:
+                return fetch(key)
+            except HTTPError:
+                return None
+
+        missing_keys = [key for key in unique_keys if key not in entities]
+        for key, entity in zip(
+            missing_keys, self.executor.map(fetch_entity, missing_keys)
+        ):
+            if entity is None:
+                if self.on_missing is not None:
+                    self.on_missing(key)
+                continue
+
+            entities[key] = entity
+
+        return entities
+
+
+def fetch_books_and_related_data(
+    isbns: t.Iterable[str],
+    *,
+    client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    db: t.Optional[Database] = None,
+    index: t.Optional[openlibrary.OpenLibraryDumpIndex] = None,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+    on_missing: t.Optional[t.Callable[[str], None]] = None,
+) -> t.Generator[FETCH_BOOK_AND_RELATED_DATA_RETURN, None, None]:
+    """
+    Fetch multiple books and all their related data from OpenLibrary,
+    yielding the results in the same order as the ISBNs. The ISBNs that
+    OpenLibrary doesn't know about are skipped, and passed to `on_missing`
+    if it's given, so they don't stop the rest of the books being added.
+    The keys of works and authors that can't be fetched are passed to it
+    too, and their books are added without them.
+
+    The books are resolved in bulk, then each unique work and author across
+    the whole batch is fetched once, concurrently. If a database is given,
+    the works and authors it has fresh copies of aren't fetched at all, and
+    nor is anything in the OpenLibrary dump index, defaulting to the imported
+    one.
+    """
+    if client is None:
+        client = openlibrary.get_openlibrary_client(pool_size=concurrency)
+
+    if index is None:
+        index = openlibrary.get_openlibrary_dump_index()
+
+    isbns = list(isbns)
+    books = get_books_from_openlibrary(isbns, client=client, index=index)
+
+    def fetch_book(isbn: str) -> t.Optional[openlibrary.OpenLibraryBook]:
+        try:
+            return get_book_from_openlibrary(isbn=isbn, client=client)
+        except HTTPError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Fallback to the ISBN endpoint for the books the bulk API missed.
+        missing_isbns = [
+            isbn for isbn in dict.fromkeys(isbns) if isbn not in books
+        ]
+        for isbn, missing_book in zip(
+            missing_isbns, executor.map(fetch_book, missing_isbns)
+        ):
+            if missing_book is not None:
+                books[isbn] = missing_book
+
+        resolver = OpenLibraryEntityResolver(
+            client=client,
+            executor=executor,
+            db=db,
+            index=index,
+            on_missing=on_missing,
+        )
+
+        works = resolver.get_works(
+            work_key for book in books.values() for work_key in book.work_keys
+        )
+
+        def get_book_works(
+            book: openlibrary.OpenLibraryBook,
+        ) -> t.List[openlibrary.OpenLibraryWork]:
+            return [
+                works[work_key]
+                for work_key in book.work_keys
+                if work_key in works
+            ]
+
+        authors = resolver.get_authors(
+            author_key
+            for book in books.values()
+            for author_key in get_author_keys(book, get_book_works(book))
+        )
+
+    for isbn in isbns:
+        if isbn not in books:
+            if on_missing is not None:
+                on_missing(isbn)
+            continue
+
+        book = books[isbn]
+        book_works = get_book_works(book)
+        book_authors = [
+            authors[author_key]
+            for author_key in get_author_keys(book, book_works)
+            if author_key in authors
+        ]
+        yield book, book_works, book_authors
+
+
 def upsert_book_and_related_data(
     *,
     book: openlibrary.OpenLibraryBook,
@@ -362,6 +941,231 @@ def upsert_book_and_related_data(
     )
 
 
+def upsert_books_and_related_data(
+    items: t.Iterable[FETCH_BOOK_AND_RELATED_DATA_RETURN],
+    *,
+    db: Database,
+) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Upsert many books and all their related data from OpenLibrary in a single
+    transaction, returning the books' rows in the same order.
+    """
+    books_table = get_table("books", db=db)
+    authors_table = get_table("authors", db=db)
+    books_authors_table = get_table("books_authors", db=db)
+    openlibrary_entities_table = get_table("openlibrary_entities", db=db)
+
+    items = list(items)
+    created_at = datetime.datetime.utcnow()
+    compressor = DataCompressor(db.conn)
+
+    book_records: t.Dict[str, t.Dict[str, t.Any]] = {}
+    author_records: t.Dict[str, t.Dict[str, t.Any]] = {}
+    entity_records: t.Dict[str, t.Dict[str, t.Any]] = {}
+
+    for book, works, authors in items:
+        book_records[book.key] = transform_openlibrary_book(book, works)
+
+        for author in authors:
+            author_records[author.key] = transform_openlibrary_author(author)
+
+        entities: t.List[OpenLibraryEntities] = [book, *works, *authors]
+        for entity in entities:
+            entity_records[entity.key] = transform_openlibrary_entity(
+                entity, compressor
+            )
+
+    with db.conn:
+        # Save everything to our first class tables.
+        for table, records in (
+            (books_table, book_records),
+            (authors_table, author_records),
+        ):
+            for record in records.values():
+                record["created_at"] = created_at
+
+            upsert_records(
+                records.values(),
+                table=table,
+                pk="openlibrary_key",
+                hash_column=CONTENT_HASH_COLUMN,
+            )
+
+        book_ids = get_ids_by_column(
+            "openlibrary_key", book_records.keys(), table=books_table
+        )
+        author_ids = get_ids_by_column(
+            "openlibrary_key", author_records.keys(), table=authors_table
+        )
+
+        upsert_records(
+            (
+                {
+                    "book_id": book_ids[book.key],
+                    "author_id": author_ids[author.key],
+                }
+                for book, _, authors in items
+                for author in authors
+            ),
+            table=books_authors_table,
+            pk=("book_id", "author_id"),
+        )
+
+        # Save the API responses from Openlibrary.
+        upsert_records(
+            entity_records.values(),
+            table=openlibrary_entities_table,
+            pk="key",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        mark_fetched(
+            entity_records.keys(), table=openlibrary_entities_table, pk="key"
+        )
+
+    book_rows = {
+        row["openlibrary_key"]: row
+        for row in get_rows_by_column(
+            "openlibrary_key", book_records.keys(), table=books_table
+        )
+    }
+
+    return [book_rows[book.key] for book, _, _ in items]
+
+
+def refresh_books(
+    *,
+    db: Database,
+    client: t.Optional[openlibrary.OpenLibraryClient] = None,
+    max_age: datetime.timedelta = constants.OPENLIBRARY_ENTITY_MAX_AGE,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+    on_missing: t.Optional[t.Callable[[str], None]] = None,
+) -> t.Tuple[int, int]:
+    """
+    Refetch the OpenLibrary entities that haven't been fetched within the max
+    age, only rewriting the rows of the entities with a new revision. The
+    keys OpenLibrary fails to return are skipped, and passed to `on_missing`
+    if it's given, so they don't stop the rest being refreshed.
+
+    Returns the number of entities refetched and the number that changed.
+    """
+    if client is None:
+        client = openlibrary.get_openlibrary_client(pool_size=concurrency)
+
+    fetchers: t.Dict[str, t.Callable[[str], OpenLibraryEntities]] = {
+        "edition": client.get_book,
+        "work": client.get_work,
+        "author": client.get_author,
+    }
+
+    stale_rows = [
+        row
+        for row in get_stale_openlibrary_entities(db=db, max_age=max_age)
+        if row["type"] in fetchers
+    ]
+
+    def fetch(row: t.Dict[str, t.Any]) -> t.Optional[OpenLibraryEntities]:
+        try:
+            return fetchers[row["type"]](row["key"])
+        except HTTPError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        fetched = list(zip(stale_rows, executor.map(fetch, stale_rows)))
+
+    # The entities that couldn't be fetched stay stale, to be retried.
+    fetched_rows: t.List[t.Dict[str, t.Any]] = []
+    entities: t.List[OpenLibraryEntities] = []
+    for row, fetched_entity in fetched:
+        if fetched_entity is None:
+            if on_missing is not None:
+                on_missing(row["key"])
+            continue
+
+        fetched_rows.append(row)
+        entities.append(fetched_entity)
+
+    compressor = DataCompressor(db.conn)
+    changed_entities: t.List[OpenLibraryEntities] = []
+    for row, entity in zip(fetched_rows, entities):
+        latest_revision = compressor.load(row["data"]).get("latest_revision")
+        if entity.latest_revision is None or (
+            entity.latest_revision != latest_revision
+        ):
+            changed_entities.append(entity)
+
+    books: t.Dict[str, openlibrary.OpenLibraryBook] = {}
+    works: t.Dict[str, openlibrary.OpenLibraryWork] = {}
+    authors: t.List[openlibrary.OpenLibraryAuthor] = []
+    for entity in changed_entities:
+        if isinstance(entity, openlibrary.OpenLibraryBook):
+            books[entity.key] = entity
+        elif isinstance(entity, openlibrary.OpenLibraryWork):
+            works[entity.key] = entity
+        else:
+            authors.append(entity)
+
+    # A work's description is saved on its editions' book rows, so they need
+    # rewriting when the work changes.
+    editions = get_openlibrary_editions_of_works(works.keys(), db=db)
+    for key, data in editions.items():
+        if key not in books:
+            books[key] = openlibrary.OpenLibraryBook.from_data(data)
+
+    saved_works = get_openlibrary_entities(
+        (
+            work_key
+            for book in books.values()
+            for work_key in book.work_keys
+            if work_key not in works
+        ),
+        db=db,
+    )
+    for key, data in saved_works.items():
+        works[key] = openlibrary.OpenLibraryWork.from_data(data)
+
+    # Only the changed entities are rewritten, so their `updated_at` only
+    # moves when they really change, but every refetched entity is fresh.
+    with db.conn:
+        upsert_records(
+            [
+                transform_openlibrary_book(
+                    book,
+                    [
+                        works[work_key]
+                        for work_key in book.work_keys
+                        if work_key in works
+                    ],
+                )
+                for book in books.values()
+            ],
+            table=get_table("books", db=db),
+            pk="openlibrary_key",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        upsert_records(
+            [transform_openlibrary_author(author) for author in authors],
+            table=get_table("authors", db=db),
+            pk="openlibrary_key",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        upsert_records(
+            [
+                transform_openlibrary_entity(entity, compressor)
+                for entity in changed_entities
+            ],
+            table=get_table("openlibrary_entities", db=db),
+            pk="key",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        mark_fetched(
+            [row["key"] for row in fetched_rows],
+            table=get_table("openlibrary_entities", db=db),
+            pk="key",
+        )
+
+    return len(entities), len(changed_entities)
+
+
 def list_books(
     *,
     db: Database,
@@ -369,83 +1173,110 @@ def list_books(
     """
     Returns a list of books in the SQLite database.
     """
-    table = get_view("list_books_and_authors", db=db)
-    return table.rows_where(select="isbn, title, authors")
+    table = get_table("books_listing", db=db)
+    return table.rows_where(select="isbn, title, authors", order_by="title")
 
 
 def search_books(
-    query: str, *, db: Database
+    query: str,
+    *,
+    db: Database,
+    limit: t.Optional[int] = None,
+    offset: int = 0,
 ) -> t.Generator[t.Dict[str, t.Any], None, None]:
     """
-    Search the SQLite database for books.
-    """
-    books_table = get_table("books", db=db)
+    Search the SQLite database for books, best matches first.
 
-    view = get_view("list_books_and_authors", db=db)
-
-    book_ids = [
-        row["id"] for row in books_table.search(q=query, columns=("id",))
-    ]
+    The query is matched against the books' titles, authors and descriptions.
+    """
+    weights = ", ".join(str(weight) for weight in BOOKS_LISTING_SEARCH_WEIGHTS)
 
-    return view.rows_where(
-        select="isbn, title, authors",
-        where="id in ({})".format(",".join("?" * len(book_ids))),
-        where_args=book_ids,
+    return db.query(
+        f"""
+        select
+            books_listing.isbn,
+            books_listing.title,
+            books_listing.authors
+        from
+            books_listing_fts
+        join books_listing
+            on books_listing.rowid = books_listing_fts.rowid
+        where
+            books_listing_fts match :query
+        order by
+            bm25(books_listing_fts, {weights})
+        limit :limit offset :offset
+        """,
+        {
+            "query": db.quote_fts(query),
+            "limit": -1 if limit is None else limit,
+            "offset": offset,
+        },
     )
 
 
 def format_books_as_csv(
-    books: t.Generator[t.Dict[str, t.Any], None, None]
-) -> str:
+    books: t.Iterable[t.Dict[str, t.Any]]
+) -> t.Generator[str, None, None]:
     """
     Format a list of books as CSV.
     """
-    return DataFrame(books).to_csv(index=False)
+    return formatters.format_rows_as_csv(books)
 
 
 def format_books_as_json(
-    books: t.Generator[t.Dict[str, t.Any], None, None]
-) -> str:
+    books: t.Iterable[t.Dict[str, t.Any]]
+) -> t.Generator[str, None, None]:
+    """
+    Format a list of books as a JSON array.
+    """
+    return formatters.format_rows_as_json(books)
+
+
+def format_books_as_json_lines(
+    books: t.Iterable[t.Dict[str, t.Any]]
+) -> t.Generator[str, None, None]:
     """
-    Format a list of books as JSON.
+    Format a list of books as JSON Lines.
     """
-    return DataFrame(books).to_json(orient="records", indent=2)
+    return formatters.format_rows_as_json_lines(books)
 
 
 def format_books_as_markdown(
-    books: t.Generator[t.Dict[str, t.Any], None, None]
-) -> str:
+    books: t.Iterable[t.Dict[str, t.Any]]
+) -> t.Generator[str, None, None]:
     """
     Format a list of books as Markdown.
     """
-    return tabulate(books, headers="keys", tablefmt="github")
+    return formatters.format_rows_as_markdown(books)
 
 
 def format_books_as_table(
-    books: t.Generator[t.Dict[str, t.Any], None, None]
-) -> str:
+    books: t.Iterable[t.Dict[str, t.Any]]
+) -> t.Generator[str, None, None]:
     """
     Format a list of books as a table.
     """
-    return tabulate(
+    return formatters.format_rows_as_table(
         books,
         headers={"isbn": "ISBN", "title": "Title", "authors": "Author(s)"},
-        tablefmt="grid",
-        maxcolwidths=[None, 24, 24],
+        widths={"isbn": 13, "title": 24, "authors": 24},
     )
 
 
 def format_books(
-    books: t.Generator[t.Dict[str, t.Any], None, None],
+    books: t.Iterable[t.Dict[str, t.Any]],
     output_format: str,
-) -> str:
+) -> t.Generator[str, None, None]:
     """
-    Format a list of books.
+    Format a list of books, streaming the output as the books are read.
     """
     if output_format == constants.OUTPUT_FORMAT_CSV:
         return format_books_as_csv(books)
     elif output_format == constants.OUTPUT_FORMAT_JSON:
         return format_books_as_json(books)
+    elif output_format == constants.OUTPUT_FORMAT_JSON_LINES:
+        return format_books_as_json_lines(books)
     elif output_format == constants.OUTPUT_FORMAT_MARKDOWN:
         return format_books_as_markdown(books)
 
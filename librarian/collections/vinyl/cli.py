@@ -1,11 +1,14 @@
-from typing import Optional
+import datetime
+from pathlib import Path
+from typing import Optional, TextIO, Tuple
 
 import click
 
-from ...integrations.discogs import DiscogsClient
+from ...integrations.discogs import DiscogsDumpIndex, get_discogs_client
 from ...settings import Settings
+from ...utils.compression import compress_table, decompress_table
 from ...utils.database import get_database
-from . import service
+from . import constants, service
 
 
 @click.group()
@@ -30,10 +33,10 @@ def add_vinyl(
     isbn: Optional[str] = None, discogs_release_id: Optional[int] = None
 ):
     """Add a vinyl record to the library's collection."""
-    db = get_database(Settings.VINYL_DB_PATH)
+    db = get_database(Settings.VINYL_DB_PATH, preset="import")
     service.build_database(db=db)
 
-    client = DiscogsClient()
+    client = get_discogs_client()
 
     if isbn is not None:
         release = service.get_discogs_release_by_isbn(isbn=isbn, client=client)
@@ -50,53 +53,240 @@ def add_vinyl(
             "Please provided ether an ISBN or Discogs Release ID."
         )
 
-    service.upsert_discogs_release(release, db)
+    service.upsert_release_and_related_data(release, db)
 
-    artist_rows = []
-    for artist in release.artists:
-        artist_row = service.upsert_artist_from_discogs_artist(
-            artist=artist, db=db
-        )
-        artist_rows.append(artist_row)
 
-    vinyl_row = service.upsert_vinyl_from_discogs_release(
-        release, artist_rows, db
+@cli.command(name="multi-add")
+@click.argument("barcodes", type=click.File("r"), default="-")
+@click.option(
+    "--concurrency",
+    help="Number of requests to make to Discogs at the same time.",
+    default=constants.FETCH_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+def add_vinyls(
+    barcodes: TextIO, concurrency: int = constants.FETCH_CONCURRENCY
+):
+    """
+    Add many vinyl records to the library's collection, from a file of
+    barcodes (or ISBNs), one per line, or from stdin.
+    """
+    db = get_database(Settings.VINYL_DB_PATH, preset="import")
+    service.build_database(db=db)
+
+    client = get_discogs_client(pool_size=concurrency)
+
+    isbns = [line.strip() for line in barcodes if line.strip()]
+
+    # The releases are searched for concurrently, under Discogs' rate limit,
+    # and then written to the database in a single transaction.
+    releases = service.get_discogs_releases_by_isbns(
+        isbns, client=client, concurrency=concurrency
+    )
+
+    for isbn, release in releases.items():
+        if release is None:
+            click.echo(
+                f"We couldn't find a Discogs Release by the ISBN {isbn}.",
+                err=True,
+            )
+
+    rows = service.upsert_releases_and_related_data(
+        [release for release in releases.values() if release is not None],
+        db,
+    )
+
+    click.echo(f"Added {len(rows)} vinyl records.")
+
+
+@cli.command(name="refresh")
+@click.option(
+    "--max-age",
+    help=(
+        "Refetch the releases and artists that haven't been fetched in this "
+        "many days."
+    ),
+    default=constants.DISCOGS_ENTITY_MAX_AGE.days,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--concurrency",
+    help="Number of requests to make to Discogs at the same time.",
+    default=constants.FETCH_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+def refresh_vinyl(
+    max_age: int = constants.DISCOGS_ENTITY_MAX_AGE.days,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+):
+    """
+    Refresh the stale vinyl records and artists from Discogs.
+    """
+    db = get_database(Settings.VINYL_DB_PATH, preset="import")
+    service.build_database(db=db)
+
+    client = get_discogs_client(pool_size=concurrency)
+
+    releases, artists = service.refresh_vinyl(
+        db=db,
+        client=client,
+        max_age=datetime.timedelta(days=max_age),
+        concurrency=concurrency,
     )
-    service.upsert_tracks_from_discogs_release(release, vinyl_row["id"], db)
+
+    click.echo(f"Refetched {releases} releases and {artists} artists.")
+
+
+@cli.command(name="import-dump")
+@click.argument(
+    "dumps",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def import_dump(dumps: Tuple[Path, ...]):
+    """
+    Import Discogs' releases and artists dumps into a local index, which is
+    used before Discogs' API when adding vinyl records by their barcodes.
+    """
+    index = DiscogsDumpIndex(path=Settings.DISCOGS_DUMP_INDEX_PATH)
+
+    for dump in dumps:
+        count = index.import_dump(dump)
+        click.echo(f"Imported {count} entities from {dump.name}.")
+
+
+@cli.command(name="compress")
+@click.option(
+    "--decompress",
+    help="Rewrite the compressed data as plain JSON, and stop compressing it.",
+    is_flag=True,
+    default=False,
+)
+def compress(decompress: bool = False):
+    """
+    Compress the Discogs releases' and artists' data, with dictionaries
+    trained on them, to shrink the database. New releases and artists are
+    compressed as they're added once the data has been compressed.
+    """
+    db = get_database(Settings.VINYL_DB_PATH, preset="import")
+    service.build_database(db=db)
+
+    counts = []
+    for table in ("discogs_releases", "discogs_artists"):
+        if decompress:
+            counts.append(decompress_table(db, table, pk="id"))
+        else:
+            counts.append(compress_table(db, table, pk="id"))
+
+    # Reclaim the space freed by compressing the rows.
+    db.vacuum()
+
+    click.echo(f"Rewrote {counts[0]} releases and {counts[1]} artists.")
 
 
 @cli.command()
-def update_artists():
+@click.option(
+    "--concurrency",
+    help="Number of artists to fetch from Discogs at the same time.",
+    default=constants.FETCH_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+def update_artists(concurrency: int = constants.FETCH_CONCURRENCY):
     """
     Update all the artists in the DB.
     """
+    db = get_database(Settings.VINYL_DB_PATH, preset="import")
+    service.build_database(db=db)
+
+    client = get_discogs_client(pool_size=concurrency)
+
+    artist_ids = [
+        artist_row["discogs_artist_id"]
+        for artist_row in service.list_artists(db)
+        if artist_row["discogs_artist_id"] is not None
+    ]
+
+    # The artists are fetched concurrently from Discogs' API, not the dump
+    # index, under Discogs' rate limit, and then written to the database in
+    # a single transaction.
+    artists = service.get_artists_from_discogs(
+        artist_ids, client=client, concurrency=concurrency, use_dump=False
+    )
+    service.upsert_artists_and_members(artists, db=db)
+
+
+@cli.command(name="list")
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(choices=constants.OUTPUT_FORMATS),
+    help="Format to output the results.",
+)
+def list_vinyl(output_format: str = ""):
+    """List the library's vinyl record collection."""
     db = get_database(Settings.VINYL_DB_PATH)
     service.build_database(db=db)
 
-    client = DiscogsClient()
+    vinyl_records = service.list_vinyl_records(db)
 
-    artist_row = service.list_artists(db)
+    # If the user specified a format, output the results in that format. The
+    # output is streamed as the records are read from the database.
+    if output_format in constants.OUTPUT_FORMATS:
+        for chunk in service.format_vinyl_records(vinyl_records, output_format):
+            click.echo(chunk, nl=False)
+    else:
+        click.echo_via_pager(
+            service.format_vinyl_records_as_table(vinyl_records)
+        )
 
-    artists_band_members = []
-    for artist_row in artist_row:
-        artist = client.get_artist(artist_row["discogs_artist_id"])
-        service.upsert_discogs_artist(artist, db)
-        artist_row = service.upsert_artist_from_discogs_artist(artist, db)
 
-        for member in artist.members:
-            member_row = service.upsert_artist_from_discogs_artist(member, db)
-            artists_band_members.append(
-                (artist_row["id"], member_row["id"], member.is_active)
-            )
+@cli.command(name="search")
+@click.argument("query")
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(choices=constants.OUTPUT_FORMATS),
+    help="Format to output the results.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    default=None,
+    help="The maximum number of results to output.",
+)
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    help="The number of results to skip.",
+)
+def search_vinyl(
+    query: str,
+    output_format: str = "",
+    limit: Optional[int] = None,
+    offset: int = 0,
+):
+    """Search the library's vinyl record collection."""
+    db = get_database(Settings.VINYL_DB_PATH)
+    service.build_database(db=db)
 
-    records = [
-        {
-            "artist_band_id": artist_band_id,
-            "artist_member_id": artist_member_id,
-            "is_active": is_active,
-        }
-        for artist_band_id, artist_member_id, is_active in artists_band_members
-    ]
-    db["bands_members"].upsert_all(
-        records, pk=["artist_band_id", "artist_member_id"]
+    vinyl_records = service.search_vinyl_records(
+        query, db, limit=limit, offset=offset
     )
+
+    # If the user specified a format, output the results in that format. The
+    # output is streamed as the records are read from the database.
+    if output_format in constants.OUTPUT_FORMATS:
+        for chunk in service.format_vinyl_records(vinyl_records, output_format):
+            click.echo(chunk, nl=False)
+    else:
+        click.echo_via_pager(
+            service.format_vinyl_records_as_table(vinyl_records)
+        )
@@ -0,0 +1,30 @@
+import datetime
+from typing import Final
+
+OUTPUT_FORMAT_CSV: Final = "csv"
+OUTPUT_FORMAT_JSON: Final = "json"
+OUTPUT_FORMAT_JSON_LINES: Final = "jsonl"
+OUTPUT_FORMAT_MARKDOWN: Final = "markdown"
+
+OUTPUT_FORMATS: Final = [
+    OUTPUT_FORMAT_CSV,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSON_LINES,
+    OUTPUT_FORMAT_MARKDOWN,
+]
+
+# How much a match on each of a vinyl record's search indexes counts towards
+# its rank in the search results.
+SEARCH_WEIGHTS: Final = {
+    "vinyl_records_fts": 10.0,
+    "artists_fts": 5.0,
+    "tracks_fts": 1.0,
+}
+
+# The number of requests to make to Discogs at the same time, the requests are
+# still paced by Discogs' rate limit.
+FETCH_CONCURRENCY: Final = 4
+
+# How long the Discogs releases and artists saved in the database are fresh
+# for, before they are refetched from Discogs.
+DISCOGS_ENTITY_MAX_AGE: Final = datetime.timedelta(days=30)
@@ -1,12 +1,25 @@
 import datetime
-import re
-from itertools import islice
-from typing import Any, Dict, Generator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
 
 from sqlite_utils.db import Database, Table
 
 from ...integrations import discogs
-from ...utils.database import get_table
+from ...utils import formatters
+from ...utils.compression import DataCompressor, register_functions
+from ...utils.database import (
+    CONTENT_HASH_COLUMN,
+    add_content_hash,
+    add_fetched_at_column,
+    add_missing_columns,
+    create_unique_index,
+    get_ids_by_column,
+    get_rows_by_column,
+    get_table,
+    mark_fetched,
+    upsert_records,
+)
+from . import constants
 
 
 def build_database(db: Database):
@@ -130,6 +143,50 @@ def build_database(db: Database):
             ),
         )
 
+    # Unique indexes on the natural keys, which the upserts use to detect
+    # conflicts. These are created outside the table creation so existing
+    # databases get them too, once their duplicates are removed. The kept
+    # vinyl record already has the release's tracks.
+    create_unique_index(
+        vinyl_records_table,
+        "discogs_release_id",
+        references=[(vinyl_records_artists_table.name, "vinyl_record_id")],
+        dependents=[(tracks_table.name, "vinyl_record_id")],
+    )
+    create_unique_index(
+        artists_table,
+        "discogs_artist_id",
+        references=[
+            (vinyl_records_artists_table.name, "artist_id"),
+            (bands_members_table.name, "artist_band_id"),
+            (bands_members_table.name, "artist_member_id"),
+        ],
+    )
+
+    # The vinyl records are listed by their title.
+    vinyl_records_table.create_index(["title"], if_not_exists=True)
+
+    # Indexes on the foreign keys that aren't the first column of a primary
+    # key, for looking up an artist's records and a record's tracks.
+    vinyl_records_artists_table.create_index(["artist_id"], if_not_exists=True)
+    tracks_table.create_index(["vinyl_record_id"], if_not_exists=True)
+
+    # The content hashes the upserts use to skip unchanged rows, added
+    # outside the table creation so existing databases get them too.
+    for table in (
+        discogs_releases_table,
+        discogs_artists_table,
+        vinyl_records_table,
+        tracks_table,
+        artists_table,
+    ):
+        add_missing_columns(table, {CONTENT_HASH_COLUMN: str})
+
+    # When the releases and artists were last fetched, which their staleness
+    # is based on.
+    add_fetched_at_column(discogs_releases_table)
+    add_fetched_at_column(discogs_artists_table)
+
     # Views
     db.create_view(
         name="vinyl_records_and_artists",
@@ -141,19 +198,22 @@ def build_database(db: Database):
             vinyl_records.year,
             group_concat(artists.name, ', ') as artists
         from
-            artists
+            vinyl_records
         left outer join vinyl_records_artists
-            on vinyl_records_artists.artist_id = vinyl_records_artists.artist_id
-        left outer join vinyl_records
-            on vinyl_records.id = vinyl_records_artists.vinyl_record_id
+            on vinyl_records_artists.vinyl_record_id = vinyl_records.id
+        left outer join artists
+            on artists.id = vinyl_records_artists.artist_id
         group by
-            vinyl_records.title
+            vinyl_records.id
         order by
             vinyl_records.title
         """,
         replace=True,
     )
 
+    # The SQL function to read the, optionally compressed, data columns.
+    register_functions(db.conn)
+
 
 def query_releases_on_discogs_matching_isbn(
     isbn: str, client: Optional[discogs.DiscogsClient] = None
@@ -163,9 +223,24 @@ def query_releases_on_discogs_matching_isbn(
     matching results.
     """
     if client is None:
-        client = discogs.DiscogsClient()
+        client = discogs.get_discogs_client()
+
+    return list(client.search(type="release", barcode=isbn, limit=10))
+
+
+def does_barcode_match_isbn(barcode: Optional[str], isbn: str) -> bool:
+    """
+    Does the barcode, ignoring its spaces and dashes, contain the given ISBN?
+    The Discogs dump index only matches whole barcodes.
+    """
+    if barcode is None:
+        return False
 
-    return list(islice(client.search(type="release", barcode=isbn), 10))
+    normalized_isbn = discogs.normalize_barcode(isbn)
+    if normalized_isbn == "":
+        return False
+
+    return normalized_isbn in discogs.normalize_barcode(barcode)
 
 
 def does_discogs_release_match_isbn(
@@ -174,26 +249,47 @@ def does_discogs_release_match_isbn(
     """
     Does the Discogs release's barcode match the given ISBN?
     """
-    # If the release does not have a known barcode then return False.
-    if release.barcode is None:
-        return False
-
-    barcode = re.sub(r"[^.0-9]", "", release.barcode)
-    return isbn in barcode
+    return does_barcode_match_isbn(release.barcode, isbn)
 
 
 def get_discogs_release_by_isbn(
-    isbn: str, client: Optional[discogs.DiscogsClient] = None
+    isbn: str,
+    client: Optional[discogs.DiscogsClient] = None,
+    index: Optional[discogs.DiscogsDumpIndex] = None,
 ) -> Optional[discogs.DiscogsRelease]:
     """
     Get a Discogs release by an ISBN.
+
+    The Discogs dump index, defaulting to the imported one, is checked before
+    Discogs' API. The search results already list the releases' barcodes, so
+    only the first release whose barcodes match is fetched. Results without
+    any barcodes are fetched as a last resort, to check their full release.
     """
+    if index is None:
+        index = discogs.get_discogs_dump_index()
+
+    if index is not None:
+        releases = index.get_releases_by_barcode(isbn)
+        if releases:
+            return releases[0]
+
     search_results = query_releases_on_discogs_matching_isbn(
         isbn=isbn, client=client
     )
 
     for result in search_results:
-        release = get_release_from_discogs(result.id, client=client)
+        if any(does_barcode_match_isbn(code, isbn) for code in result.barcodes):
+            return get_release_from_discogs(
+                result.id, client=client, index=index
+            )
+
+    for result in search_results:
+        if result.barcodes:
+            continue
+
+        release = get_release_from_discogs(
+            result.id, client=client, index=index
+        )
         if does_discogs_release_match_isbn(release, isbn) is True:
             return release
 
@@ -201,13 +297,28 @@ def get_discogs_release_by_isbn(
 
 
 def get_release_from_discogs(
-    release_id: int, client: Optional[discogs.DiscogsClient] = None
+    release_id: int,
+    client: Optional[discogs.DiscogsClient] = None,
+    index: Optional[discogs.DiscogsDumpIndex] = None,
+    use_dump: bool = True,
 ) -> discogs.DiscogsRelease:
     """
-    Get a release from Discogs' API.
+    Get a release from the Discogs dump index, defaulting to the imported
+    one, or else Discogs' API.
+
+    The dump is only as fresh as its last import, so refreshes skip it with
+    `use_dump=False`.
     """
+    if use_dump is True and index is None:
+        index = discogs.get_discogs_dump_index()
+
+    if use_dump is True and index is not None:
+        release = index.get_release(release_id)
+        if release is not None:
+            return release
+
     if client is None:
-        client = discogs.DiscogsClient()
+        client = discogs.get_discogs_client()
 
     return client.get_release(release_id=release_id)
 
@@ -244,27 +355,50 @@ def upsert_artist_from_discogs_artist(
     """
     table = get_table("artists", db=db)
 
-    existing_artist_ids = list(
-        table.pks_and_rows_where(
-            where="discogs_artist_id = :artist_id",
-            where_args={"artist_id": artist.id},
+    record = transform_discogs_artist(artist, existing_artist_id=None)
+    del record["id"]
+    record["created_at"] = datetime.datetime.utcnow()
+
+    with db.conn:
+        upsert_records(
+            [record],
+            table=table,
+            pk="discogs_artist_id",
+            hash_column=CONTENT_HASH_COLUMN,
         )
-    )
 
-    existing_artist_id: Optional[int] = None
-    if existing_artist_ids:
-        existing_artist_id, _ = existing_artist_ids[0]
+    return next(table.rows_where("discogs_artist_id = ?", [artist.id]))
+
 
-    record = transform_discogs_artist(
-        artist, existing_artist_id=existing_artist_id
+def transform_discogs_entity(
+    entity: Union[discogs.DiscogsArtist, discogs.DiscogsRelease],
+    compressor: Optional[DataCompressor] = None,
+) -> Dict[str, Any]:
+    """
+    Transform a DiscogsArtist or DiscogsRelease dataclass to something that
+    can be safely inserted to the discogs_artists or discogs_releases tables
+    on the database, compressing its data if a compressor is given.
+
+    The content hash is of the uncompressed data, so it doesn't change when
+    the table is compressed, or recompressed with a new dictionary.
+    """
+    record: Dict[str, Any] = add_content_hash(
+        {
+            "id": entity.id,
+            "data": entity.data,
+            "updated_at": datetime.datetime.utcnow(),
+        }
     )
 
-    if record["id"] is None:
-        table = table.insert(record=record)
-    else:
-        table = table.upsert(record, pk="id")
+    if compressor is not None:
+        table_name = (
+            "discogs_releases"
+            if isinstance(entity, discogs.DiscogsRelease)
+            else "discogs_artists"
+        )
+        record["data"] = compressor.encode(table_name, entity.data)
 
-    return table.get(table.last_pk)  # type: ignore
+    return record
 
 
 def upsert_discogs_artist(
@@ -275,15 +409,144 @@ def upsert_discogs_artist(
     Upsert a discogs release into the SQLite database.
     """
     table = get_table("discogs_artists", db=db)
-    table = table.upsert(
-        {
-            "id": artist.id,
-            "data": artist.data,
-            "updated_at": datetime.datetime.utcnow(),
-        },
-        pk="id",
-    )
-    return table.get(table.last_pk)  # type: ignore
+
+    with db.conn:
+        upsert_records(
+            [transform_discogs_entity(artist, DataCompressor(db.conn))],
+            table=table,
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        mark_fetched([artist.id], table=table)
+
+    return table.get(artist.id)
+
+
+def get_artist_from_discogs(
+    artist_id: int,
+    client: Optional[discogs.DiscogsClient] = None,
+    index: Optional[discogs.DiscogsDumpIndex] = None,
+    use_dump: bool = True,
+) -> discogs.DiscogsArtist:
+    """
+    Get an artist from the Discogs dump index, defaulting to the imported
+    one, or else Discogs' API.
+
+    The dump is only as fresh as its last import, so refreshes skip it with
+    `use_dump=False`.
+    """
+    if use_dump is True and index is None:
+        index = discogs.get_discogs_dump_index()
+
+    if use_dump is True and index is not None:
+        artist = index.get_artist(artist_id)
+        if artist is not None:
+            return artist
+
+    if client is None:
+        client = discogs.get_discogs_client()
+
+    return client.get_artist(artist_id=artist_id)
+
+
+def get_artists_from_discogs(
+    artist_ids: Iterable[int],
+    client: Optional[discogs.DiscogsClient] = None,
+    index: Optional[discogs.DiscogsDumpIndex] = None,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+    use_dump: bool = True,
+) -> List[discogs.DiscogsArtist]:
+    """
+    Get many artists from the Discogs dump index, defaulting to the imported
+    one, and Discogs' API concurrently for the rest. Each unique artist is
+    only fetched once.
+
+    With `use_dump=False` every artist is fetched from Discogs' API.
+    """
+    if client is None:
+        client = discogs.get_discogs_client(pool_size=concurrency)
+
+    if use_dump is True and index is None:
+        index = discogs.get_discogs_dump_index()
+
+    unique_artist_ids = list(dict.fromkeys(artist_ids))
+
+    def fetch(artist_id: int) -> discogs.DiscogsArtist:
+        return get_artist_from_discogs(
+            artist_id, client=client, index=index, use_dump=use_dump
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(fetch, unique_artist_ids))
+
+
+def upsert_artists_and_members(
+    artists: Iterable[discogs.DiscogsArtist],
+    db: Database,
+):
+    """
+    Upsert many artists, their band members, and their Discogs API responses
+    into the SQLite database in a single transaction.
+    """
+    artists_table = get_table("artists", db=db)
+    discogs_artists_table = get_table("discogs_artists", db=db)
+    bands_members_table = get_table("bands_members", db=db)
+
+    created_at = datetime.datetime.utcnow()
+    compressor = DataCompressor(db.conn)
+
+    # Artists are de-duplicated by their Discogs ID. A band member's record
+    # only has their name, so it's merged with their own artist record if
+    # they were fetched too.
+    artist_records: Dict[int, Dict[str, Any]] = {}
+    discogs_artist_records: Dict[int, Dict[str, Any]] = {}
+    bands_members: Dict[Tuple[int, int], Optional[bool]] = {}
+
+    def add_artist_record(artist: discogs.DiscogsArtistBase):
+        record = transform_discogs_artist(artist, existing_artist_id=None)
+        del record["id"]
+        record["created_at"] = created_at
+        artist_records.setdefault(artist.id, {}).update(record)
+
+    for artist in artists:
+        add_artist_record(artist)
+        discogs_artist_records[artist.id] = transform_discogs_entity(
+            artist, compressor
+        )
+
+        for member in artist.members:
+            add_artist_record(member)
+            bands_members[(artist.id, member.id)] = member.is_active
+
+    with db.conn:
+        upsert_records(
+            discogs_artist_records.values(),
+            table=discogs_artists_table,
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        mark_fetched(discogs_artist_records.keys(), table=discogs_artists_table)
+        upsert_records(
+            artist_records.values(),
+            table=artists_table,
+            pk="discogs_artist_id",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+
+        artist_ids = get_ids_by_column(
+            "discogs_artist_id", artist_records.keys(), table=artists_table
+        )
+
+        upsert_records(
+            [
+                {
+                    "artist_band_id": artist_ids[band_id],
+                    "artist_member_id": artist_ids[member_id],
+                    "is_active": is_active,
+                }
+                for (band_id, member_id), is_active in bands_members.items()
+            ],
+            table=bands_members_table,
+            pk=("artist_band_id", "artist_member_id"),
+        )
 
 
 def transform_discogs_release_to_vinyl_record(
@@ -333,15 +596,16 @@ def upsert_discogs_release(
     Upsert a discogs release into the SQLite database.
     """
     table = get_table("discogs_releases", db=db)
-    table = table.upsert(
-        {
-            "id": release.id,
-            "data": release.data,
-            "updated_at": datetime.datetime.utcnow(),
-        },
-        pk="id",
-    )
-    return table.get(table.last_pk)  # type: ignore
+
+    with db.conn:
+        upsert_records(
+            [transform_discogs_entity(release, DataCompressor(db.conn))],
+            table=table,
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        mark_fetched([release.id], table=table)
+
+    return table.get(release.id)
 
 
 def upsert_vinyl_from_discogs_release(
@@ -355,35 +619,34 @@ def upsert_vinyl_from_discogs_release(
     vinyl_records_table = get_table("vinyl_records", db=db)
     vinyl_records_artists_table = get_table("vinyl_records_artists", db=db)
 
-    existing_vinyl_record_ids = list(
-        vinyl_records_table.pks_and_rows_where(
-            where="discogs_release_id = :release_id",
-            where_args={"release_id": release.id},
-        )
-    )
-
-    existing_vinyl_record_id: Optional[int] = None
-    if existing_vinyl_record_ids:
-        existing_vinyl_record_id, _ = existing_vinyl_record_ids[0]
-
     record = transform_discogs_release_to_vinyl_record(
-        release, existing_vinyl_id=existing_vinyl_record_id
+        release, existing_vinyl_id=None
     )
+    del record["id"]
+    record["created_at"] = datetime.datetime.utcnow()
+
+    with db.conn:
+        upsert_records(
+            [record],
+            table=vinyl_records_table,
+            pk="discogs_release_id",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
 
-    if record["id"] is None:
-        table = vinyl_records_table.insert(record=record)
-    else:
-        table = vinyl_records_table.upsert(record, pk="id")
-
-    row = table.get(table.last_pk)  # type: ignore
+        row = next(
+            vinyl_records_table.rows_where(
+                "discogs_release_id = ?", [release.id]
+            )
+        )
 
-    vinyl_records_artists_table.upsert_all(
-        records=[
-            {"vinyl_record_id": row["id"], "artist_id": artist_row["id"]}
-            for artist_row in artist_rows
-        ],
-        pk=["vinyl_record_id", "artist_id"],
-    )
+        upsert_records(
+            [
+                {"vinyl_record_id": row["id"], "artist_id": artist_row["id"]}
+                for artist_row in artist_rows
+            ],
+            table=vinyl_records_artists_table,
+            pk=("vinyl_record_id", "artist_id"),
+        )
 
     return row
 
@@ -405,9 +668,7 @@ def upsert_tracks_from_discogs_release(
         )
     )
 
-    insert_records = []
-    upsert_records = []
-
+    records = []
     for track in release.tracks:
         existing_track = next(
             filter(
@@ -416,22 +677,246 @@ def upsert_tracks_from_discogs_release(
             ),
             None,
         )
-        transformed_track = transform_discogs_release_track(
-            track,
-            existing_track_id=existing_track["id"] if existing_track else None,
-            vinyl_record_id=vinyl_record_id,
+        records.append(
+            transform_discogs_release_track(
+                track,
+                existing_track_id=(
+                    existing_track["id"] if existing_track else None
+                ),
+                vinyl_record_id=vinyl_record_id,
+            )
         )
 
-        if transformed_track["id"] is None:
-            insert_records.append(transformed_track)
-        else:
-            upsert_records.append(transformed_track)
+    # New tracks don't have an ID yet, so they're inserted with a new one.
+    with db.conn:
+        upsert_records(
+            records, table=tracks_table, hash_column=CONTENT_HASH_COLUMN
+        )
 
-    if insert_records:
-        tracks_table.insert_all(records=insert_records)
 
-    if upsert_records:
-        tracks_table.upsert_all(records=upsert_records, pk="id")
+def upsert_release_and_related_data(
+    release: discogs.DiscogsRelease,
+    db: Database,
+) -> Dict[str, Any]:
+    """
+    Upsert a Discogs release and all it's related data into the SQLite
+    database, returning the vinyl record's row.
+    """
+    upsert_discogs_release(release, db)
+
+    artist_rows = [
+        upsert_artist_from_discogs_artist(artist=artist, db=db)
+        for artist in release.artists
+    ]
+
+    vinyl_row = upsert_vinyl_from_discogs_release(release, artist_rows, db)
+    upsert_tracks_from_discogs_release(release, vinyl_row["id"], db)
+
+    return vinyl_row
+
+
+def get_discogs_releases_by_isbns(
+    isbns: Iterable[str],
+    client: Optional[discogs.DiscogsClient] = None,
+    index: Optional[discogs.DiscogsDumpIndex] = None,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+) -> Dict[str, Optional[discogs.DiscogsRelease]]:
+    """
+    Get the Discogs releases for many ISBNs concurrently, each unique ISBN is
+    only searched for once. ISBNs without a matching release map to `None`.
+    """
+    if client is None:
+        client = discogs.get_discogs_client(pool_size=concurrency)
+
+    unique_isbns = list(dict.fromkeys(isbns))
+
+    def fetch(isbn: str) -> Optional[discogs.DiscogsRelease]:
+        return get_discogs_release_by_isbn(isbn, client=client, index=index)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return dict(zip(unique_isbns, executor.map(fetch, unique_isbns)))
+
+
+def upsert_releases_and_related_data(
+    releases: Iterable[discogs.DiscogsRelease],
+    db: Database,
+) -> List[Dict[str, Any]]:
+    """
+    Upsert many Discogs releases and all their related data into the SQLite
+    database in a single transaction, returning the vinyl records' rows in
+    the same order as the releases.
+    """
+    discogs_releases_table = get_table("discogs_releases", db=db)
+    artists_table = get_table("artists", db=db)
+    vinyl_records_table = get_table("vinyl_records", db=db)
+    vinyl_records_artists_table = get_table("vinyl_records_artists", db=db)
+    tracks_table = get_table("tracks", db=db)
+
+    created_at = datetime.datetime.utcnow()
+    compressor = DataCompressor(db.conn)
+
+    # Releases and their artists are de-duplicated by their Discogs IDs.
+    releases_by_id = {release.id: release for release in releases}
+
+    artist_records: Dict[int, Dict[str, Any]] = {}
+    vinyl_records: List[Dict[str, Any]] = []
+
+    for release in releases_by_id.values():
+        for artist in release.artists:
+            record = transform_discogs_artist(artist, existing_artist_id=None)
+            del record["id"]
+            record["created_at"] = created_at
+            artist_records.setdefault(artist.id, {}).update(record)
+
+        record = transform_discogs_release_to_vinyl_record(
+            release, existing_vinyl_id=None
+        )
+        del record["id"]
+        record["created_at"] = created_at
+        vinyl_records.append(record)
+
+    with db.conn:
+        upsert_records(
+            [
+                transform_discogs_entity(release, compressor)
+                for release in releases_by_id.values()
+            ],
+            table=discogs_releases_table,
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        mark_fetched(releases_by_id.keys(), table=discogs_releases_table)
+        upsert_records(
+            artist_records.values(),
+            table=artists_table,
+            pk="discogs_artist_id",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+        upsert_records(
+            vinyl_records,
+            table=vinyl_records_table,
+            pk="discogs_release_id",
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+
+        artist_ids = get_ids_by_column(
+            "discogs_artist_id", artist_records.keys(), table=artists_table
+        )
+        vinyl_record_ids = get_ids_by_column(
+            "discogs_release_id",
+            releases_by_id.keys(),
+            table=vinyl_records_table,
+        )
+
+        upsert_records(
+            [
+                {
+                    "vinyl_record_id": vinyl_record_ids[release.id],
+                    "artist_id": artist_ids[artist.id],
+                }
+                for release in releases_by_id.values()
+                for artist in release.artists
+            ],
+            table=vinyl_records_artists_table,
+            pk=("vinyl_record_id", "artist_id"),
+        )
+
+        # Tracks don't have a natural key of their own, they're matched to
+        # the existing tracks by their vinyl record and position.
+        existing_track_ids = {
+            (row["vinyl_record_id"], row["position"]): row["id"]
+            for row in get_rows_by_column(
+                "vinyl_record_id",
+                vinyl_record_ids.values(),
+                table=tracks_table,
+                select="id, vinyl_record_id, position",
+            )
+        }
+
+        upsert_records(
+            [
+                transform_discogs_release_track(
+                    track,
+                    existing_track_id=existing_track_ids.get(
+                        (vinyl_record_ids[release.id], track.position)
+                    ),
+                    vinyl_record_id=vinyl_record_ids[release.id],
+                )
+                for release in releases_by_id.values()
+                for track in release.tracks
+            ],
+            table=tracks_table,
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+
+    rows = {
+        row["discogs_release_id"]: row
+        for row in get_rows_by_column(
+            "discogs_release_id",
+            releases_by_id.keys(),
+            table=vinyl_records_table,
+        )
+    }
+
+    return [rows[release_id] for release_id in releases_by_id.keys()]
+
+
+def get_stale_discogs_entity_ids(
+    table_name: str,
+    db: Database,
+    max_age: datetime.timedelta = constants.DISCOGS_ENTITY_MAX_AGE,
+) -> List[int]:
+    """
+    Get the IDs of the Discogs API responses saved in the table that haven't
+    been fetched within the max age.
+    """
+    table = get_table(table_name, db=db)
+    fetched_before = datetime.datetime.utcnow() - max_age
+
+    return [
+        row["id"]
+        for row in table.rows_where(
+            where="fetched_at is null or fetched_at < ?",
+            where_args=[fetched_before.isoformat()],
+            select="id",
+        )
+    ]
+
+
+def refresh_vinyl(
+    db: Database,
+    client: Optional[discogs.DiscogsClient] = None,
+    max_age: datetime.timedelta = constants.DISCOGS_ENTITY_MAX_AGE,
+    concurrency: int = constants.FETCH_CONCURRENCY,
+) -> Tuple[int, int]:
+    """
+    Refetch the Discogs releases and artists that haven't been fetched within
+    the max age, from Discogs' API rather than the dump index, which could be
+    as old as the data being refreshed.
+
+    Returns the number of releases and artists refetched.
+    """
+    if client is None:
+        client = discogs.get_discogs_client(pool_size=concurrency)
+
+    release_ids = get_stale_discogs_entity_ids("discogs_releases", db, max_age)
+    artist_ids = get_stale_discogs_entity_ids("discogs_artists", db, max_age)
+
+    def fetch_release(release_id: int) -> discogs.DiscogsRelease:
+        return get_release_from_discogs(
+            release_id, client=client, use_dump=False
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        releases = list(executor.map(fetch_release, release_ids))
+
+    upsert_releases_and_related_data(releases, db)
+
+    artists = get_artists_from_discogs(
+        artist_ids, client=client, concurrency=concurrency, use_dump=False
+    )
+    upsert_artists_and_members(artists, db)
+
+    return len(releases), len(artists)
 
 
 def list_artists(db: Database) -> Generator[Dict[str, Any], None, None]:
@@ -440,3 +925,159 @@ def list_artists(db: Database) -> Generator[Dict[str, Any], None, None]:
     """
     table = get_table("artists", db=db)
     return table.rows
+
+
+# Each vinyl record with its artists, used by the list and search commands.
+VINYL_RECORDS_LISTING_SELECT = """
+select
+    vinyl_records.isbn,
+    vinyl_records.title,
+    vinyl_records.year,
+    (
+        select group_concat(artists.name, ', ')
+        from vinyl_records_artists
+        join artists on artists.id = vinyl_records_artists.artist_id
+        where vinyl_records_artists.vinyl_record_id = vinyl_records.id
+    ) as artists
+"""
+
+
+def list_vinyl_records(db: Database) -> Generator[Dict[str, Any], None, None]:
+    """
+    Returns a list of vinyl records, and their artists, in the SQLite database.
+    """
+    return db.query(
+        f"""
+        {VINYL_RECORDS_LISTING_SELECT}
+        from
+            vinyl_records
+        order by
+            vinyl_records.title
+        """
+    )
+
+
+def build_search_query(query: str) -> str:
+    """
+    Build a full-text search query matching any of the words in the query, so
+    words can match different indexes (e.g. the artist and the title).
+    """
+    return " OR ".join(f'"{word}"' for word in query.replace('"', " ").split())
+
+
+def search_vinyl_records(
+    query: str,
+    db: Database,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Search the vinyl records by their title, artists and tracks' titles, best
+    matches first.
+
+    Each index's bm25 rank is weighted and summed up per vinyl record, so a
+    record matching in more places, or on its title, ranks higher.
+    """
+    search_query = build_search_query(query)
+    if search_query == "":
+        return
+
+    weights = constants.SEARCH_WEIGHTS
+
+    yield from db.query(
+        f"""
+        with matches as (
+            select
+                vinyl_records_fts.rowid as vinyl_record_id,
+                bm25(vinyl_records_fts) * {weights["vinyl_records_fts"]}
+                    as rank
+            from
+                vinyl_records_fts
+            where
+                vinyl_records_fts match :query
+            union all
+            select
+                vinyl_records_artists.vinyl_record_id,
+                bm25(artists_fts) * {weights["artists_fts"]} as rank
+            from
+                artists_fts
+            join vinyl_records_artists
+                on vinyl_records_artists.artist_id = artists_fts.rowid
+            where
+                artists_fts match :query
+            union all
+            select
+                tracks.vinyl_record_id,
+                bm25(tracks_fts) * {weights["tracks_fts"]} as rank
+            from
+                tracks_fts
+            join tracks
+                on tracks.id = tracks_fts.rowid
+            where
+                tracks_fts match :query
+        ),
+        ranked as (
+            select
+                vinyl_record_id,
+                sum(rank) as rank
+            from
+                matches
+            group by
+                vinyl_record_id
+        )
+        {VINYL_RECORDS_LISTING_SELECT}
+        from
+            ranked
+        join vinyl_records
+            on vinyl_records.id = ranked.vinyl_record_id
+        order by
+            ranked.rank
+        limit :limit offset :offset
+        """,
+        {
+            "query": search_query,
+            "limit": -1 if limit is None else limit,
+            "offset": offset,
+        },
+    )
+
+
+def format_vinyl_records_as_table(
+    vinyl_records: Iterable[Dict[str, Any]]
+) -> Generator[str, None, None]:
+    """
+    Format a list of vinyl records as a table.
+    """
+    return formatters.format_rows_as_table(
+        vinyl_records,
+        headers={
+            "isbn": "ISBN",
+            "title": "Title",
+            "year": "Year",
+            "artists": "Artist(s)",
+        },
+        widths={"isbn": 13, "title": 24, "year": 4, "artists": 24},
+    )
+
+
+def format_vinyl_records(
+    vinyl_records: Iterable[Dict[str, Any]],
+    output_format: str,
+) -> Generator[str, None, None]:
+    """
+    Format a list of vinyl records, streaming the output as the records are
+    read.
+    """
+    if output_format == constants.OUTPUT_FORMAT_CSV:
+        return formatters.format_rows_as_csv(vinyl_records)
+    elif output_format == constants.OUTPUT_FORMAT_JSON:
+        return formatters.format_rows_as_json(vinyl_records)
+    elif output_format == constants.OUTPUT_FORMAT_JSON_LINES:
+        return formatters.format_rows_as_json_lines(vinyl_records)
+    elif output_format == constants.OUTPUT_FORMAT_MARKDOWN:
+        return formatters.format_rows_as_markdown(vinyl_records)
+
+    raise ValueError(
+        f"Invalid output format: {output_format}. Must be one of: "
+        f"{', '.join(constants.OUTPUT_FORMATS)}"
+    )
@@ -0,0 +1,12 @@
+from datasette import hookimpl
+
+from .utils.compression import register_functions
+
+
+@hookimpl
+def prepare_connection(conn):
+    """
+    Register the `decompress_data` SQL function on Datasette's connections,
+    so the compressed data columns can be read with `json_extract`.
+    """
+    register_functions(conn)
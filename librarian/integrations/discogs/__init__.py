@@ -9,17 +9,22 @@ from .data import (
     DiscogsReleaseTrackArtist,
     DiscogsSearchResult,
 )
-from .service import DiscogsClient
+from .dump import DiscogsDumpIndex, get_discogs_dump_index, normalize_barcode
+from .service import DiscogsClient, get_discogs_client
 
 __all__ = [
     "DiscogsArtist",
     "DiscogsArtistBase",
     "DiscogsArtistMember",
     "DiscogsClient",
+    "DiscogsDumpIndex",
     "DiscogsImage",
     "DiscogsRelease",
     "DiscogsReleaseArtist",
     "DiscogsReleaseTrack",
     "DiscogsReleaseTrackArtist",
     "DiscogsSearchResult",
+    "get_discogs_client",
+    "get_discogs_dump_index",
+    "normalize_barcode",
 ]
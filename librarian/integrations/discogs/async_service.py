@@ -0,0 +1,153 @@
+import typing as t
+
+import httpx
+
+from ...settings import Settings
+from ...utils.async_http_client import AsyncHttpClient
+from ...utils.http_client import DEFAULT_POOL_SIZE
+from ...utils.rate_limiter import TokenBucket
+from . import data
+from .service import (
+    SEARCH_MAX_PER_PAGE,
+    get_discogs_rate_limiter,
+    get_rate_limit,
+)
+
+
+class AsyncDiscogsClient(AsyncHttpClient):
+    """
+    The asyncio counterpart to the DiscogsClient, sharing its rate limiter.
+    """
+
+    def __init__(
+        self,
+        base_url: t.Optional[str] = None,
+        client: t.Optional[httpx.AsyncClient] = None,
+        rate_limiter: t.Optional[TokenBucket] = None,
+        max_retries: int = 5,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        if rate_limiter is None:
+            rate_limiter = get_discogs_rate_limiter()
+
+        super().__init__(
+            client=client,
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
+            pool_size=pool_size,
+        )
+
+        if Settings.DISCOGS_PERSONAL_ACCESS_TOKEN is not None:
+            self.client.headers[
+                "Authorization"
+            ] = f"Discogs token={Settings.DISCOGS_PERSONAL_ACCESS_TOKEN}"
+
+        if base_url is None:
+            base_url = "https://api.discogs.com"
+
+        self.base_url = base_url
+
+    def update_rate_limit(self, response: httpx.Response):
+        """
+        Update the rate limiter from Discogs' rate limit headers.
+        """
+        if self.rate_limiter is None:
+            return
+
+        limit, remaining = get_rate_limit(
+            response.headers, response.status_code
+        )
+        self.rate_limiter.update(limit=limit, remaining=remaining)
+
+    async def get_release(
+        self,
+        release_id: int,
+        currency: t.Optional[data.DiscogsCurrencyLiterals] = None,
+        **kwargs,
+    ) -> data.DiscogsRelease:
+        """
+        Get a Discogs release.
+        """
+        params: t.Dict[str, t.Any] = kwargs.pop("params", {})
+
+        if currency is not None:
+            params["curr_abbr"] = currency
+
+        _, response = await self.get(
+            url=f"{self.base_url}/releases/{release_id}",
+            params=params,
+            **kwargs,
+        )
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.DiscogsRelease.from_data(response_data)
+
+    async def get_artist(self, artist_id: int, **kwargs) -> data.DiscogsArtist:
+        """
+        Get a Discogs artist.
+        """
+        _, response = await self.get(
+            url=f"{self.base_url}/artists/{artist_id}",
+            **kwargs,
+        )
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.DiscogsArtist.from_data(response_data)
+
+    async def search(
+        self,
+        query: t.Optional[str] = None,
+        type: t.Optional[data.DiscogsTypeLiterals] = None,
+        barcode: t.Optional[str] = None,
+        limit: t.Optional[int] = None,
+        **kwargs,
+    ) -> t.AsyncGenerator[data.DiscogsSearchResult, None]:
+        """
+        Search Discogs.
+
+        The results are paginated, the next page is only requested once the
+        previous one has been consumed, and no more than `limit` results are
+        returned.
+        """
+        params: t.Dict[str, t.Any] = kwargs.pop("params", {})
+
+        if limit is not None:
+            if limit <= 0:
+                return
+
+            params.setdefault("per_page", min(limit, SEARCH_MAX_PER_PAGE))
+
+        if query is not None:
+            params["query"] = query
+
+        if type is not None:
+            params["type"] = type
+
+        if barcode is not None:
+            params["barcode"] = barcode
+
+        next_url = f"{self.base_url}/database/search"
+
+        while next_url is not None:
+            _, response = await self.get(
+                url=next_url,
+                params=params,
+                **kwargs,
+            )
+            response.raise_for_status()
+            response_data = response.json()
+
+            # We are going to use the parameters from the pagination next URL,
+            # so we need clear the params and update the next_url variables.
+            params = {}
+            next_url = response_data["pagination"]["urls"].get("next")
+
+            for result in response_data["results"]:
+                yield data.DiscogsSearchResult.from_data(result)
+
+                if limit is not None:
+                    limit -= 1
+                    if limit == 0:
+                        return
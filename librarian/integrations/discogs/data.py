@@ -1,7 +1,8 @@
 import typing as t
-from copy import deepcopy
 from dataclasses import dataclass, field
 
+from ...utils.parsing import Field, pick_fields
+
 DiscogsCurrencyLiterals = t.Literal[
     "USD",
     "GBP",
@@ -40,14 +41,16 @@ class DiscogsImage:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
+        defaults = pick_fields(data, DISCOGS_IMAGE_FIELDS)
+        return cls(**defaults)
 
-        safe_keys = ("type", "height", "width", "resource_url")
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
 
-        return cls(**defaults)
+DISCOGS_IMAGE_FIELDS = (
+    Field("type"),
+    Field("height"),
+    Field("width"),
+    Field("resource_url"),
+)
 
 
 @dataclass
@@ -66,16 +69,15 @@ class DiscogsArtistMember(DiscogsArtistBase):
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-
-        safe_keys = ("id", "name", "active")
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
+        defaults = pick_fields(data, DISCOGS_ARTIST_MEMBER_FIELDS)
+        return cls(**defaults)
 
-        defaults["is_active"] = defaults.pop("active", None)
 
-        return cls(**defaults)
+DISCOGS_ARTIST_MEMBER_FIELDS = (
+    Field("id"),
+    Field("name"),
+    Field("active", "is_active"),
+)
 
 
 @dataclass
@@ -89,43 +91,42 @@ class DiscogsArtist(DiscogsArtistBase):
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-
-        safe_keys = (
-            "id",
-            "namevariations",
-            "profile",
-            "members",
-            "images",
-        )
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
-
-        defaults["name_variations"] = defaults.pop("namevariations", None)
-
-        defaults["members"] = [
-            DiscogsArtistMember.from_data(member)
-            for member in defaults.pop("members", [])
-        ]
-
+        defaults = pick_fields(data, DISCOGS_ARTIST_FIELDS)
         return cls(**defaults, data=data)
 
 
+def transform_artist_members(
+    value: t.List[t.Dict[str, t.Any]]
+) -> t.List[DiscogsArtistMember]:
+    """
+    Format a list of Discogs artist members.
+    """
+    return [DiscogsArtistMember.from_data(member) for member in value]
+
+
+DISCOGS_ARTIST_FIELDS = (
+    Field("id"),
+    Field("namevariations", "name_variations"),
+    Field("profile"),
+    Field("members", transform=transform_artist_members),
+    Field("images"),
+)
+
+
 @dataclass
 class DiscogsReleaseArtist(DiscogsArtistBase):
     name: str
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
+        defaults = pick_fields(data, DISCOGS_RELEASE_ARTIST_FIELDS)
+        return cls(**defaults)
 
-        safe_keys = ("id", "name")
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
 
-        return cls(**defaults)
+DISCOGS_RELEASE_ARTIST_FIELDS = (
+    Field("id"),
+    Field("name"),
+)
 
 
 @dataclass
@@ -135,14 +136,15 @@ class DiscogsReleaseTrackArtist(DiscogsArtistBase):
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
+        defaults = pick_fields(data, DISCOGS_RELEASE_TRACK_ARTIST_FIELDS)
+        return cls(**defaults)
 
-        safe_keys = ("id", "name", "role")
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
 
-        return cls(**defaults)
+DISCOGS_RELEASE_TRACK_ARTIST_FIELDS = (
+    Field("id"),
+    Field("name"),
+    Field("role"),
+)
 
 
 @dataclass
@@ -155,22 +157,25 @@ class DiscogsReleaseTrack:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
+        defaults = pick_fields(data, DISCOGS_RELEASE_TRACK_FIELDS)
+        return cls(**defaults)
 
-        safe_keys = ("title", "duration", "position", "extraartists")
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
 
-        if "duration" in defaults:
-            defaults["duration"] = transform_duration(defaults.pop("duration"))
+def transform_track_artists(
+    value: t.List[t.Dict[str, t.Any]]
+) -> t.List[DiscogsReleaseTrackArtist]:
+    """
+    Format a list of Discogs release track artists.
+    """
+    return [DiscogsReleaseTrackArtist.from_data(artist) for artist in value]
 
-        artists = defaults.pop("extraartists", [])
-        defaults["artists"] = [
-            DiscogsReleaseTrackArtist.from_data(artist) for artist in artists
-        ]
 
-        return cls(**defaults)
+DISCOGS_RELEASE_TRACK_FIELDS = (
+    Field("title"),
+    Field("duration", transform=transform_duration),
+    Field("position"),
+    Field("extraartists", "artists", transform_track_artists),
+)
 
 
 @dataclass
@@ -189,61 +194,76 @@ class DiscogsRelease:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-
-        safe_keys = (
-            "id",
-            "title",
-            "year",
-            "artists",
-            "styles",
-            "identifiers",
-            "tracklist",
-        )
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
-
-        defaults["artists"] = [
-            DiscogsReleaseArtist.from_data(artist)
-            for artist in defaults.pop("artists", [])
-        ]
-
-        defaults["tracks"] = [
-            DiscogsReleaseTrack.from_data(track)
-            for track in defaults.pop("tracklist", [])
-        ]
-
-        identifiers = defaults.pop("identifiers")
-
-        # Extract the barcode identifier.
-        barcode_identifier: t.Dict[str, str] = next(
-            filter(lambda x: x["type"] == "Barcode", identifiers), {}
-        )
-        defaults["barcode"] = barcode_identifier.get("value") or None
-
+        defaults = pick_fields(data, DISCOGS_RELEASE_FIELDS)
         return cls(**defaults, data=data)
 
 
+def transform_release_artists(
+    value: t.List[t.Dict[str, t.Any]]
+) -> t.List[DiscogsReleaseArtist]:
+    """
+    Format a list of Discogs release artists.
+    """
+    return [DiscogsReleaseArtist.from_data(artist) for artist in value]
+
+
+def transform_tracklist(
+    value: t.List[t.Dict[str, t.Any]]
+) -> t.List[DiscogsReleaseTrack]:
+    """
+    Format a Discogs release's tracklist.
+    """
+    return [DiscogsReleaseTrack.from_data(track) for track in value]
+
+
+def transform_barcode(value: t.List[t.Dict[str, str]]) -> t.Optional[str]:
+    """
+    Extract the barcode from a Discogs release's identifiers.
+    """
+    barcode_identifier: t.Dict[str, str] = next(
+        filter(lambda x: x["type"] == "Barcode", value), {}
+    )
+    return barcode_identifier.get("value") or None
+
+
+DISCOGS_RELEASE_FIELDS = (
+    Field("id"),
+    Field("title"),
+    Field("year"),
+    Field("artists", transform=transform_release_artists),
+    Field("styles"),
+    Field("identifiers", "barcode", transform_barcode, required=True),
+    Field("tracklist", "tracks", transform_tracklist),
+)
+
+
 @dataclass
 class DiscogsSearchResult:
     id: int
     type: DiscogsTypeLiterals
     title: str = ""
     url: t.Optional[str] = None
+    barcodes: t.List[str] = field(default_factory=list)
 
     data: t.Dict[str, t.Any] = field(default_factory=dict, repr=False)
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
+        defaults = pick_fields(data, DISCOGS_SEARCH_RESULT_FIELDS)
+        return cls(**defaults, data=data)
 
-        safe_keys = ("id", "type", "title", "uri")
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
 
-        if "uri" in defaults:
-            defaults["url"] = f"https://discogs.com{defaults.pop('uri')}"
+def transform_uri(value: str) -> str:
+    """
+    Format a Discogs URI as a URL.
+    """
+    return f"https://discogs.com{value}"
 
-        return cls(**defaults, data=data)
+
+DISCOGS_SEARCH_RESULT_FIELDS = (
+    Field("id"),
+    Field("type"),
+    Field("title"),
+    Field("uri", "url", transform_uri),
+    Field("barcode", "barcodes"),
+)
@@ -0,0 +1,401 @@
+import gzip
+import json
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, cast
+from xml.etree.ElementTree import Element, iterparse
+
+from sqlite_utils.db import Database, Table
+
+from ...settings import Settings
+from . import data
+
+# The number of releases or artists written to the index in each transaction.
+DUMP_BATCH_SIZE = 1_000
+
+# The most releases a barcode lookup returns, like the API's search results.
+MAX_BARCODE_MATCHES = 10
+
+RE_NOT_BARCODE = re.compile(r"[^0-9]")
+
+
+def normalize_barcode(barcode: str) -> str:
+    """
+    Strip the spaces and dashes from a barcode, so it can be matched to an
+    ISBN.
+    """
+    return RE_NOT_BARCODE.sub("", barcode)
+
+
+def get_barcode_variants(barcode: str) -> List[str]:
+    """
+    Get the ways a normalized barcode can be written, as a 12 digit UPC-A is
+    the same code as the 13 digit EAN-13 with a leading zero.
+    """
+    if len(barcode) == 12:
+        return [barcode, f"0{barcode}"]
+
+    if len(barcode) == 13 and barcode.startswith("0"):
+        return [barcode, barcode[1:]]
+
+    return [barcode]
+
+
+def format_int(value: Optional[str]) -> Optional[int]:
+    """
+    Convert a Discogs dump's numeric text, or attribute, to Python integer.
+    """
+    if value is None or value.strip() == "":
+        return None
+
+    return int(value)
+
+
+def format_year(value: Optional[str]) -> int:
+    """
+    Convert a Discogs dump's released date, like "1999-03-00", to a year. The
+    API uses zero for releases without a year.
+    """
+    if value is None or value[:4].isdigit() is False:
+        return 0
+
+    return int(value[:4])
+
+
+def transform_image_element(element: Element) -> Dict[str, Any]:
+    """
+    Transform an image element in to the API's image object.
+    """
+    return {
+        "type": element.get("type"),
+        "height": format_int(element.get("height")),
+        "width": format_int(element.get("width")),
+        "uri": element.get("uri"),
+        "resource_url": element.get("uri"),
+    }
+
+
+def transform_artist_credit_element(element: Element) -> Dict[str, Any]:
+    """
+    Transform a release's, or track's, artist element in to the API's artist
+    credit object.
+    """
+    return {
+        "id": format_int(element.findtext("id")),
+        "name": element.findtext("name") or "",
+        "anv": element.findtext("anv") or "",
+        "join": element.findtext("join") or "",
+        "role": element.findtext("role") or "",
+    }
+
+
+def transform_track_element(element: Element) -> Dict[str, Any]:
+    """
+    Transform a track element in to the API's track object.
+    """
+    return {
+        "position": element.findtext("position") or "",
+        "title": element.findtext("title") or "",
+        "duration": element.findtext("duration") or "",
+        "extraartists": [
+            transform_artist_credit_element(artist)
+            for artist in element.iterfind("extraartists/artist")
+        ],
+    }
+
+
+def transform_release_element(element: Element) -> Dict[str, Any]:
+    """
+    Transform a release element from the releases dump in to the API's
+    release object, with the fields `DiscogsRelease.from_data` uses.
+    """
+    released = element.findtext("released")
+
+    return {
+        "id": format_int(element.get("id")),
+        "status": element.get("status"),
+        "title": element.findtext("title") or "",
+        "year": format_year(released),
+        "released": released,
+        "country": element.findtext("country"),
+        "artists": [
+            transform_artist_credit_element(artist)
+            for artist in element.iterfind("artists/artist")
+        ],
+        "extraartists": [
+            transform_artist_credit_element(artist)
+            for artist in element.iterfind("extraartists/artist")
+        ],
+        "genres": [genre.text for genre in element.iterfind("genres/genre")],
+        "styles": [style.text for style in element.iterfind("styles/style")],
+        "identifiers": [
+            dict(identifier.attrib)
+            for identifier in element.iterfind("identifiers/identifier")
+        ],
+        "tracklist": [
+            transform_track_element(track)
+            for track in element.iterfind("tracklist/track")
+        ],
+        "images": [
+            transform_image_element(image)
+            for image in element.iterfind("images/image")
+        ],
+    }
+
+
+def transform_artist_element(element: Element) -> Dict[str, Any]:
+    """
+    Transform an artist element from the artists dump in to the API's artist
+    object, with the fields `DiscogsArtist.from_data` uses.
+    """
+    return {
+        "id": format_int(element.findtext("id")),
+        "name": element.findtext("name") or "",
+        "realname": element.findtext("realname"),
+        "profile": element.findtext("profile") or "",
+        "namevariations": [
+            name.text for name in element.iterfind("namevariations/name")
+        ],
+        "members": [
+            {"id": format_int(member.get("id")), "name": member.text or ""}
+            for member in element.iterfind("members/name")
+        ],
+        "images": [
+            transform_image_element(image)
+            for image in element.iterfind("images/image")
+        ],
+    }
+
+
+def open_dump(path: Path) -> IO[bytes]:
+    """
+    Open a Discogs dump, which may or may not be gzipped.
+    """
+    if path.suffix == ".gz":
+        return cast(IO[bytes], gzip.open(path, "rb"))
+
+    return path.open("rb")
+
+
+def iter_dump_elements(file: IO[bytes]) -> Iterator[Element]:
+    """
+    Iterate over the top level elements of a Discogs dump (its releases or
+    artists) as they're parsed.
+
+    Each element is only complete until the next one is read, as the parsed
+    elements are cleared from the tree so it never grows with the dump.
+    """
+    root: Optional[Element] = None
+    depth = 0
+
+    for event, element in iterparse(file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1 and root is not None:
+            yield element
+            element.clear()
+            root.clear()
+
+
+def iter_dump(file: IO[bytes]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Iterate over the releases or artists in a Discogs dump, as the entity's
+    type and its API shaped data.
+    """
+    for element in iter_dump_elements(file):
+        if element.tag == "release":
+            yield "release", transform_release_element(element)
+        elif element.tag == "artist":
+            yield "artist", transform_artist_element(element)
+
+
+def get_barcodes(release_data: Dict[str, Any]) -> List[str]:
+    """
+    Get the normalised barcodes from a release's identifiers.
+    """
+    barcodes = (
+        normalize_barcode(identifier.get("value") or "")
+        for identifier in release_data["identifiers"]
+        if identifier.get("type") == "Barcode"
+    )
+    return list(dict.fromkeys(barcode for barcode in barcodes if barcode))
+
+
+class DiscogsDumpIndex:
+    """
+    A local, SQLite backed, index of Discogs' releases and artists, built
+    from their data dumps, with the releases indexed by barcode.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # The index is shared by all the threads searching for releases.
+        self._lock = threading.Lock()
+        self.db = Database(sqlite3.connect(str(path), check_same_thread=False))
+
+        self.releases: Table = self.db.table("releases")  # type: ignore
+        self.releases.create(
+            columns={"id": int, "data": str},
+            pk="id",
+            not_null={"data"},
+            if_not_exists=True,
+        )
+
+        self.artists: Table = self.db.table("artists")  # type: ignore
+        self.artists.create(
+            columns={"id": int, "data": str},
+            pk="id",
+            not_null={"data"},
+            if_not_exists=True,
+        )
+
+        # Many releases, like represses, share a barcode.
+        self.barcodes: Table = self.db.table("barcodes")  # type: ignore
+        self.barcodes.create(
+            columns={"barcode": str, "release_id": int},
+            pk=("barcode", "release_id"),
+            if_not_exists=True,
+        )
+        self.barcodes.create_index(["release_id"], if_not_exists=True)
+
+    def save(self, entities: List[Tuple[str, Dict[str, Any]]]):
+        """
+        Save a batch of releases and artists, replacing any older copies.
+        """
+        releases = [data for type, data in entities if type == "release"]
+        artists = [data for type, data in entities if type == "artist"]
+
+        with self._lock, self.db.conn:
+            self.db.conn.executemany(
+                "insert or replace into releases (id, data) values (?, ?)",
+                [(release["id"], json.dumps(release)) for release in releases],
+            )
+            # A re-imported release's barcodes may have been corrected.
+            self.db.conn.executemany(
+                "delete from barcodes where release_id = ?",
+                [(release["id"],) for release in releases],
+            )
+            self.db.conn.executemany(
+                "insert or replace into barcodes (barcode, release_id) "
+                "values (?, ?)",
+                [
+                    (barcode, release["id"])
+                    for release in releases
+                    for barcode in get_barcodes(release)
+                ],
+            )
+            self.db.conn.executemany(
+                "insert or replace into artists (id, data) values (?, ?)",
+                [(artist["id"], json.dumps(artist)) for artist in artists],
+            )
+
+    def import_dump(
+        self, path: Path, *, batch_size: int = DUMP_BATCH_SIZE
+    ) -> int:
+        """
+        Import a Discogs releases or artists dump, returning the number of
+        entities indexed. Only one batch of entities is in memory at a time.
+        """
+        count = 0
+
+        with open_dump(path) as file:
+            entities = iter_dump(file)
+            while True:
+                batch = list(islice(entities, batch_size))
+                if not batch:
+                    break
+
+                self.save(batch)
+                count += len(batch)
+
+        return count
+
+    def get_data(self, table: str, entity_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a release's, or artist's, data by its ID.
+        """
+        with self._lock:
+            row = self.db.execute(
+                f"select data from {table} where id = ?", [entity_id]
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def get_release(self, release_id: int) -> Optional[data.DiscogsRelease]:
+        """
+        Get a release by its ID.
+        """
+        release_data = self.get_data("releases", release_id)
+        if release_data is None:
+            return None
+
+        return data.DiscogsRelease.from_data(release_data)
+
+    def get_releases_by_barcode(
+        self, barcode: str
+    ) -> List[data.DiscogsRelease]:
+        """
+        Get the releases with a barcode, ignoring its spaces and dashes, and
+        whether it's written as a UPC-A or an EAN-13.
+
+        Only whole barcodes are matched, so they're looked up in the index,
+        unlike the API's search results, which can match part of a barcode.
+        """
+        normalized_barcode = normalize_barcode(barcode)
+        if normalized_barcode == "":
+            return []
+
+        variants = get_barcode_variants(normalized_barcode)
+        placeholders = ", ".join("?" for _ in variants)
+
+        with self._lock:
+            rows = self.db.execute(
+                f"""
+                select releases.data
+                from barcodes
+                join releases on releases.id = barcodes.release_id
+                where barcodes.barcode in ({placeholders})
+                group by releases.id
+                order by releases.id
+                limit ?
+                """,
+                [*variants, MAX_BARCODE_MATCHES],
+            ).fetchall()
+
+        return [
+            data.DiscogsRelease.from_data(json.loads(row[0])) for row in rows
+        ]
+
+    def get_artist(self, artist_id: int) -> Optional[data.DiscogsArtist]:
+        """
+        Get an artist by its ID.
+        """
+        artist_data = self.get_data("artists", artist_id)
+        if artist_data is None:
+            return None
+
+        return data.DiscogsArtist.from_data(artist_data)
+
+
+@lru_cache(maxsize=None)
+def get_discogs_dump_index() -> Optional[DiscogsDumpIndex]:
+    """
+    Get the process wide Discogs dump index, if a dump has been imported.
+    """
+    if Settings.DISCOGS_DUMP_INDEX_PATH.exists() is False:
+        return None
+
+    return DiscogsDumpIndex(path=Settings.DISCOGS_DUMP_INDEX_PATH)
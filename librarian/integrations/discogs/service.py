@@ -1,12 +1,49 @@
 import typing as t
+from functools import lru_cache
 
-from requests import Session
+from requests import Response, Session
 from requests.auth import AuthBase
 
 from ...settings import Settings
-from ...utils.http_client import HttpClient
+from ...utils.http_cache import HttpCache
+from ...utils.http_client import DEFAULT_POOL_SIZE, HttpClient
+from ...utils.rate_limiter import TokenBucket
 from . import data
 
+# The most results Discogs' search will return on a single page.
+SEARCH_MAX_PER_PAGE = 100
+
+
+@lru_cache(maxsize=None)
+def get_discogs_rate_limiter() -> TokenBucket:
+    """
+    Get the process wide rate limiter for Discogs' API, which allows 60
+    requests per minute for authenticated clients and 25 for everyone else.
+    """
+    if Settings.DISCOGS_PERSONAL_ACCESS_TOKEN is not None:
+        return TokenBucket(rate=60, per=60)
+
+    return TokenBucket(rate=25, per=60)
+
+
+def get_rate_limit(
+    headers: t.Mapping[str, str], status_code: int
+) -> t.Tuple[t.Optional[int], t.Optional[int]]:
+    """
+    Get the rate limit, and the number of requests remaining, from the
+    headers of a response from Discogs.
+    """
+    limit = headers.get("X-Discogs-Ratelimit")
+    remaining = headers.get("X-Discogs-Ratelimit-Remaining")
+
+    if status_code == 429:
+        remaining = "0"
+
+    return (
+        int(limit) if limit and limit.isdigit() else None,
+        int(remaining) if remaining and remaining.isdigit() else None,
+    )
+
 
 class DiscogsAuth(AuthBase):
     def __init__(self, token: str):
@@ -22,8 +59,21 @@ class DiscogsClient(HttpClient):
         self,
         base_url: t.Optional[str] = None,
         session: t.Optional[Session] = None,
+        cache: t.Optional[HttpCache] = None,
+        rate_limiter: t.Optional[TokenBucket] = None,
+        max_retries: int = 5,
+        pool_size: int = DEFAULT_POOL_SIZE,
     ):
-        super().__init__(session=session)
+        if rate_limiter is None:
+            rate_limiter = get_discogs_rate_limiter()
+
+        super().__init__(
+            session=session,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
+            pool_size=pool_size,
+        )
 
         if Settings.DISCOGS_PERSONAL_ACCESS_TOKEN is not None:
             self.session.auth = DiscogsAuth(
@@ -35,6 +85,18 @@ class DiscogsClient(HttpClient):
 
         self.base_url = base_url
 
+    def update_rate_limit(self, response: Response):
+        """
+        Update the rate limiter from Discogs' rate limit headers.
+        """
+        if self.rate_limiter is None:
+            return
+
+        limit, remaining = get_rate_limit(
+            response.headers, response.status_code
+        )
+        self.rate_limiter.update(limit=limit, remaining=remaining)
+
     def get_release(
         self,
         release_id: int,
@@ -77,13 +139,24 @@ class DiscogsClient(HttpClient):
         query: t.Optional[str] = None,
         type: t.Optional[data.DiscogsTypeLiterals] = None,
         barcode: t.Optional[str] = None,
+        limit: t.Optional[int] = None,
         **kwargs,
     ) -> t.Generator[data.DiscogsSearchResult, None, None]:
         """
         Search Discogs.
+
+        The results are paginated, the next page is only requested once the
+        previous one has been consumed, and no more than `limit` results are
+        returned.
         """
         params: t.Dict[str, t.Any] = kwargs.pop("params", {})
 
+        if limit is not None:
+            if limit <= 0:
+                return
+
+            params.setdefault("per_page", min(limit, SEARCH_MAX_PER_PAGE))
+
         if query is not None:
             params["query"] = query
 
@@ -111,3 +184,17 @@ class DiscogsClient(HttpClient):
 
             for result in response_data["results"]:
                 yield data.DiscogsSearchResult.from_data(result)
+
+                if limit is not None:
+                    limit -= 1
+                    if limit == 0:
+                        return
+
+
+@lru_cache(maxsize=None)
+def get_discogs_client(pool_size: int = DEFAULT_POOL_SIZE) -> DiscogsClient:
+    """
+    Get the process wide Discogs client, so its connections are reused, with
+    a connection pool of `pool_size` connections.
+    """
+    return DiscogsClient(pool_size=pool_size)
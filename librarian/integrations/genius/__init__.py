@@ -1,9 +1,10 @@
 from .data import GeniusReferent, GeniusSearchHit, GeniusSong
-from .service import GeniusClient
+from .service import GeniusClient, get_genius_client
 
 __all__ = [
     "GeniusClient",
     "GeniusSearchHit",
     "GeniusReferent",
     "GeniusSong",
+    "get_genius_client",
 ]
@@ -0,0 +1,129 @@
+import typing as t
+
+import httpx
+
+from ...settings import Settings
+from ...utils.async_http_client import AsyncHttpClient
+from ...utils.http_client import DEFAULT_POOL_SIZE
+from . import data
+
+
+class AsyncGeniusClient(AsyncHttpClient):
+    """
+    The asyncio counterpart to the GeniusClient.
+    """
+
+    def __init__(
+        self,
+        base_url: t.Optional[str] = None,
+        client: t.Optional[httpx.AsyncClient] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        super().__init__(client=client, pool_size=pool_size)
+
+        if Settings.GENIUS_CLIENT_ACCESS_TOKEN is not None:
+            self.client.headers[
+                "Authorization"
+            ] = f"Bearer {Settings.GENIUS_CLIENT_ACCESS_TOKEN}"
+
+        if base_url is None:
+            base_url = "https://api.genius.com"
+
+        self.base_url = base_url
+
+    async def get_referents(
+        self,
+        created_by_id: t.Optional[int] = None,
+        song_id: t.Optional[int] = None,
+        web_page_id: t.Optional[int] = None,
+        text_format: t.Optional[
+            t.Union[data.TEXT_FORMAT_LITERAL, t.List[data.TEXT_FORMAT_LITERAL]]
+        ] = "dom",
+        **kwargs,
+    ) -> t.List[data.GeniusReferent]:
+        """
+        Returns a list of referents from Genius.
+        """
+        if song_id is not None and web_page_id is not None:
+            raise ValueError(
+                "You can only pass song_id or web_page_id, not both."
+            )
+
+        params: t.Dict[str, t.Any] = kwargs.pop("params", {})
+
+        if created_by_id is not None:
+            params["created_by_id"] = created_by_id
+
+        if song_id is not None:
+            params["song_id"] = song_id
+
+        if web_page_id is not None:
+            params["web_page_id"] = web_page_id
+
+        if text_format is not None:
+            if isinstance(text_format, str):
+                text_format = [text_format]
+
+            params["text_format"] = ",".join(text_format)
+
+        _, response = await self.get(
+            url=f"{self.base_url}/referents",
+            params=params,
+            **kwargs,
+        )
+        response.raise_for_status()
+        response_data = response.json()
+        referents = response_data["response"]["referents"]
+
+        return [
+            data.GeniusReferent.from_data(referent) for referent in referents
+        ]
+
+    async def get_song(
+        self,
+        song_id: int,
+        text_format: t.Optional[
+            t.Union[data.TEXT_FORMAT_LITERAL, t.List[data.TEXT_FORMAT_LITERAL]]
+        ] = "dom",
+        **kwargs,
+    ) -> data.GeniusSong:
+        """
+        Get an artist by their ID from Genius.
+        """
+        params: t.Dict[str, t.Any] = kwargs.pop("params", {})
+
+        if text_format is not None:
+            if isinstance(text_format, str):
+                text_format = [text_format]
+
+            params["text_format"] = ",".join(text_format)
+
+        _, response = await self.get(
+            url=f"{self.base_url}/songs/{song_id}",
+            params=params,
+            **kwargs,
+        )
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.GeniusSong.from_data(response_data)
+
+    async def search(
+        self, query: str, **kwargs
+    ) -> t.List[data.GeniusSearchHit]:
+        """
+        Search for artists and songs from Genius.
+        """
+        params: t.Dict[str, t.Any] = kwargs.pop("params", {})
+        params["q"] = query
+
+        _, response = await self.get(
+            url=f"{self.base_url}/search",
+            params=params,
+            **kwargs,
+        )
+        response.raise_for_status()
+        response_data = response.json()
+        hits = response_data["response"]["hits"]
+
+        return [data.GeniusSearchHit.from_data(hit) for hit in hits]
@@ -1,8 +1,9 @@
 import datetime
 import typing as t
-from copy import deepcopy
 from dataclasses import dataclass, field
 
+from ...utils.parsing import Field, pick_fields
+
 TEXT_FORMAT_LITERAL = t.Literal["dom", "plain", "html"]
 
 
@@ -14,14 +15,11 @@ class GeniusReferent:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
+        defaults = pick_fields(data, GENIUS_REFERENT_FIELDS)
+        return cls(**defaults, data=data)
 
-        safe_keys = ("id",)
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
 
-        return cls(**defaults, data=data)
+GENIUS_REFERENT_FIELDS = (Field("id"),)
 
 
 @dataclass
@@ -34,16 +32,15 @@ class GeniusSearchHit:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-        defaults_type = defaults.pop("type")
-        defaults_result = defaults.pop("result")
+        defaults = pick_fields(data["result"], GENIUS_SEARCH_HIT_RESULT_FIELDS)
+        defaults["type"] = data["type"]
+        return cls(**defaults, data=data)
 
-        safe_keys = ("id", "full_title", "type")
-        to_remove = [k for k in defaults_result.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults_result[key]
 
-        return cls(type=defaults_type, **defaults_result, data=data)
+GENIUS_SEARCH_HIT_RESULT_FIELDS = (
+    Field("id"),
+    Field("full_title"),
+)
 
 
 @dataclass
@@ -66,25 +63,9 @@ class GeniusSong:
         except KeyError:
             raise ValueError("Provided data is not a song response.")
 
-        defaults = deepcopy(song_data)
-
-        safe_keys = (
-            "id",
-            "title",
-            "artist_names",
-            "release_date",
-            "description",
-        )
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
-
-        if "release_date" in defaults:
-            defaults["release_date"] = datetime.date.fromisoformat(
-                defaults["release_date"]
-            )
-
-        description = defaults.pop("description", {})
+        defaults = pick_fields(song_data, GENIUS_SONG_FIELDS)
+
+        description = song_data.get("description", {})
         if "dom" in description:
             defaults["description_dom"] = description["dom"]
         elif "html" in description:
@@ -93,3 +74,11 @@ class GeniusSong:
             defaults["description_plain"] = description["plain"]
 
         return cls(**defaults, data=song_data)
+
+
+GENIUS_SONG_FIELDS = (
+    Field("id"),
+    Field("title"),
+    Field("artist_names"),
+    Field("release_date", transform=datetime.date.fromisoformat),
+)
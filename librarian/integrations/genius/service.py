@@ -1,10 +1,12 @@
 import typing as t
+from functools import lru_cache
 
 from requests import Session
 from requests.auth import AuthBase
 
 from ...settings import Settings
-from ...utils.http_client import HttpClient
+from ...utils.http_cache import HttpCache
+from ...utils.http_client import DEFAULT_POOL_SIZE, HttpClient
 from . import data
 
 
@@ -22,8 +24,10 @@ class GeniusClient(HttpClient):
         self,
         base_url: t.Optional[str] = None,
         session: t.Optional[Session] = None,
+        cache: t.Optional[HttpCache] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
     ):
-        super().__init__(session=session)
+        super().__init__(session=session, cache=cache, pool_size=pool_size)
 
         if Settings.GENIUS_CLIENT_ACCESS_TOKEN is not None:
             self.session.auth = GeniusAuth(
@@ -129,3 +133,12 @@ class GeniusClient(HttpClient):
         hits = response_data["response"]["hits"]
 
         return [data.GeniusSearchHit.from_data(hit) for hit in hits]
+
+
+@lru_cache(maxsize=None)
+def get_genius_client(pool_size: int = DEFAULT_POOL_SIZE) -> GeniusClient:
+    """
+    Get the process wide Genius client, so its connections are reused, with
+    a connection pool of `pool_size` connections.
+    """
+    return GeniusClient(pool_size=pool_size)
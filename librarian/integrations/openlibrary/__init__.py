@@ -4,12 +4,16 @@ from .data import (
     OpenLibraryLink,
     OpenLibraryWork,
 )
-from .service import OpenLibraryClient
+from .dump import OpenLibraryDumpIndex, get_openlibrary_dump_index
+from .service import OpenLibraryClient, get_openlibrary_client
 
 __all__ = [
     "OpenLibraryAuthor",
     "OpenLibraryBook",
     "OpenLibraryClient",
+    "OpenLibraryDumpIndex",
     "OpenLibraryLink",
     "OpenLibraryWork",
+    "get_openlibrary_client",
+    "get_openlibrary_dump_index",
 ]
@@ -0,0 +1,113 @@
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ...utils.async_http_client import AsyncHttpClient
+from ...utils.http_client import DEFAULT_POOL_SIZE
+from . import data
+from .service import BULK_ISBNS_PER_REQUEST
+
+
+class AsyncOpenLibraryClient(AsyncHttpClient):
+    """
+    The asyncio counterpart to the OpenLibraryClient.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        super().__init__(client=client, pool_size=pool_size)
+
+        self.base_url = "https://openlibrary.org"
+
+    async def get_book_from_isbn(
+        self, isbn: str, **kwargs
+    ) -> data.OpenLibraryBook:
+        """
+        Get a book from the OpenLibrary API using its ISBN.
+        """
+        url = f"{self.base_url}/isbn/{isbn}.json"
+
+        _request, response = await self.get(url=url, **kwargs)
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.OpenLibraryBook.from_data(response_data)
+
+    async def get_book(self, key: str, **kwargs) -> data.OpenLibraryBook:
+        """
+        Get a book (edition) from the OpenLibrary API using its key.
+        """
+        url = f"{self.base_url}/books/{key}.json"
+
+        _request, response = await self.get(url=url, **kwargs)
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.OpenLibraryBook.from_data(response_data)
+
+    async def get_books_from_isbns(
+        self, isbns: List[str], **kwargs
+    ) -> Dict[str, data.OpenLibraryBook]:
+        """
+        Get multiple books from the OpenLibrary Books API using their ISBNs,
+        in as few requests as possible. ISBNs OpenLibrary doesn't know are
+        left out of the returned dictionary.
+        """
+        url = f"{self.base_url}/api/books"
+        params: Dict[str, Any] = kwargs.pop("params", {})
+
+        # Remove any duplicates ISBNs while keeping their order.
+        isbns = list(dict.fromkeys(isbns))
+
+        books: Dict[str, data.OpenLibraryBook] = {}
+        for index in range(0, len(isbns), BULK_ISBNS_PER_REQUEST):
+            chunk = isbns[index : index + BULK_ISBNS_PER_REQUEST]
+
+            _request, response = await self.get(
+                url=url,
+                params={
+                    **params,
+                    "bibkeys": ",".join(f"ISBN:{isbn}" for isbn in chunk),
+                    "format": "json",
+                    "jscmd": "details",
+                },
+                **kwargs,
+            )
+            response.raise_for_status()
+            response_data = response.json()
+
+            for isbn in chunk:
+                result = response_data.get(f"ISBN:{isbn}")
+                if result is None:
+                    continue
+
+                books[isbn] = data.OpenLibraryBook.from_data(result["details"])
+
+        return books
+
+    async def get_author(self, key: str, **kwargs) -> data.OpenLibraryAuthor:
+        """
+        Get an author from the OpenLibrary API using its key.
+        """
+        url = f"{self.base_url}/authors/{key}.json"
+
+        _request, response = await self.get(url=url, **kwargs)
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.OpenLibraryAuthor.from_data(response_data)
+
+    async def get_work(self, key: str, **kwargs) -> data.OpenLibraryWork:
+        """
+        Get a work from OpenLibrary API using its key.
+        """
+        url = f"{self.base_url}/works/{key}.json"
+
+        _request, response = await self.get(url=url, **kwargs)
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.OpenLibraryWork.from_data(response_data)
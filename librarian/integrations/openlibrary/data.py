@@ -1,12 +1,17 @@
 import datetime
 import re
 import typing as t
-from copy import deepcopy
 from dataclasses import dataclass, field
 
 import pytz
 from dateutil.parser import parse as dateutil_parse
 
+from ...utils.parsing import Field, pick_fields
+
+# The date formats Open Library uses the most, these are much quicker to parse
+# than falling back to dateutil's parser.
+DATE_FORMATS = ("%B %d, %Y", "%d %B %Y")
+
 
 def format_date(value: t.Optional[str]) -> t.Optional[datetime.date]:
     """
@@ -15,11 +20,14 @@ def format_date(value: t.Optional[str]) -> t.Optional[datetime.date]:
     if value is None or value.strip() == "":
         return None
 
-    try:
-        return datetime.datetime.strptime(value, "%B %d, %Y").date()
-    except ValueError:
-        default = datetime.datetime(2023, 1, 1)
-        return dateutil_parse(value, default=default).date()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+
+    default = datetime.datetime(2023, 1, 1)
+    return dateutil_parse(value, default=default).date()
 
 
 def format_datetime(value: t.Optional[str]) -> t.Optional[datetime.datetime]:
@@ -57,6 +65,33 @@ def format_key_list(data: t.List[t.Dict[str, str]]) -> t.List[str]:
     return [format_key(key["key"]) for key in data]
 
 
+def format_type_key(value: t.Dict[str, str]) -> str:
+    """
+    Convert an Open Library type object to Python string.
+    """
+    return format_key(value["key"])
+
+
+def format_text(value: t.Union[str, t.Dict[str, str]]) -> str:
+    """
+    Convert an Open Library text object, or plain string, to Python string.
+    """
+    if isinstance(value, dict):
+        return value["value"]
+
+    return value
+
+
+def format_datetime_value(
+    value: t.Dict[str, str]
+) -> t.Optional[datetime.datetime]:
+    """
+    Convert an Open Library datetime object to a Python timezone aware
+    datetime object.
+    """
+    return format_datetime(value["value"])
+
+
 @dataclass
 class OpenLibraryBook:
     title: str
@@ -90,57 +125,35 @@ class OpenLibraryBook:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-
-        safe_keys = (
-            "title",
-            "publish_date",
-            "isbn_10",
-            "isbn_13",
-            "key",
-            "type",
-            "authors",
-            "languages",
-            "works",
-            "publishers",
-            "number_of_pages",
-            "covers",
-            "ocaid",
-            "contributions",
-            "classifications",
-            "source_records",
-            "identifiers",
-            "local_id",
-            "first_sentence",
-            "latest_revision",
-            "revision",
-            "created",
-            "last_modified",
-        )
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
-
-        defaults["key"] = format_key(defaults.pop("key"))
-        defaults["publish_date"] = format_date(defaults.pop("publish_date"))
-        defaults["type_key"] = format_key(defaults.pop("type")["key"])
-        defaults["author_keys"] = format_key_list(defaults.pop("authors", []))
-        defaults["language_keys"] = format_key_list(
-            defaults.pop("languages", [])
-        )
+        defaults = pick_fields(data, OPENLIBRARY_BOOK_FIELDS)
+        return cls(**defaults, data=data)
 
-        if "works" in defaults:
-            defaults["work_keys"] = format_key_list(defaults.pop("works"))
 
-        if "first_sentence" in defaults:
-            defaults["first_sentence"] = defaults.pop("first_sentence")["value"]
-
-        defaults["created"] = format_datetime(defaults.pop("created")["value"])
-        defaults["last_modified"] = format_datetime(
-            defaults.pop("last_modified")["value"]
-        )
-
-        return cls(**defaults, data=data)
+OPENLIBRARY_BOOK_FIELDS = (
+    Field("title"),
+    Field("key", transform=format_key, required=True),
+    Field("publish_date", transform=format_date, required=True),
+    Field("isbn_10"),
+    Field("isbn_13"),
+    Field("type", "type_key", format_type_key, required=True),
+    Field("authors", "author_keys", format_key_list),
+    Field("languages", "language_keys", format_key_list),
+    Field("works", "work_keys", format_key_list),
+    Field("publishers"),
+    Field("number_of_pages"),
+    Field("covers"),
+    Field("ocaid"),
+    Field("contributions"),
+    Field("classifications"),
+    Field("source_records"),
+    Field("identifiers"),
+    Field("local_id"),
+    Field("first_sentence", transform=format_text),
+    Field("latest_revision"),
+    Field("revision"),
+    Field("created", transform=format_datetime_value, required=True),
+    Field("last_modified", transform=format_datetime_value, required=True),
+)
 
 
 @dataclass
@@ -168,47 +181,45 @@ class OpenLibraryWork:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-
-        safe_keys = (
-            "title",
-            "key",
-            "type",
-            "authors",
-            "description",
-            "covers",
-            "subject_places",
-            "subjects",
-            "subject_people",
-            "subject_times",
-            "location",
-            "latest_revision",
-            "revision",
-            "created",
-            "last_modified",
-        )
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
-
-        defaults["key"] = format_key(defaults.pop("key"))
-        defaults["type_key"] = format_key(defaults.pop("type")["key"])
+        defaults = pick_fields(data, OPENLIBRARY_WORK_FIELDS)
+        return cls(**defaults, data=data)
 
-        authors = defaults.pop("authors", [])
-        defaults["author_keys"] = []
-        for author in authors:
-            defaults["author_keys"].append(format_key(author["author"]["key"]))
 
-        description = defaults.pop("description", "")
-        if isinstance(description, dict) is True:
-            defaults["description"] = description["value"]
-        elif isinstance(description, str) is True:
-            defaults["description"] = description
+def format_work_author_keys(value: t.List[t.Dict[str, t.Any]]) -> t.List[str]:
+    """
+    Convert a list of Open Library work author objects to a Python list of
+    the authors' keys.
+    """
+    return [format_key(author["author"]["key"]) for author in value]
 
-        if "location" in defaults:
-            defaults["location"] = format_key(defaults.pop("location"))
 
-        return cls(**defaults, data=data)
+def format_work_description(value: t.Any) -> str:
+    """
+    Convert an Open Library work's description to Python string.
+    """
+    if isinstance(value, (str, dict)):
+        return format_text(value)
+
+    return ""
+
+
+OPENLIBRARY_WORK_FIELDS = (
+    Field("title"),
+    Field("key", transform=format_key, required=True),
+    Field("type", "type_key", format_type_key, required=True),
+    Field("authors", "author_keys", format_work_author_keys),
+    Field("description", transform=format_work_description),
+    Field("covers"),
+    Field("subject_places"),
+    Field("subjects"),
+    Field("subject_people"),
+    Field("subject_times"),
+    Field("location", transform=format_key),
+    Field("latest_revision"),
+    Field("revision"),
+    Field("created"),
+    Field("last_modified"),
+)
 
 
 @dataclass
@@ -219,14 +230,15 @@ class OpenLibraryLink:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        data["type_key"] = format_key(data.pop("type")["key"])
+        defaults = pick_fields(data, OPENLIBRARY_LINK_FIELDS)
+        return cls(**defaults)
 
-        safe_keys = ("url", "title", "type_key")
-        to_remove = [k for k in data.keys() if k not in safe_keys]
-        for key in to_remove:
-            del data[key]
 
-        return cls(**data)
+OPENLIBRARY_LINK_FIELDS = (
+    Field("url"),
+    Field("title"),
+    Field("type", "type_key", format_type_key, required=True),
+)
 
 
 @dataclass
@@ -252,51 +264,32 @@ class OpenLibraryAuthor:
 
     @classmethod
     def from_data(cls, data: t.Dict[str, t.Any]):
-        defaults = deepcopy(data)
-
-        safe_keys = (
-            "key",
-            "name",
-            "personal_name",
-            "bio",
-            "birth_date",
-            "death_date",
-            "remote_ids",
-            "links",
-            "type",
-            "photos",
-            "source_records",
-            "latest_revision",
-            "revision",
-            "created",
-            "last_modified",
-        )
-        to_remove = [k for k in defaults.keys() if k not in safe_keys]
-        for key in to_remove:
-            del defaults[key]
-
-        defaults["key"] = format_key(defaults.pop("key"))
-        defaults["type_key"] = format_key(defaults.pop("type")["key"])
-
-        if "birth_date" in defaults:
-            defaults["birth_date"] = format_date(defaults.pop("birth_date"))
-
-        if "death_date" in defaults:
-            defaults["death_date"] = format_date(defaults.pop("death_date"))
-
-        if "created" in defaults:
-            defaults["created"] = format_datetime(
-                defaults.pop("created")["value"]
-            )
-
-        if "last_modified" in defaults:
-            defaults["last_modified"] = format_datetime(
-                defaults.pop("last_modified")["value"]
-            )
+        defaults = pick_fields(data, OPENLIBRARY_AUTHOR_FIELDS)
+        return cls(**defaults, data=data)
 
-        if "links" in defaults:
-            defaults["links"] = [
-                OpenLibraryLink.from_data(link) for link in defaults["links"]
-            ]
 
-        return cls(**defaults, data=data)
+def format_links(value: t.List[t.Dict[str, t.Any]]) -> t.List[OpenLibraryLink]:
+    """
+    Convert a list of Open Library link objects to a Python list of
+    OpenLibraryLink dataclasses.
+    """
+    return [OpenLibraryLink.from_data(link) for link in value]
+
+
+OPENLIBRARY_AUTHOR_FIELDS = (
+    Field("key", transform=format_key, required=True),
+    Field("name"),
+    Field("personal_name"),
+    Field("bio"),
+    Field("birth_date", transform=format_date),
+    Field("death_date", transform=format_date),
+    Field("remote_ids"),
+    Field("links", transform=format_links),
+    Field("type", "type_key", format_type_key, required=True),
+    Field("photos"),
+    Field("source_records"),
+    Field("latest_revision"),
+    Field("revision"),
+    Field("created", transform=format_datetime_value),
+    Field("last_modified", transform=format_datetime_value),
+)
@@ -0,0 +1,409 @@
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from sqlite_utils.db import Database, Table
+
+from ...settings import Settings
+from ...utils.database import add_missing_columns
+from . import data
+
+# The Open Library types we index, and the names we index them under.
+DUMP_TYPES = {
+    "/type/edition": "edition",
+    "/type/work": "work",
+    "/type/author": "author",
+}
+
+# The prefix of the edition lines, the only ones that need decoding.
+EDITION_LINE_PREFIX = "/type/edition\t"
+
+# The number of dump lines each worker process parses at a time.
+DUMP_CHUNK_SIZE = 10_000
+
+# SQLite's default limit on the number of variables in a statement is 999.
+MAX_VARIABLES_PER_QUERY = 900
+
+RE_NOT_ISBN = re.compile(r"[^0-9X]")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DumpEntity(NamedTuple):
+    """
+    An entity parsed from an Open Library dump.
+    """
+
+    key: str
+    type: str
+    data: str
+    isbns: List[str]
+    last_modified: str
+
+
+def normalize_isbn(isbn: str) -> str:
+    """
+    Strip the hyphens and spaces Open Library sometimes leaves in ISBNs.
+    """
+    return RE_NOT_ISBN.sub("", isbn.upper())
+
+
+def parse_dump_line(line: str) -> Optional[DumpEntity]:
+    """
+    Parse a line from an Open Library dump, which is tab separated: the type,
+    key, revision, last modified date, and the entity's JSON. Lines for types
+    we don't index, or that are malformed, are skipped.
+    """
+    columns = line.rstrip("\n").split("\t", 4)
+    if len(columns) != 5 or columns[0] not in DUMP_TYPES:
+        return None
+
+    entity_type = DUMP_TYPES[columns[0]]
+
+    try:
+        key = data.format_key(columns[1])
+    except ValueError:
+        return None
+
+    # Only the editions have to be decoded, to find their ISBNs, the works'
+    # and authors' JSON is stored as is.
+    isbns: List[str] = []
+    if entity_type == "edition":
+        try:
+            entity_data = json.loads(columns[4])
+        except ValueError:
+            return None
+
+        isbns = [
+            normalize_isbn(isbn)
+            for isbn in [
+                *entity_data.get("isbn_10", []),
+                *entity_data.get("isbn_13", []),
+            ]
+        ]
+
+    return DumpEntity(
+        key=key,
+        type=entity_type,
+        data=columns[4],
+        isbns=isbns,
+        last_modified=columns[3],
+    )
+
+
+def parse_dump_lines(lines: List[str]) -> List[DumpEntity]:
+    """
+    Parse a chunk of lines from an Open Library dump.
+    """
+    entities = []
+    for line in lines:
+        entity = parse_dump_line(line)
+        if entity is not None:
+            entities.append(entity)
+
+    return entities
+
+
+def partition_dump_lines(
+    lines: List[str],
+) -> Tuple[List[str], List[DumpEntity]]:
+    """
+    Split a chunk of lines from an Open Library dump into the edition lines,
+    which are worth sending to a worker process to decode, and the other
+    entities, which are cheap enough to parse here.
+    """
+    edition_lines = []
+    other_lines = []
+    for line in lines:
+        if line.startswith(EDITION_LINE_PREFIX):
+            edition_lines.append(line)
+        else:
+            other_lines.append(line)
+
+    return edition_lines, parse_dump_lines(other_lines)
+
+
+def open_dump(path: Path) -> IO[str]:
+    """
+    Open an Open Library dump, which may or may not be gzipped.
+    """
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return path.open("r", encoding="utf-8")
+
+
+def read_dump_chunks(
+    file: IO[str], chunk_size: int = DUMP_CHUNK_SIZE
+) -> Iterator[List[str]]:
+    """
+    Read an Open Library dump in chunks of lines, so only a few chunks are
+    in memory at a time.
+    """
+    while True:
+        chunk = list(islice(file, chunk_size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def map_bounded(
+    executor: Executor,
+    fn: Callable[[T], R],
+    iterable: Iterable[T],
+    max_pending: int,
+) -> Iterator[R]:
+    """
+    Like `Executor.map`, but only reads `max_pending` items ahead of the
+    results, as `Executor.map` reads the whole iterable up front.
+    """
+    pending: Deque[Future] = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+class OpenLibraryDumpIndex:
+    """
+    A local, SQLite backed, index of Open Library's editions, works, and
+    authors, built from their data dumps, with the editions indexed by ISBN.
+
+    An ISBN shared by several editions is indexed to the most recently
+    modified of them, whatever order they're imported in.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # The index is shared by all the threads fetching books.
+        self._lock = threading.Lock()
+        self.db = Database(sqlite3.connect(str(path), check_same_thread=False))
+
+        self.entities: Table = self.db.table("entities")  # type: ignore
+        self.entities.create(
+            columns={"key": str, "type": str, "data": str},
+            pk="key",
+            not_null={"type", "data"},
+            if_not_exists=True,
+        )
+
+        self.isbns: Table = self.db.table("isbns")  # type: ignore
+        self.isbns.create(
+            columns={"isbn": str, "key": str, "last_modified": str},
+            pk="isbn",
+            not_null={"key"},
+            if_not_exists=True,
+        )
+        add_missing_columns(self.isbns, {"last_modified": str})
+
+    def save(self, entities: List[DumpEntity]):
+        """
+        Save a chunk of parsed entities, replacing any older revisions.
+        """
+        with self._lock, self.db.conn:
+            self.db.conn.executemany(
+                "insert or replace into entities (key, type, data) "
+                "values (?, ?, ?)",
+                [(entity.key, entity.type, entity.data) for entity in entities],
+            )
+            # Keep the most recently modified edition for each ISBN, and the
+            # lowest key for editions modified at the same time.
+            self.db.conn.executemany(
+                """
+                insert into isbns (isbn, key, last_modified) values (?, ?, ?)
+                on conflict (isbn) do update set
+                    key = excluded.key,
+                    last_modified = excluded.last_modified
+                where
+                    excluded.last_modified > coalesce(isbns.last_modified, '')
+                    or (
+                        excluded.last_modified = isbns.last_modified
+                        and excluded.key < isbns.key
+                    )
+                """,
+                [
+                    (isbn, entity.key, entity.last_modified)
+                    for entity in entities
+                    for isbn in entity.isbns
+                ],
+            )
+
+    def import_dump(
+        self,
+        path: Path,
+        *,
+        processes: Optional[int] = None,
+        chunk_size: int = DUMP_CHUNK_SIZE,
+    ) -> int:
+        """
+        Import an Open Library dump, returning the number of entities indexed.
+
+        The dump is read one chunk at a time and the chunks' editions are
+        parsed by `processes` worker processes (defaulting to one per CPU),
+        while the works and authors, which don't need decoding, are parsed and
+        all the entities written to the index from this process.
+        """
+        count = 0
+
+        def edition_chunks(chunks: Iterator[List[str]]) -> Iterator[List[str]]:
+            nonlocal count
+
+            for chunk in chunks:
+                edition_lines, entities = partition_dump_lines(chunk)
+                self.save(entities)
+                count += len(entities)
+
+                yield edition_lines
+
+        with open_dump(path) as file:
+            chunks = read_dump_chunks(file, chunk_size)
+
+            if processes == 1:
+                for entities in map(parse_dump_lines, chunks):
+                    self.save(entities)
+                    count += len(entities)
+                return count
+
+            processes = processes or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                # Keep every worker busy, without reading the whole dump
+                # into memory.
+                for entities in map_bounded(
+                    executor,
+                    parse_dump_lines,
+                    edition_chunks(chunks),
+                    processes * 2,
+                ):
+                    self.save(entities)
+                    count += len(entities)
+
+        return count
+
+    def get_data(self, key: str, entity_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an entity's data by its key.
+        """
+        with self._lock:
+            row = self.db.execute(
+                "select data from entities where key = ? and type = ?",
+                [key, entity_type],
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def get_book(self, key: str) -> Optional[data.OpenLibraryBook]:
+        """
+        Get a book (edition) by its key.
+        """
+        book_data = self.get_data(key, "edition")
+        if book_data is None:
+            return None
+
+        return data.OpenLibraryBook.from_data(book_data)
+
+    def get_book_from_isbn(self, isbn: str) -> Optional[data.OpenLibraryBook]:
+        """
+        Get a book (edition) by its ISBN.
+        """
+        return self.get_books_from_isbns([isbn]).get(isbn)
+
+    def get_books_from_isbns(
+        self, isbns: List[str]
+    ) -> Dict[str, data.OpenLibraryBook]:
+        """
+        Get multiple books by their ISBNs. ISBNs that aren't in the index are
+        left out of the returned dictionary.
+        """
+        normalized_isbns: Dict[str, List[str]] = {}
+        for isbn in isbns:
+            normalized_isbns.setdefault(normalize_isbn(isbn), []).append(isbn)
+
+        keys = list(normalized_isbns.keys())
+
+        rows = []
+        with self._lock:
+            for index in range(0, len(keys), MAX_VARIABLES_PER_QUERY):
+                chunk = keys[index : index + MAX_VARIABLES_PER_QUERY]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows.extend(
+                    self.db.execute(
+                        f"""
+                        select isbns.isbn, entities.data
+                        from isbns
+                        join entities on entities.key = isbns.key
+                        where isbns.isbn in ({placeholders})
+                        """,
+                        chunk,
+                    ).fetchall()
+                )
+
+        books: Dict[str, data.OpenLibraryBook] = {}
+        for normalized_isbn, book_data in rows:
+            book = data.OpenLibraryBook.from_data(json.loads(book_data))
+            for isbn in normalized_isbns[normalized_isbn]:
+                books[isbn] = book
+
+        return books
+
+    def get_work(self, key: str) -> Optional[data.OpenLibraryWork]:
+        """
+        Get a work by its key.
+        """
+        work_data = self.get_data(key, "work")
+        if work_data is None:
+            return None
+
+        return data.OpenLibraryWork.from_data(work_data)
+
+    def get_author(self, key: str) -> Optional[data.OpenLibraryAuthor]:
+        """
+        Get an author by its key.
+        """
+        author_data = self.get_data(key, "author")
+        if author_data is None:
+            return None
+
+        return data.OpenLibraryAuthor.from_data(author_data)
+
+
+@lru_cache(maxsize=None)
+def get_openlibrary_dump_index() -> Optional[OpenLibraryDumpIndex]:
+    """
+    Get the process wide Open Library dump index, if a dump has been imported.
+    """
+    if Settings.OPENLIBRARY_DUMP_INDEX_PATH.exists() is False:
+        return None
+
+    return OpenLibraryDumpIndex(path=Settings.OPENLIBRARY_DUMP_INDEX_PATH)
@@ -1,14 +1,24 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from requests import Session
 
-from ...utils.http_client import HttpClient
+from ...utils.http_cache import HttpCache
+from ...utils.http_client import DEFAULT_POOL_SIZE, HttpClient
 from . import data
 
+# The maximum number of ISBNs to look up in one request to the Books API.
+BULK_ISBNS_PER_REQUEST = 100
+
 
 class OpenLibraryClient(HttpClient):
-    def __init__(self, session: Optional[Session] = None):
-        super().__init__(session=session)
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        cache: Optional[HttpCache] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        super().__init__(session=session, cache=cache, pool_size=pool_size)
 
         self.base_url = "https://openlibrary.org"
 
@@ -24,6 +34,58 @@ class OpenLibraryClient(HttpClient):
 
         return data.OpenLibraryBook.from_data(response_data)
 
+    def get_book(self, key: str, **kwargs) -> data.OpenLibraryBook:
+        """
+        Get a book (edition) from the OpenLibrary API using its key.
+        """
+        url = f"{self.base_url}/books/{key}.json"
+
+        _request, response = self.get(url=url, **kwargs)
+        response.raise_for_status()
+        response_data = response.json()
+
+        return data.OpenLibraryBook.from_data(response_data)
+
+    def get_books_from_isbns(
+        self, isbns: List[str], **kwargs
+    ) -> Dict[str, data.OpenLibraryBook]:
+        """
+        Get multiple books from the OpenLibrary Books API using their ISBNs,
+        in as few requests as possible. ISBNs OpenLibrary doesn't know are
+        left out of the returned dictionary.
+        """
+        url = f"{self.base_url}/api/books"
+        params: Dict[str, Any] = kwargs.pop("params", {})
+
+        # Remove any duplicates ISBNs while keeping their order.
+        isbns = list(dict.fromkeys(isbns))
+
+        books: Dict[str, data.OpenLibraryBook] = {}
+        for index in range(0, len(isbns), BULK_ISBNS_PER_REQUEST):
+            chunk = isbns[index : index + BULK_ISBNS_PER_REQUEST]
+
+            _request, response = self.get(
+                url=url,
+                params={
+                    **params,
+                    "bibkeys": ",".join(f"ISBN:{isbn}" for isbn in chunk),
+                    "format": "json",
+                    "jscmd": "details",
+                },
+                **kwargs,
+            )
+            response.raise_for_status()
+            response_data = response.json()
+
+            for isbn in chunk:
+                result = response_data.get(f"ISBN:{isbn}")
+                if result is None:
+                    continue
+
+                books[isbn] = data.OpenLibraryBook.from_data(result["details"])
+
+        return books
+
     def get_author(self, key: str, **kwargs) -> data.OpenLibraryAuthor:
         """
         Get an author from the OpenLibrary API using its key.
@@ -47,3 +109,14 @@ class OpenLibraryClient(HttpClient):
         response_data = response.json()
 
         return data.OpenLibraryWork.from_data(response_data)
+
+
+@lru_cache(maxsize=None)
+def get_openlibrary_client(
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> OpenLibraryClient:
+    """
+    Get the process wide OpenLibrary client, so its connections are reused,
+    with a connection pool of `pool_size` connections.
+    """
+    return OpenLibraryClient(pool_size=pool_size)
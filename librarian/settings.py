@@ -15,6 +15,7 @@ class Settings:
 
     DBS_PATH = ROOT_PATH / "dbs"
     DATA_PATH = ROOT_PATH / "data"
+    CACHE_PATH = ROOT_PATH / "cache"
 
     # Books Collection
     BOOK_DB_PATH = DBS_PATH / "books.db"
@@ -23,6 +24,8 @@ class Settings:
     VINYL_DB_PATH = DBS_PATH / "vinyl.db"
 
     # Integrations
+    OPENLIBRARY_DUMP_INDEX_PATH = DATA_PATH / "openlibrary.db"
+    DISCOGS_DUMP_INDEX_PATH = DATA_PATH / "discogs.db"
     DISCOGS_PERSONAL_ACCESS_TOKEN = environ.get(
         "LIBRARIAN_INTEGRATIONS_DISCOGS_PERSONAL_ACCESS_TOKEN",
         None,
@@ -31,3 +34,21 @@ class Settings:
         "LIBRARIAN_INTEGRATIONS_GENIUS_CLIENT_ACCESS_TOKEN",
         None,
     )
+
+    # HTTP Cache
+    HTTP_CACHE_ENABLED = environ.get(
+        "LIBRARIAN_HTTP_CACHE_ENABLED", ""
+    ).lower() in ("1", "true", "yes")
+    HTTP_CACHE_PATH = CACHE_PATH / "http.db"
+    HTTP_CACHE_TTL = int(
+        environ.get("LIBRARIAN_HTTP_CACHE_TTL", 60 * 60 * 24 * 7)
+    )
+    HTTP_CACHE_MAX_ENTRIES = int(
+        environ.get("LIBRARIAN_HTTP_CACHE_MAX_ENTRIES", 100_000)
+    )
+
+    # HTTP Client
+    HTTP_CONNECT_TIMEOUT = float(
+        environ.get("LIBRARIAN_HTTP_CONNECT_TIMEOUT", 10)
+    )
+    HTTP_READ_TIMEOUT = float(environ.get("LIBRARIAN_HTTP_READ_TIMEOUT", 30))
@@ -0,0 +1,233 @@
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from ..settings import Settings
+from .http_client import (
+    CONNECTION_RETRIES,
+    DEFAULT_POOL_SIZE,
+    RETRY_STATUS_CODES,
+    MethodLiterals,
+    get_user_agent,
+)
+from .rate_limiter import TokenBucket
+
+
+def build_async_client(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    timeout: Optional[Tuple[float, float]] = None,
+) -> httpx.AsyncClient:
+    """
+    Build an httpx client that keeps up to `pool_size` connections open, and
+    retries requests whose connections fail.
+
+    Requests beyond the pool's size wait for a free connection for as long as
+    it takes, so many requests can be in flight on one event loop.
+    """
+    if timeout is None:
+        timeout = (Settings.HTTP_CONNECT_TIMEOUT, Settings.HTTP_READ_TIMEOUT)
+
+    connect_timeout, read_timeout = timeout
+
+    transport = httpx.AsyncHTTPTransport(
+        retries=CONNECTION_RETRIES,
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+        ),
+    )
+
+    # Follow redirects like requests does, OpenLibrary redirects an ISBN to
+    # its edition.
+    return httpx.AsyncClient(
+        transport=transport,
+        follow_redirects=True,
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=None,
+        ),
+    )
+
+
+class AsyncHttpClient:
+    """
+    The asyncio counterpart to the HttpClient, built on httpx.
+
+    Responses aren't cached, as the HTTP cache works with requests' responses.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 0,
+        backoff_factor: float = 1.0,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Optional[Tuple[float, float]] = None,
+    ):
+        if client is None:
+            self.client = build_async_client(
+                pool_size=pool_size, timeout=timeout
+            )
+        else:
+            self.client = client
+
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        self.client.headers["User-Agent"] = get_user_agent()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the client's connections.
+        """
+        await self.client.aclose()
+
+    async def request(
+        self,
+        method: MethodLiterals,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Tuple[httpx.Request, httpx.Response]:
+        # The params are merged into the URL's query string, like requests
+        # does, httpx would replace it.
+        request_url = httpx.URL(url)
+        if params:
+            request_url = request_url.copy_merge_params(params)
+
+        request = self.client.build_request(
+            method=method,
+            url=request_url,
+            headers=headers,
+            **kwargs,
+        )
+        response = await self.send(request)
+
+        return request, response
+
+    async def send(self, request: httpx.Request) -> httpx.Response:
+        """
+        Send a request, pacing it with the rate limiter and retrying it with
+        an exponential backoff if the server is throttling us or erroring.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            response = await self.client.send(request)
+            self.update_rate_limit(response)
+
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt >= self.max_retries
+            ):
+                return response
+
+            await response.aclose()
+            await asyncio.sleep(self.get_retry_delay(response, attempt))
+            attempt += 1
+
+    def get_retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """
+        How long to wait before retrying a request, preferring the server's
+        Retry-After header.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+
+        return self.backoff_factor * (2**attempt)
+
+    def update_rate_limit(self, response: httpx.Response):
+        """
+        Update the rate limiter from a response. Integrations whose APIs
+        report their rate limits override this.
+        """
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Tuple[httpx.Request, httpx.Response]:
+        return await self.request(
+            method="GET",
+            url=url,
+            headers=headers,
+            params=params,
+            **kwargs,
+        )
+
+    async def post(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Tuple[httpx.Request, httpx.Response]:
+        return await self.request(
+            method="POST",
+            url=url,
+            headers=headers,
+            params=params,
+            **kwargs,
+        )
+
+    async def patch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Tuple[httpx.Request, httpx.Response]:
+        return await self.request(
+            method="PATCH",
+            url=url,
+            headers=headers,
+            params=params,
+            **kwargs,
+        )
+
+    async def delete(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Tuple[httpx.Request, httpx.Response]:
+        return await self.request(
+            method="DELETE",
+            url=url,
+            headers=headers,
+            params=params,
+            **kwargs,
+        )
+
+    async def put(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Tuple[httpx.Request, httpx.Response]:
+        return await self.request(
+            method="PUT",
+            url=url,
+            headers=headers,
+            params=params,
+            **kwargs,
+        )
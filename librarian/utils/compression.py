@@ -0,0 +1,349 @@
+import json
+import re
+import sqlite3
+import struct
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from sqlite_utils.db import Database
+
+# Compressed values start with a header of this magic number and the ID of
+# the dictionary they were compressed with, or zero if there wasn't one.
+MAGIC = b"LBZ1"
+HEADER = struct.Struct(">4sI")
+
+# zlib only uses the last 32KB of a preset dictionary.
+DICTIONARY_SIZE = 32 * 1024
+
+# The JSON keys and strings a dictionary is trained on.
+RE_JSON_FRAGMENT = re.compile(r'"(?:[^"\\]|\\.){0,64}"(?:: )?')
+
+COMPRESSION_LEVEL = 9
+
+DICTIONARIES_TABLE = "_compression_dictionaries"
+
+# The number of rows to sample to train a dictionary, and to rewrite in each
+# transaction when compressing a table.
+SAMPLE_SIZE = 1_000
+BATCH_SIZE = 500
+
+
+def train_dictionary(
+    samples: Iterable[str], size: int = DICTIONARY_SIZE
+) -> bytes:
+    """
+    Build a zlib preset dictionary from sample JSON documents, out of the
+    keys and strings that are in the most samples.
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        counts.update(set(RE_JSON_FRAGMENT.findall(sample)))
+
+    # Fragments that are only in one sample aren't worth their space.
+    fragments = sorted(
+        (
+            (count * len(fragment), fragment.encode("utf-8"))
+            for fragment, count in counts.items()
+            if count > 1
+        ),
+        reverse=True,
+    )
+
+    chosen = []
+    total = 0
+    for _score, fragment in fragments:
+        if total + len(fragment) > size:
+            continue
+
+        chosen.append(fragment)
+        total += len(fragment)
+
+    # Matches closer to the end of the dictionary are cheaper to encode, so
+    # the most useful fragments go last.
+    return b"".join(reversed(chosen))
+
+
+def is_compressed(value: Any) -> bool:
+    """
+    Is the value compressed, rather than plain JSON text?
+    """
+    return isinstance(value, bytes) and value[:4] == MAGIC
+
+
+def compress(
+    text: str,
+    dictionary: Optional[bytes] = None,
+    dictionary_id: int = 0,
+) -> bytes:
+    """
+    Compress JSON text, with a preset dictionary if one is given.
+    """
+    if dictionary:
+        compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(COMPRESSION_LEVEL)
+
+    return (
+        HEADER.pack(MAGIC, dictionary_id if dictionary else 0)
+        + compressor.compress(text.encode("utf-8"))
+        + compressor.flush()
+    )
+
+
+def decompress(value: bytes, dictionary: Optional[bytes] = None) -> str:
+    """
+    Decompress a compressed value back to JSON text.
+    """
+    if dictionary:
+        decompressor = zlib.decompressobj(zdict=dictionary)
+    else:
+        decompressor = zlib.decompressobj()
+
+    content = decompressor.decompress(value[HEADER.size :])
+    return (content + decompressor.flush()).decode("utf-8")
+
+
+class DataCompressor:
+    """
+    Compresses and decompresses the JSON data columns of a database, with
+    the dictionaries stored in the database.
+
+    Columns are only compressed once a dictionary has been trained for their
+    table, and plain JSON text is read as is, so compression is optional and
+    a table can be migrated a row at a time.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._dictionaries: Dict[int, bytes] = {}
+        self._latest: Dict[str, Optional[Tuple[int, bytes]]] = {}
+
+    def has_dictionaries_table(self) -> bool:
+        """
+        Has a dictionary been trained for any of the database's tables?
+        """
+        row = self.conn.execute(
+            "select 1 from sqlite_master where type = 'table' and name = ?",
+            [DICTIONARIES_TABLE],
+        ).fetchone()
+        return row is not None
+
+    def get_dictionary(self, dictionary_id: int) -> Optional[bytes]:
+        """
+        Get a dictionary by its ID.
+        """
+        if dictionary_id == 0:
+            return None
+
+        if dictionary_id not in self._dictionaries:
+            row = self.conn.execute(
+                f"select dictionary from {DICTIONARIES_TABLE} where id = ?",
+                [dictionary_id],
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Dictionary {dictionary_id} does not exist.")
+
+            self._dictionaries[dictionary_id] = row[0]
+
+        return self._dictionaries[dictionary_id]
+
+    def get_latest_dictionary(self, name: str) -> Optional[Tuple[int, bytes]]:
+        """
+        Get the latest dictionary trained for a table, and its ID, unless the
+        table's dictionaries have been disabled.
+        """
+        if name not in self._latest:
+            row = None
+            if self.has_dictionaries_table():
+                row = self.conn.execute(
+                    f"select id, dictionary from {DICTIONARIES_TABLE} "
+                    "where name = ? and active = 1 order by id desc limit 1",
+                    [name],
+                ).fetchone()
+
+            self._latest[name] = (row[0], row[1]) if row else None
+
+        return self._latest[name]
+
+    def add_dictionary(self, name: str, dictionary: bytes) -> int:
+        """
+        Store a new dictionary for a table, returning its ID.
+        """
+        self.conn.execute(
+            f"create table if not exists {DICTIONARIES_TABLE} "
+            "(id integer primary key, name text not null, "
+            "dictionary blob not null, active integer not null default 1)"
+        )
+        cursor = self.conn.execute(
+            f"insert into {DICTIONARIES_TABLE} (name, dictionary) "
+            "values (?, ?)",
+            [name, dictionary],
+        )
+
+        dictionary_id: int = cursor.lastrowid  # type: ignore
+        self._dictionaries[dictionary_id] = dictionary
+        self._latest[name] = (dictionary_id, dictionary)
+
+        return dictionary_id
+
+    def disable_dictionaries(self, name: str):
+        """
+        Stop compressing a table's data. Its dictionaries are kept, to decode
+        any values that are still compressed with them.
+        """
+        if self.has_dictionaries_table():
+            self.conn.execute(
+                f"update {DICTIONARIES_TABLE} set active = 0 where name = ?",
+                [name],
+            )
+
+        self._latest[name] = None
+
+    def encode(self, name: str, data: Any) -> Union[str, bytes]:
+        """
+        Encode data for a table's data column, compressing it if the table
+        has a dictionary.
+        """
+        text = data if isinstance(data, str) else json.dumps(data)
+
+        latest = self.get_latest_dictionary(name)
+        if latest is None:
+            return text
+
+        dictionary_id, dictionary = latest
+        return compress(text, dictionary, dictionary_id)
+
+    def decode(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """
+        Decode a data column's value to JSON text, whether it's compressed
+        or not.
+        """
+        if not isinstance(value, bytes):
+            return value
+
+        if not is_compressed(value):
+            return value.decode("utf-8")
+
+        _magic, dictionary_id = HEADER.unpack(value[: HEADER.size])
+        return decompress(value, self.get_dictionary(dictionary_id))
+
+    def load(self, value: Union[str, bytes]) -> Any:
+        """
+        Decode and parse a data column's value.
+        """
+        return json.loads(self.decode(value))  # type: ignore
+
+
+def register_functions(conn: sqlite3.Connection):
+    """
+    Register the `decompress_data(value)` SQL function, which returns a data
+    column's value as JSON text whether it's compressed or not.
+    """
+    compressor = DataCompressor(conn)
+    conn.create_function(
+        "decompress_data", 1, compressor.decode, deterministic=True
+    )
+
+
+def compress_table(
+    db: Database,
+    table: str,
+    *,
+    pk: str,
+    column: str = "data",
+    sample_size: int = SAMPLE_SIZE,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    Train a dictionary on a sample of a table's data column and recompress
+    every row with it, returning the number of rows rewritten.
+    """
+    compressor = DataCompressor(db.conn)
+
+    samples = [
+        compressor.decode(row[0])
+        for row in db.execute(
+            f"select [{column}] from [{table}] order by random() limit ?",
+            [sample_size],
+        )
+    ]
+    if not samples:
+        return 0
+
+    with db.conn:
+        compressor.add_dictionary(
+            table, train_dictionary(sample for sample in samples if sample)
+        )
+
+    return rewrite_table(
+        db, table, pk=pk, column=column, batch_size=batch_size, compress=True
+    )
+
+
+def decompress_table(
+    db: Database,
+    table: str,
+    *,
+    pk: str,
+    column: str = "data",
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    Rewrite a table's compressed data column as plain JSON text, returning
+    the number of rows rewritten. The table's dictionaries are disabled
+    first, so the rows written afterwards aren't compressed either.
+    """
+    with db.conn:
+        DataCompressor(db.conn).disable_dictionaries(table)
+
+    return rewrite_table(
+        db, table, pk=pk, column=column, batch_size=batch_size, compress=False
+    )
+
+
+def rewrite_table(
+    db: Database,
+    table: str,
+    *,
+    pk: str,
+    column: str,
+    batch_size: int,
+    compress: bool,
+) -> int:
+    """
+    Rewrite a table's data column a batch of rows at a time, compressed with
+    the table's latest dictionary or as plain JSON text.
+    """
+    compressor = DataCompressor(db.conn)
+
+    count = 0
+    last_pk = None
+    while True:
+        where = f"where [{pk}] > ?" if last_pk is not None else ""
+        rows = db.execute(
+            f"select [{pk}], [{column}] from [{table}] {where} "
+            f"order by [{pk}] limit ?",
+            [last_pk, batch_size] if last_pk is not None else [batch_size],
+        ).fetchall()
+        if not rows:
+            return count
+
+        updates = []
+        for row_pk, value in rows:
+            text = compressor.decode(value)
+            if text is None:
+                continue
+
+            new_value = compressor.encode(table, text) if compress else text
+            if new_value != value:
+                updates.append((new_value, row_pk))
+
+        with db.conn:
+            db.conn.executemany(
+                f"update [{table}] set [{column}] = ? where [{pk}] = ?",
+                updates,
+            )
+
+        count += len(updates)
+        last_pk = rows[-1][0]
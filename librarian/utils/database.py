@@ -1,11 +1,81 @@
+import datetime
+import hashlib
+import json
 from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from sqlite_utils.db import Database, Table, View
+from sqlite_utils.db import Database, Table, View, jsonify_if_needed
 
+# The number of values to bind in one `IN (...)` lookup, which keeps us clear
+# of SQLite's limit on the number of host parameters in a statement.
+LOOKUP_CHUNK_SIZE = 500
 
-def get_database(path: Path) -> Database:
-    """Get the database object from the path."""
-    return Database(path)
+# Columns that change on every write, so aren't part of a row's content.
+UNHASHED_COLUMNS = ("created_at", "updated_at")
+
+# The column rows' content hashes are stored in.
+CONTENT_HASH_COLUMN = "content_hash"
+
+# The column API responses' last fetch is stored in, which is bumped even if
+# they haven't changed, unlike their `updated_at`.
+FETCHED_AT_COLUMN = "fetched_at"
+
+
+# The pragmas the connections are tuned with, for importing into, or serving
+# from, the databases. WAL lets the databases be read while they're written
+# to, and a negative cache_size is in KiB rather than pages.
+PRAGMA_PRESETS: Dict[str, Dict[str, Union[str, int]]] = {
+    "import": {
+        "journal_mode": "wal",
+        # Only syncs at WAL checkpoints, an import can be rerun if the last
+        # few transactions are lost to a power failure.
+        "synchronous": "normal",
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+        "busy_timeout": 5_000,
+    },
+    "serve": {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "cache_size": -16_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+        "busy_timeout": 5_000,
+    },
+}
+
+
+def apply_pragmas(db: Database, pragmas: Dict[str, Union[str, int]]):
+    """
+    Set the pragmas on the database's connection.
+    """
+    for name, value in pragmas.items():
+        db.execute(f"pragma {name} = {value}").fetchall()
+
+
+def get_database(path: Path, preset: str = "serve") -> Database:
+    """
+    Get the database object from the path, with its connection tuned for
+    importing into, or serving from, the database.
+    """
+    if preset not in PRAGMA_PRESETS:
+        raise ValueError(f"{preset} is not a database preset.")
+
+    db = Database(path)
+    apply_pragmas(db, PRAGMA_PRESETS[preset])
+
+    return db
 
 
 def get_table(table_name: str, *, db: Database) -> Table:
@@ -22,3 +92,301 @@ def get_view(view_name: str, *, db: Database) -> View:
         raise ValueError(f"View {view_name} does not exist in database")
 
     return db.table(view_name)  # type: ignore
+
+
+def add_missing_columns(table: Table, columns: Dict[str, Any]):
+    """
+    Add the columns a table, created by an older version, is missing.
+    """
+    existing_columns = table.columns_dict
+    for column, column_type in columns.items():
+        if column not in existing_columns:
+            table.add_column(column, column_type)
+
+
+def add_fetched_at_column(table: Table):
+    """
+    Add the fetched_at column to a table created by an older version, with
+    its rows last fetched when they were last updated.
+    """
+    if FETCHED_AT_COLUMN in table.columns_dict:
+        return
+
+    table.add_column(FETCHED_AT_COLUMN, datetime.datetime)
+    with table.db.conn:
+        table.db.execute(
+            f"update [{table.name}] set [{FETCHED_AT_COLUMN}] = updated_at"
+        )
+
+
+def mark_fetched(
+    values: Iterable[Any],
+    *,
+    table: Table,
+    pk: str = "id",
+    fetched_at: Optional[datetime.datetime] = None,
+):
+    """
+    Set when the rows with the given primary keys were last fetched, using
+    set based `UPDATE ... WHERE pk IN (...)` statements. Like
+    `upsert_records`, this doesn't commit.
+    """
+    if fetched_at is None:
+        fetched_at = datetime.datetime.utcnow()
+
+    unique_values = list(dict.fromkeys(values))
+
+    for index in range(0, len(unique_values), LOOKUP_CHUNK_SIZE):
+        chunk = unique_values[index : index + LOOKUP_CHUNK_SIZE]
+        table.db.conn.execute(
+            "update [{}] set [{}] = ? where [{}] in ({})".format(
+                table.name,
+                FETCHED_AT_COLUMN,
+                pk,
+                ",".join("?" * len(chunk)),
+            ),
+            [fetched_at.isoformat(), *chunk],
+        )
+
+
+def create_unique_index(
+    table: Table,
+    column: str,
+    *,
+    references: Iterable[Tuple[str, str]] = (),
+    dependents: Iterable[Tuple[str, str]] = (),
+):
+    """
+    Create a unique index on a table's column, first removing the rows that
+    share a value with a newer row, as databases created by older versions
+    can have duplicates.
+
+    The rows in the `references` tables (and columns) that point at a removed
+    row are pointed at the kept row instead, and the rows in the `dependents`
+    tables are removed with it.
+    """
+    if any(
+        index.unique and index.columns == [column] for index in table.indexes
+    ):
+        return
+
+    db = table.db
+    duplicates = db.execute(
+        f"""
+        select id, kept_id from (
+            select
+                id,
+                first_value(id) over (
+                    partition by [{column}]
+                    order by updated_at desc, id desc
+                ) as kept_id
+            from [{table.name}]
+            where [{column}] is not null
+        )
+        where id != kept_id
+        """
+    ).fetchall()
+
+    with db.conn:
+        for reference_table, reference_column in references:
+            # Rows that would duplicate one of the kept row's are dropped.
+            db.conn.executemany(
+                f"update or ignore [{reference_table}] "
+                f"set [{reference_column}] = ? where [{reference_column}] = ?",
+                [(kept_id, row_id) for row_id, kept_id in duplicates],
+            )
+            db.conn.executemany(
+                f"delete from [{reference_table}] "
+                f"where [{reference_column}] = ?",
+                [(row_id,) for row_id, _kept_id in duplicates],
+            )
+
+        for dependent_table, dependent_column in dependents:
+            db.conn.executemany(
+                f"delete from [{dependent_table}] "
+                f"where [{dependent_column}] = ?",
+                [(row_id,) for row_id, _kept_id in duplicates],
+            )
+
+        db.conn.executemany(
+            f"delete from [{table.name}] where id = ?",
+            [(row_id,) for row_id, _kept_id in duplicates],
+        )
+
+    table.create_index([column], unique=True, if_not_exists=True)
+
+
+def get_content_hash(
+    record: Dict[str, Any], exclude: Iterable[str] = UNHASHED_COLUMNS
+) -> str:
+    """
+    Hash a record's content, ignoring the excluded columns, so a row can be
+    compared to a new copy of itself without reading all of its columns.
+    """
+    excluded_columns = set(exclude)
+    content = {
+        column: value
+        for column, value in record.items()
+        if column not in excluded_columns
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def add_content_hash(
+    record: Dict[str, Any],
+    *,
+    pk: Union[str, Sequence[str]] = "id",
+    hash_column: str = CONTENT_HASH_COLUMN,
+) -> Dict[str, Any]:
+    """
+    Add a record's content hash, as `upsert_records` does, for records that
+    have to be hashed before they're written, e.g. before their data is
+    compressed, so the hash doesn't depend on how the data is stored.
+    """
+    pks = [pk] if isinstance(pk, str) else list(pk)
+
+    return {
+        **record,
+        hash_column: get_content_hash(
+            record, exclude=[*pks, hash_column, *UNHASHED_COLUMNS]
+        ),
+    }
+
+
+def get_rows_by_column(
+    column: str,
+    values: Iterable[Any],
+    *,
+    table: Table,
+    select: str = "*",
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Get the rows whose column matches any of the values, using set based
+    `IN (...)` lookups.
+    """
+    unique_values = list(dict.fromkeys(values))
+
+    for index in range(0, len(unique_values), LOOKUP_CHUNK_SIZE):
+        chunk = unique_values[index : index + LOOKUP_CHUNK_SIZE]
+        yield from table.rows_where(
+            where="[{}] in ({})".format(column, ",".join("?" * len(chunk))),
+            where_args=chunk,
+            select=select,
+        )
+
+
+def get_ids_by_column(
+    column: str,
+    values: Iterable[Any],
+    *,
+    table: Table,
+    pk: str = "id",
+) -> Dict[Any, Any]:
+    """
+    Get a mapping of a column's values to their row's primary key.
+    """
+    rows = get_rows_by_column(
+        column, values, table=table, select=f"[{pk}], [{column}]"
+    )
+    return {row[column]: row[pk] for row in rows}
+
+
+def upsert_records(
+    records: Iterable[Dict[str, Any]],
+    *,
+    table: Table,
+    pk: Union[str, Sequence[str]] = "id",
+    not_updated: Sequence[str] = ("created_at",),
+    hash_column: Optional[str] = None,
+):
+    """
+    Upsert records with `INSERT ... ON CONFLICT DO UPDATE` statements.
+
+    Unlike sqlite-utils' `upsert_all`, this doesn't commit, so it can be used
+    to write many tables inside a single transaction. Columns in
+    `not_updated` are only written when a row is inserted.
+
+    Existing rows are only updated if their content has changed, so their
+    `updated_at` doesn't move and no pages are written for unchanged rows.
+    If a `hash_column` is given, the records' content hash is stored in it
+    and compared first, so unchanged rows are skipped without comparing
+    their other columns. Records that already have a hash keep it.
+    """
+    pks = [pk] if isinstance(pk, str) else list(pk)
+
+    if hash_column is not None:
+        records = (
+            record
+            if hash_column in record
+            else add_content_hash(record, pk=pks, hash_column=hash_column)
+            for record in records
+        )
+
+    # Group the records by their columns, so each group can be written with
+    # a single `executemany`.
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(tuple(record.keys()), []).append(record)
+
+    for columns, group in groups.items():
+        updated_columns = [
+            column
+            for column in columns
+            if column not in pks and column not in not_updated
+        ]
+
+        # Rows whose hash differs from the record's are still only updated
+        # if a column has changed, as records of the same row may not all
+        # have the same columns.
+        compared_columns = [
+            column
+            for column in updated_columns
+            if column not in UNHASHED_COLUMNS and column != hash_column
+        ]
+        conditions = []
+        if hash_column is not None and hash_column in updated_columns:
+            conditions.append(
+                f"[{table.name}].[{hash_column}] is not "
+                f"excluded.[{hash_column}]"
+            )
+        if compared_columns:
+            conditions.append(
+                "({})".format(
+                    " or ".join(
+                        f"[{table.name}].[{column}] is not excluded.[{column}]"
+                        for column in compared_columns
+                    )
+                )
+            )
+
+        if updated_columns:
+            on_conflict = "do update set {}".format(
+                ", ".join(
+                    f"[{column}] = excluded.[{column}]"
+                    for column in updated_columns
+                )
+            )
+            if conditions:
+                on_conflict += " where " + " and ".join(conditions)
+        else:
+            on_conflict = "do nothing"
+
+        sql = "insert into [{table}] ({columns}) values ({values}) "
+        sql += "on conflict ({pks}) {on_conflict}"
+        sql = sql.format(
+            table=table.name,
+            columns=", ".join(f"[{column}]" for column in columns),
+            values=", ".join("?" * len(columns)),
+            pks=", ".join(f"[{column}]" for column in pks),
+            on_conflict=on_conflict,
+        )
+
+        table.db.conn.executemany(
+            sql,
+            [
+                [jsonify_if_needed(record[column]) for column in columns]
+                for record in group
+            ],
+        )
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import textwrap
+import typing as t
+
+Rows = t.Iterable[t.Dict[str, t.Any]]
+
+
+def format_rows_as_csv(rows: Rows) -> t.Generator[str, None, None]:
+    """
+    Format rows as CSV, one line at a time.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for index, row in enumerate(rows):
+        if index == 0:
+            writer.writerow(row.keys())
+
+        writer.writerow(row.values())
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def format_rows_as_json(rows: Rows) -> t.Generator[str, None, None]:
+    """
+    Format rows as a JSON array, one element at a time.
+    """
+    separator = "[\n"
+    for row in rows:
+        yield separator + "  " + json.dumps(row, default=str)
+        separator = ",\n"
+
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+def format_rows_as_json_lines(rows: Rows) -> t.Generator[str, None, None]:
+    """
+    Format rows as JSON Lines, one line at a time.
+    """
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+
+def format_markdown_cell(value: t.Any) -> str:
+    """
+    Format a value so it's safe to put in a Markdown table's cell.
+    """
+    if value is None:
+        return ""
+
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def format_rows_as_markdown(rows: Rows) -> t.Generator[str, None, None]:
+    """
+    Format rows as a GitHub flavoured Markdown table, one line at a time.
+
+    The columns aren't padded to the same width, as that would need every
+    row up front.
+    """
+    for index, row in enumerate(rows):
+        if index == 0:
+            yield "| " + " | ".join(row.keys()) + " |\n"
+            yield "|" + "|".join("---" for _ in row.keys()) + "|\n"
+
+        cells = [format_markdown_cell(value) for value in row.values()]
+        yield "| " + " | ".join(cells) + " |\n"
+
+
+def format_rows_as_table(
+    rows: Rows,
+    headers: t.Dict[str, str],
+    widths: t.Dict[str, int],
+) -> t.Generator[str, None, None]:
+    """
+    Format rows as a grid table, like tabulate's "grid" format, one row at a
+    time.
+
+    Every column has a fixed width, so the table can be printed before all
+    the rows have been read. Values longer than their column are wrapped.
+    """
+    columns = list(headers.keys())
+
+    def format_line(character: str) -> str:
+        return (
+            "+"
+            + "+".join(character * (widths[column] + 2) for column in columns)
+            + "+\n"
+        )
+
+    def format_row(row: t.Dict[str, t.Any]) -> str:
+        cells = [
+            textwrap.wrap(
+                "" if row.get(column) is None else str(row[column]),
+                width=widths[column],
+            )
+            or [""]
+            for column in columns
+        ]
+        height = max(len(cell) for cell in cells)
+
+        lines = []
+        for line_index in range(height):
+            parts = []
+            for column, cell in zip(columns, cells):
+                value = cell[line_index] if line_index < len(cell) else ""
+                parts.append(f" {value:<{widths[column]}} ")
+            lines.append("|" + "|".join(parts) + "|\n")
+
+        return "".join(lines)
+
+    yield format_line("-")
+    yield format_row(headers)
+    yield format_line("=")
+
+    for row in rows:
+        yield format_row(row)
+        yield format_line("-")
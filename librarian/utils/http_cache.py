@@ -0,0 +1,209 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from requests import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from sqlite_utils.db import Database, Table
+
+from ..settings import Settings
+
+# Only these methods have responses that are safe to replay from the cache.
+CACHEABLE_METHODS = ("GET",)
+
+
+class HttpCache:
+    """
+    A persistent, SQLite backed, cache of HTTP responses.
+
+    Responses are keyed by their method and URL (including the query string)
+    and are considered fresh for `ttl` seconds. Stale responses are
+    revalidated with their `ETag` and `Last-Modified` headers, and once there
+    are more than `max_entries` responses the least recently used ones are
+    evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: int = 60 * 60 * 24,
+        max_entries: int = 10_000,
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # The cache is shared by all the HTTP clients in the process, which
+        # may be used from more than one thread.
+        self._lock = threading.Lock()
+        self.db = Database(sqlite3.connect(str(path), check_same_thread=False))
+
+        self.table: Table = self.db.table("responses")  # type: ignore
+        if self.table.exists() is False:
+            self.table.create(
+                columns={
+                    "key": str,
+                    "method": str,
+                    "url": str,
+                    "status_code": int,
+                    "reason": str,
+                    "headers": str,
+                    "content": bytes,
+                    "etag": str,
+                    "last_modified": str,
+                    "expires_at": float,
+                    "accessed_at": float,
+                },
+                pk="key",
+            )
+            self.table.create_index(["accessed_at"])
+
+    @staticmethod
+    def key_for(request: PreparedRequest) -> str:
+        """
+        Build the cache key for a prepared request.
+        """
+        return hashlib.sha256(
+            f"{request.method} {request.url}".encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def is_cacheable(request: PreparedRequest) -> bool:
+        """
+        Can the response to the prepared request be cached?
+        """
+        return request.method in CACHEABLE_METHODS
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached entry, marking it as recently used.
+        """
+        with self._lock:
+            rows = list(self.table.rows_where("key = ?", [key]))
+            if not rows:
+                return None
+
+            self.db.execute(
+                "update responses set accessed_at = ? where key = ?",
+                [time.time(), key],
+            )
+            self.db.conn.commit()
+
+        return rows[0]
+
+    def set(self, key: str, response: Response):
+        """
+        Store a response in the cache, evicting the least recently used
+        entries if the cache is full.
+        """
+        now = time.time()
+        record = {
+            "key": key,
+            "method": response.request.method,
+            "url": response.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": json.dumps(dict(response.headers)),
+            "content": response.content,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "expires_at": now + self.ttl,
+            "accessed_at": now,
+        }
+
+        with self._lock:
+            self.table.upsert(record, pk="key")
+            self.evict()
+
+    def touch(self, key: str):
+        """
+        Mark a cached entry as fresh again after a successful revalidation.
+        """
+        now = time.time()
+        with self._lock:
+            self.db.execute(
+                "update responses set expires_at = ?, accessed_at = ? "
+                "where key = ?",
+                [now + self.ttl, now, key],
+            )
+            self.db.conn.commit()
+
+    def evict(self):
+        """
+        Remove the least recently used entries over the cache's size limit.
+        """
+        self.db.execute(
+            """
+            delete from responses where key in (
+                select key from responses
+                order by accessed_at desc
+                limit -1 offset ?
+            )
+            """,
+            [self.max_entries],
+        )
+        self.db.conn.commit()
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self.table.delete_where()
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        """
+        Is the cached entry still within its TTL?
+        """
+        return entry["expires_at"] > time.time()
+
+    @staticmethod
+    def add_validators(request: PreparedRequest, entry: Dict[str, Any]):
+        """
+        Add the conditional headers to revalidate a stale cached entry.
+        """
+        if entry["etag"]:
+            request.headers["If-None-Match"] = entry["etag"]
+
+        if entry["last_modified"]:
+            request.headers["If-Modified-Since"] = entry["last_modified"]
+
+    @staticmethod
+    def build_response(
+        entry: Dict[str, Any], request: PreparedRequest
+    ) -> Response:
+        """
+        Rebuild a requests' Response from a cached entry.
+        """
+        response = Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(json.loads(entry["headers"]))
+        response.url = entry["url"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = request
+        response._content = entry["content"]
+        return response
+
+
+@lru_cache(maxsize=None)
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    Get the process wide HTTP cache, if it has been enabled in the settings.
+    """
+    if Settings.HTTP_CACHE_ENABLED is False:
+        return None
+
+    return HttpCache(
+        path=Settings.HTTP_CACHE_PATH,
+        ttl=Settings.HTTP_CACHE_TTL,
+        max_entries=Settings.HTTP_CACHE_MAX_ENTRIES,
+    )
@@ -1,23 +1,99 @@
+import time
 from importlib.metadata import version
 from typing import Dict, Literal, Optional, Tuple
 
 from requests import PreparedRequest, Request, Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..settings import Settings
+from .http_cache import HttpCache, get_http_cache
+from .rate_limiter import TokenBucket
 
 MethodLiterals = Literal["GET", "POST", "PATCH", "DELETE", "PUT"]
 
+# Responses with these status codes are worth retrying after a backoff.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# The number of connections kept open to each host, which should match the
+# number of requests made at the same time.
+DEFAULT_POOL_SIZE = 10
+
+# The number of times a request is retried when the connection fails, or a
+# read times out, before a response is received.
+CONNECTION_RETRIES = 3
+
+
+def get_user_agent() -> str:
+    """
+    The User-Agent header sent with every request.
+    """
+    return (
+        f"librarian/{version('librarian')}"
+        f" (+https://library.mylesbraithwaite.com/)"
+    )
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE) -> Session:
+    """
+    Build a session that keeps up to `pool_size` connections open to each
+    host, and retries requests whose connections fail.
+
+    Retrying on the response's status is left to the HttpClient, so it can
+    respect the rate limits.
+    """
+    retry = Retry(
+        total=CONNECTION_RETRIES,
+        connect=CONNECTION_RETRIES,
+        read=CONNECTION_RETRIES,
+        status=0,
+        backoff_factor=0.5,
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+
+    session = Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class HttpClient:
-    def __init__(self, session: Optional[Session] = None):
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        cache: Optional[HttpCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 0,
+        backoff_factor: float = 1.0,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Optional[Tuple[float, float]] = None,
+    ):
         if session is None:
-            self.session = Session()
+            self.session = build_session(pool_size=pool_size)
         else:
             self.session = session
 
-        user_agent = (
-            f"librarian/{version('librarian')}"
-            f" (+https://library.mylesbraithwaite.com/)"
-        )
-        self.session.headers.update({"User-Agent": user_agent})
+        if timeout is None:
+            timeout = (
+                Settings.HTTP_CONNECT_TIMEOUT,
+                Settings.HTTP_READ_TIMEOUT,
+            )
+
+        # The connect and read timeouts, so a hung connection can't stall us.
+        self.timeout = timeout
+
+        if cache is None:
+            cache = get_http_cache()
+
+        self.cache = cache
+
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        self.session.headers.update({"User-Agent": get_user_agent()})
 
     def request(
         self,
@@ -36,9 +112,89 @@ class HttpClient:
             **kwargs,
         )
         prepare_request = self.session.prepare_request(request)
-        response = self.session.send(prepare_request, stream=stream)
+
+        if (
+            self.cache is not None
+            and stream is False
+            and self.cache.is_cacheable(prepare_request)
+        ):
+            response = self.send_with_cache(prepare_request, cache=self.cache)
+        else:
+            response = self.send(prepare_request, stream=stream)
+
         return prepare_request, response
 
+    def send(
+        self, prepare_request: PreparedRequest, stream: bool = False
+    ) -> Response:
+        """
+        Send a request, pacing it with the rate limiter and retrying it with
+        an exponential backoff if the server is throttling us or erroring.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            response = self.session.send(
+                prepare_request, stream=stream, timeout=self.timeout
+            )
+            self.update_rate_limit(response)
+
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt >= self.max_retries
+            ):
+                return response
+
+            response.close()
+            time.sleep(self.get_retry_delay(response, attempt))
+            attempt += 1
+
+    def get_retry_delay(self, response: Response, attempt: int) -> float:
+        """
+        How long to wait before retrying a request, preferring the server's
+        Retry-After header.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+
+        return self.backoff_factor * (2**attempt)
+
+    def update_rate_limit(self, response: Response):
+        """
+        Update the rate limiter from a response. Integrations whose APIs
+        report their rate limits override this.
+        """
+
+    def send_with_cache(
+        self, prepare_request: PreparedRequest, *, cache: HttpCache
+    ) -> Response:
+        """
+        Send a request through the response cache, revalidating stale
+        responses with the server.
+        """
+        key = cache.key_for(prepare_request)
+        entry = cache.get(key)
+
+        if entry is not None and cache.is_fresh(entry):
+            return cache.build_response(entry, prepare_request)
+
+        if entry is not None:
+            cache.add_validators(prepare_request, entry)
+
+        response = self.send(prepare_request)
+
+        if entry is not None and response.status_code == 304:
+            cache.touch(key)
+            return cache.build_response(entry, prepare_request)
+
+        if response.status_code == 200:
+            cache.set(key, response)
+
+        return response
+
     def get(
         self,
         url: str,
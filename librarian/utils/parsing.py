@@ -0,0 +1,46 @@
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Sequence
+
+
+class Field(NamedTuple):
+    """
+    A field to pick from an API response.
+    """
+
+    # The key of the value in the API response.
+    key: str
+
+    # The name of the dataclass field, if it's different from the key.
+    name: Optional[str] = None
+
+    # A function to transform the value with.
+    transform: Optional[Callable[[Any], Any]] = None
+
+    # Raise a KeyError if the API response doesn't have the key.
+    required: bool = False
+
+
+def pick_fields(
+    data: Mapping[str, Any], fields: Sequence[Field]
+) -> Dict[str, Any]:
+    """
+    Pick the fields from an API response, ready to pass to a dataclass.
+
+    Only the picked values are read, the rest of the response is never
+    copied. The values aren't copied either, so they are shared with the
+    response.
+    """
+    values: Dict[str, Any] = {}
+
+    for field in fields:
+        if field.key not in data:
+            if field.required is True:
+                raise KeyError(field.key)
+            continue
+
+        value = data[field.key]
+        if field.transform is not None:
+            value = field.transform(value)
+
+        values[field.name or field.key] = value
+
+    return values
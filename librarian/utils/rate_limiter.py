@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket rate limiter.
+
+    The bucket holds up to `capacity` tokens and is refilled at `rate` tokens
+    every `per` seconds. Each request takes a token, waiting for the bucket to
+    refill if it's empty.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 60.0,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or per <= 0:
+            raise ValueError("The rate and period must be greater than zero.")
+
+        self.rate = rate
+        self.per = per
+        self.capacity = capacity if capacity is not None else rate
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        self.tokens = self.capacity
+        self.updated_at = self._clock()
+
+    @property
+    def fill_rate(self) -> float:
+        """
+        The number of tokens added to the bucket every second.
+        """
+        return self.rate / self.per
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.fill_rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """
+        Take a token from the bucket if one is available, returning zero, or
+        else how many seconds to wait before trying again.
+        """
+        with self._lock:
+            self._refill()
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+
+            return (1 - self.tokens) / self.fill_rate
+
+    def acquire(self):
+        """
+        Take a token from the bucket, blocking until one is available.
+        """
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return
+
+            self._sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Take a token from the bucket, waiting on the event loop until one is
+        available.
+        """
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return
+
+            await asyncio.sleep(wait)
+
+    def update(
+        self,
+        limit: Optional[int] = None,
+        remaining: Optional[int] = None,
+    ):
+        """
+        Update the bucket from the rate limit the server reported, the server
+        knows better than us how many requests we have left.
+        """
+        with self._lock:
+            self._refill()
+
+            if limit is not None and limit > 0:
+                self.rate = limit
+                self.capacity = limit
+
+            if remaining is not None:
+                self.tokens = min(self.tokens, max(remaining, 0))
@@ -0,0 +1,76 @@
+import timeit
+
+from librarian.collections.books import service
+
+
+def build_collection(db, size: int):
+    """
+    Build a synthetic books collection with one author per book.
+    """
+    service.build_database(db=db)
+
+    with db.conn:
+        db["authors"].insert_all(
+            {"id": i, "name": f"Author {i}", "openlibrary_key": f"OL{i}A"}
+            for i in range(size)
+        )
+        db["books"].insert_all(
+            {
+                "id": i,
+                "title": f"Title {size - i}",
+                "openlibrary_key": f"OL{i}M",
+            }
+            for i in range(size)
+        )
+        db["books_authors"].insert_all(
+            {"book_id": i, "author_id": i} for i in range(size)
+        )
+
+
+def test_books_listing__query_plan(mock_db):
+    build_collection(mock_db, 1_000)
+    assert mock_db["books_listing"].count == 1_000
+
+    plan = " ".join(
+        row[3]
+        for row in mock_db.execute(
+            "explain query plan select isbn, title, authors "
+            "from books_listing order by title"
+        )
+    )
+
+    # The listing is read in title order straight from the index, without
+    # aggregating or sorting anything.
+    assert "idx_books_listing_title" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_books_listing__scales(mock_db, record_property):
+    build_collection(mock_db, 5_000)
+
+    def first_page():
+        books = service.list_books(db=mock_db)
+        return [next(books) for _ in range(25)]
+
+    record_property(
+        "first_page_ms",
+        min(timeit.repeat(first_page, number=20, repeat=3)) / 20 * 1e3,
+    )
+
+    # The first page comes straight off the materialized listing, with the
+    # authors already aggregated.
+    assert first_page()[:2] == [
+        {"isbn": None, "title": "Title 1", "authors": "Author 4999"},
+        {"isbn": None, "title": "Title 10", "authors": "Author 4990"},
+    ]
+
+    # Reading it only walks the listing's title index, so it doesn't depend
+    # on the size of the books and authors tables.
+    plan = [
+        row[3]
+        for row in mock_db.execute(
+            "explain query plan select isbn, title, authors "
+            "from books_listing order by title"
+        )
+    ]
+    assert plan == ["SCAN books_listing USING INDEX idx_books_listing_title"]
@@ -0,0 +1,110 @@
+import random
+import timeit
+
+from librarian.collections.vinyl import service
+from librarian.integrations.discogs import DiscogsRelease
+from librarian.utils import compression
+
+# The vocabulary the synthetic titles and names are made from.
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def build_release(release_id: int, words: random.Random) -> DiscogsRelease:
+    """
+    Build a synthetic Discogs release, with a full tracklist, credits, and
+    images like the API's.
+    """
+
+    def title() -> str:
+        return " ".join(words.choices(WORDS, k=3)).title()
+
+    def credit(role: str = "") -> dict:
+        return {
+            "id": words.randrange(100_000),
+            "name": title(),
+            "anv": "",
+            "join": "",
+            "role": role,
+            "tracks": "",
+            "resource_url": "https://api.discogs.com/artists/1",
+        }
+
+    return DiscogsRelease.from_data(
+        {
+            "id": release_id,
+            "title": title(),
+            "year": 1970 + release_id % 50,
+            "country": "UK",
+            "artists": [credit()],
+            "extraartists": [
+                credit(role) for role in ("Producer", "Mixed By", "Design")
+            ],
+            "genres": ["Rock", "Pop"],
+            "styles": ["Indie Rock"],
+            "identifiers": [
+                {"type": "Barcode", "value": str(release_id).zfill(12)}
+            ],
+            "tracklist": [
+                {
+                    "position": f"{side}{position}",
+                    "type_": "track",
+                    "title": title(),
+                    "duration": f"{words.randrange(2, 7)}:{position}0",
+                    "extraartists": [credit("Written-By")],
+                }
+                for side in "AB"
+                for position in range(1, 6)
+            ],
+            "images": [
+                {
+                    "type": "primary",
+                    "uri": f"https://i.discogs.com/{release_id}.jpg",
+                    "resource_url": f"https://i.discogs.com/{release_id}.jpg",
+                    "uri150": f"https://i.discogs.com/{release_id}-150.jpg",
+                    "width": 600,
+                    "height": 600,
+                }
+            ],
+        }
+    )
+
+
+def get_data_size(db) -> int:
+    """
+    The bytes taken by the discogs_releases' data column.
+    """
+    return db.execute(
+        "select sum(length(data)) from discogs_releases"
+    ).fetchone()[0]
+
+
+def test_compress_discogs_releases__1k_releases(mock_db):
+    service.build_database(db=mock_db)
+
+    words = random.Random(0)
+    releases = [build_release(i, words) for i in range(1, 1_001)]
+    service.upsert_releases_and_related_data(releases, db=mock_db)
+
+    plain_size = get_data_size(mock_db)
+
+    compressor = compression.DataCompressor(mock_db.conn)
+
+    def read_all():
+        return [
+            compressor.load(row[0])
+            for row in mock_db.execute("select data from discogs_releases")
+        ]
+
+    plain_timing = min(timeit.repeat(read_all, number=1, repeat=3))
+
+    assert compression.compress_table(mock_db, "discogs_releases", pk="id")
+    compressed_size = get_data_size(mock_db)
+
+    # The releases share most of their keys and values, so the dictionary
+    # more than halves their size.
+    assert compressed_size < plain_size / 2
+
+    assert [release["id"] for release in read_all()] == list(range(1, 1_001))
+
+    compressed_timing = min(timeit.repeat(read_all, number=1, repeat=3))
+    assert compressed_timing < plain_timing * 3 + 0.05
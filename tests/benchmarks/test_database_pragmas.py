@@ -0,0 +1,73 @@
+import timeit
+from typing import cast
+
+import pytest
+from sqlite_utils import Database
+
+from librarian.collections.vinyl import service
+from librarian.utils import database
+
+from .test_vinyl_search import build_collection
+
+# How SQLite reports the presets' synchronous settings.
+SYNCHRONOUS = {"normal": 1, "full": 2}
+
+
+def add_records(db: Database, records: int):
+    """
+    Add vinyl records one transaction at a time, like adding them one by one
+    from the command line.
+    """
+    table = database.get_table("vinyl_records", db=db)
+
+    for i in range(records):
+        with db.conn:
+            table.insert({"id": i, "isbn": str(i), "title": f"Record {i}"})
+
+
+def time_writes(db: Database) -> float:
+    service.build_database(db)
+    return timeit.timeit(lambda: add_records(db, 200), number=1)
+
+
+def time_reads(db: Database) -> float:
+    build_collection(db, records=2_000, tracks_per_record=10)
+
+    def search():
+        return list(service.search_vinyl_records("word1", db, limit=25))
+
+    return min(timeit.repeat(search, number=20, repeat=3)) / 20
+
+
+def assert_preset_applied(db: Database, preset: str):
+    pragmas = database.PRAGMA_PRESETS[preset]
+    synchronous = cast(str, pragmas["synchronous"])
+
+    def pragma(name: str):
+        return db.execute(f"pragma {name}").fetchone()[0]
+
+    assert pragma("journal_mode") == pragmas["journal_mode"]
+    assert pragma("synchronous") == SYNCHRONOUS[synchronous]
+    assert pragma("cache_size") == pragmas["cache_size"]
+    assert pragma("mmap_size") == pragmas["mmap_size"]
+    assert pragma("temp_store") == 2
+    assert pragma("busy_timeout") == pragmas["busy_timeout"]
+
+
+@pytest.mark.parametrize(
+    "preset, benchmark",
+    [("import", time_writes), ("serve", time_reads)],
+)
+def test_preset(preset, benchmark, tmp_path, record_property):
+    default_db = Database(tmp_path / "default.db")
+    tuned_db = database.get_database(tmp_path / "tuned.db", preset=preset)
+
+    assert_preset_applied(tuned_db, preset)
+
+    # The timings depend on the host's disk, so they're only recorded, e.g.
+    # in the JUnit XML report, rather than compared.
+    record_property(f"{preset}_default_seconds", benchmark(default_db))
+    record_property(f"{preset}_tuned_seconds", benchmark(tuned_db))
+
+    # The pragmas are still set once the database has been used.
+    assert_preset_applied(tuned_db, preset)
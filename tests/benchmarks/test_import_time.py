@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from typing import Set
+
+import pytest
+
+# Modules that are slow to import and that the CLI's entry point, and the
+# output formatters, shouldn't need.
+HEAVY_MODULES = (
+    "pandas",
+    "numpy",
+    "requests",
+    "sqlite_utils",
+    "librarian.collections.books.cli",
+    "librarian.collections.books.service",
+    "librarian.collections.vinyl.cli",
+    "librarian.collections.vinyl.service",
+)
+
+
+def imported_modules(module: str) -> Set[str]:
+    """
+    The modules in `sys.modules` after importing `module` in a fresh
+    interpreter.
+    """
+    result = subprocess.run(  # nosec
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys, {module}; print(json.dumps(list(sys.modules)))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize(
+    "module", ("librarian.cli", "librarian.utils.formatters")
+)
+def test_import__no_heavy_modules(module):
+    modules = imported_modules(module)
+    assert module in modules
+
+    assert modules.isdisjoint(HEAVY_MODULES)
@@ -0,0 +1,82 @@
+import timeit
+from copy import deepcopy
+from dataclasses import replace
+
+import pytest
+
+from librarian.integrations.discogs import data as discogs_data
+from librarian.integrations.genius import data as genius_data
+from librarian.integrations.openlibrary import data as openlibrary_data
+
+from ..integrations.discogs import discogs_responses
+from ..integrations.genius import genius_responses
+from ..integrations.openlibrary import openlibrary_responses
+
+
+def best_time(func, number: int = 200, repeat: int = 5) -> float:
+    """
+    The best time, in seconds, of calling the function.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+PAYLOADS = (
+    (
+        openlibrary_data.OpenLibraryBook.from_data,
+        openlibrary_responses.BOOK_RESPONSE,
+    ),
+    (
+        openlibrary_data.OpenLibraryWork.from_data,
+        openlibrary_responses.WORK_RESPONSE,
+    ),
+    (
+        openlibrary_data.OpenLibraryAuthor.from_data,
+        openlibrary_responses.AUTHOR_RESPONSE,
+    ),
+    (
+        discogs_data.DiscogsRelease.from_data,
+        discogs_responses.DISCOGS_RELEASE,
+    ),
+    (
+        discogs_data.DiscogsArtist.from_data,
+        discogs_responses.DISCOGS_ARTIST,
+    ),
+    (
+        genius_data.GeniusSong.from_data,
+        genius_responses.GENIUS_SONG,
+    ),
+)
+
+
+@pytest.mark.parametrize("from_data, payload", PAYLOADS)
+def test_from_data__leaves_payload_alone(from_data, payload, record_property):
+    # The parsers read the keys they need instead of deep-copying the
+    # payload, so they must not modify the payload they're given.
+    original_payload = deepcopy(payload)
+
+    record_property("from_data_us", best_time(lambda: from_data(payload)) * 1e6)
+
+    assert payload == original_payload
+
+
+@pytest.mark.parametrize("from_data, payload", PAYLOADS)
+def test_from_data__ignores_unused_keys(from_data, payload, record_property):
+    # Padding the payload with a large key the parser doesn't use shouldn't
+    # change what it parses.
+    padded_payload = deepcopy(payload)
+    padded_payload["unused"] = [{"key": str(i)} for i in range(10_000)]
+
+    if from_data is genius_data.GeniusSong.from_data:
+        padded_payload["response"]["song"]["unused"] = padded_payload.pop(
+            "unused"
+        )
+
+    record_property(
+        "padded_from_data_us",
+        best_time(lambda: from_data(padded_payload)) * 1e6,
+    )
+
+    # The raw payload is kept on the entity as is, so leave it out.
+    assert replace(from_data(padded_payload), data={}) == replace(
+        from_data(payload), data={}
+    )
@@ -0,0 +1,43 @@
+import timeit
+
+from .test_vinyl_search import build_collection
+
+
+def test_vinyl_records_and_artists__10k_records(mock_db, record_property):
+    build_collection(mock_db, records=10_000, tracks_per_record=1)
+    view = mock_db["vinyl_records_and_artists"]
+
+    plan = [
+        row[3]
+        for row in mock_db.execute(
+            "explain query plan select * from vinyl_records_and_artists"
+        )
+    ]
+
+    # Each record's artists are looked up by their keys, rather than joining
+    # every record to every artist.
+    assert "SCAN vinyl_records" in plan
+    assert not any(
+        step.startswith(("SCAN vinyl_records_artists", "SCAN artists"))
+        for step in plan
+    )
+
+    assert view.count == 10_000
+
+    record_property(
+        "rows_ms",
+        min(timeit.repeat(lambda: list(view.rows), number=1, repeat=3)) * 1e3,
+    )
+
+
+def test_foreign_key_indexes(mock_db):
+    build_collection(mock_db, records=10, tracks_per_record=1)
+
+    for sql in (
+        "select * from vinyl_records_artists where artist_id = 1",
+        "select * from tracks where vinyl_record_id = 1",
+    ):
+        (plan,) = [
+            row[3] for row in mock_db.execute(f"explain query plan {sql}")
+        ]
+        assert plan.startswith("SEARCH")
@@ -0,0 +1,74 @@
+import random
+import timeit
+
+from librarian.collections.vinyl import service
+
+# The vocabulary the synthetic titles are made from, each word is in about
+# 0.5% of the titles.
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def build_collection(db, records: int, tracks_per_record: int):
+    """
+    Build a synthetic vinyl collection with one artist for every five records.
+    """
+    service.build_database(db)
+
+    words = random.Random(0)
+
+    def title() -> str:
+        return " ".join(words.choices(WORDS, k=3))
+
+    with db.conn:
+        db["artists"].insert_all(
+            {"id": i, "name": f"Artist {title()}"} for i in range(records // 5)
+        )
+        db["vinyl_records"].insert_all(
+            {"id": i, "isbn": str(i), "title": title(), "year": 1970}
+            for i in range(records)
+        )
+        db["vinyl_records_artists"].insert_all(
+            {"vinyl_record_id": i, "artist_id": i // 5} for i in range(records)
+        )
+        db["tracks"].insert_all(
+            {
+                "id": i,
+                "vinyl_record_id": i // tracks_per_record,
+                "title": title(),
+            }
+            for i in range(records * tracks_per_record)
+        )
+
+
+def test_search_vinyl_records__50k_tracks(mock_db, record_property):
+    build_collection(mock_db, records=5_000, tracks_per_record=10)
+    assert mock_db["tracks"].count == 50_000
+
+    def search():
+        return list(
+            service.search_vinyl_records("word1 word2", mock_db, limit=25)
+        )
+
+    statements = []
+    mock_db.conn.set_trace_callback(statements.append)
+    try:
+        assert len(search()) == 25
+    finally:
+        mock_db.conn.set_trace_callback(None)
+
+    record_property(
+        "search_ms", min(timeit.repeat(search, number=5, repeat=3)) / 5 * 1e3
+    )
+
+    plan = [
+        row[3] for row in mock_db.execute(f"explain query plan {statements[0]}")
+    ]
+
+    # The matches come from the full-text indexes, and the records, artists
+    # and tracks are only looked up by their keys, never scanned.
+    for fts_table in ("vinyl_records_fts", "artists_fts", "tracks_fts"):
+        assert f"SCAN {fts_table} VIRTUAL TABLE INDEX 0:M1" in plan
+    scanned = {step.split()[1] for step in plan if step.startswith("SCAN")}
+    assert scanned.isdisjoint(
+        ("vinyl_records", "vinyl_records_artists", "artists", "tracks")
+    )
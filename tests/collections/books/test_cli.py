@@ -1,9 +1,12 @@
 import pytest
 import responses
 
-from librarian.collections.books import cli
+from librarian.collections.books import cli, service
+from librarian.integrations import openlibrary
+from librarian.utils import compression
 
 from ...integrations.openlibrary import openlibrary_responses
+from ...integrations.openlibrary.openlibrary_responses import BOOK_RESPONSE
 
 
 @responses.activate
@@ -45,7 +48,137 @@ def test_add_book(mocker, cli_runner, mock_db):
     assert mock_db["authors"].count == 1
 
 
-@pytest.mark.parametrize("output_format", ("csv", "json", "markdown"))
+@responses.activate
+def test_add_books(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.books.cli.get_database",
+        return_value=mock_db,
+    )
+    mocker.patch(
+        "librarian.collections.books.cli.click.edit",
+        return_value="0140328726\n\n0140328726\n",
+    )
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/api/books",
+            json=openlibrary_responses.BOOKS_API_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL45804W.json",
+            json=openlibrary_responses.WORK_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    result = cli_runner.invoke(cli.add_books, "--concurrency=2")
+    assert result.exit_code == 0
+
+    # The book's work and author are only fetched once.
+    assert len(responses.calls) == 3
+    assert mock_db["books"].count == 1
+    assert mock_db["authors"].count == 1
+
+
+@responses.activate
+def test_add_books__missing_isbn(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.books.cli.get_database",
+        return_value=mock_db,
+    )
+    mocker.patch(
+        "librarian.collections.books.cli.click.edit",
+        return_value="0140328726\n0000000000\n",
+    )
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/api/books",
+            json=openlibrary_responses.BOOKS_API_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/isbn/0000000000.json",
+            status=404,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL45804W.json",
+            json=openlibrary_responses.WORK_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    result = cli_runner.invoke(cli.add_books)
+    assert result.exit_code == 0
+    assert result.stderr == (
+        "We couldn't find 0000000000 on OpenLibrary, so it was skipped.\n"
+    )
+
+    # The book that was found is still added.
+    assert mock_db["books"].count == 1
+
+
+def test_import_dump(cli_runner, tmp_path):
+    dump_path = openlibrary_responses.write_dump(
+        tmp_path / "ol_dump_editions_latest.txt.gz",
+        openlibrary_responses.BOOK_RESPONSE,
+    )
+
+    result = cli_runner.invoke(
+        cli.import_dump, [str(dump_path), "--processes=1"]
+    )
+    assert result.exit_code == 0
+    assert result.output == (
+        "Imported 1 entities from ol_dump_editions_latest.txt.gz.\n"
+    )
+
+
+def test_compress(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.books.cli.get_database",
+        return_value=mock_db,
+    )
+
+    service.build_database(db=mock_db)
+    service.upsert_openlibrary_entities(
+        [openlibrary.OpenLibraryBook.from_data(BOOK_RESPONSE)], db=mock_db
+    )
+
+    result = cli_runner.invoke(cli.compress)
+    assert result.exit_code == 0
+    assert result.output == "Rewrote 1 OpenLibrary entities.\n"
+
+    row = mock_db["openlibrary_entities"].get("OL7353617M")
+    assert compression.is_compressed(row["data"])
+
+    result = cli_runner.invoke(cli.compress, ["--decompress"])
+    assert result.exit_code == 0
+    assert result.output == "Rewrote 1 OpenLibrary entities.\n"
+
+
+@pytest.mark.parametrize("output_format", ("csv", "json", "jsonl", "markdown"))
 def test_list_books(output_format, mocker, cli_runner, mock_db):
     mocker.patch(
         "librarian.collections.books.cli.get_database",
@@ -53,3 +186,16 @@ def test_list_books(output_format, mocker, cli_runner, mock_db):
     )
 
     cli_runner.invoke(cli.list_books, f"--format {output_format}")
+
+
+def test_search_books(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.books.cli.get_database",
+        return_value=mock_db,
+    )
+
+    result = cli_runner.invoke(
+        cli.search_books, ["Title", "--format=jsonl", "--limit=10"]
+    )
+    assert result.exit_code == 0
+    assert result.output == ""
@@ -1,10 +1,14 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 import pytest
+import responses
 
 from librarian.collections.books import service
 from librarian.integrations import openlibrary
+from librarian.utils import compression
+from tests.integrations.openlibrary import openlibrary_responses
 from tests.integrations.openlibrary.openlibrary_responses import BOOK_RESPONSE
 
 
@@ -19,6 +23,39 @@ def test_build_database(mock_db):
 
     assert mock_db["list_books_and_authors"].exists() is True
 
+    unique_indexes = [
+        (table, index.columns)
+        for table in ("books", "authors")
+        for index in mock_db[table].indexes
+        if index.unique
+    ]
+    assert ("books", ["openlibrary_key"]) in unique_indexes
+    assert ("authors", ["openlibrary_key"]) in unique_indexes
+
+
+def test_build_database__duplicate_keys(mock_db):
+    service.build_database(db=mock_db)
+
+    # Databases from before the unique indexes can have duplicate books.
+    mock_db.execute("drop index idx_books_openlibrary_key")
+    mock_db["books"].insert_all(
+        [
+            {"id": 1, "openlibrary_key": "OL1M", "updated_at": "2023-01-01"},
+            {"id": 2, "openlibrary_key": "OL1M", "updated_at": "2023-06-01"},
+        ]
+    )
+    mock_db["authors"].insert({"id": 1, "openlibrary_key": "OL1A"})
+    mock_db["books_authors"].insert_all(
+        [{"book_id": 1, "author_id": 1}, {"book_id": 2, "author_id": 1}]
+    )
+
+    service.build_database(db=mock_db)
+
+    assert [row["id"] for row in mock_db["books"].rows] == [2]
+    assert list(mock_db["books_authors"].rows) == [
+        {"book_id": 2, "author_id": 1}
+    ]
+
 
 @pytest.mark.parametrize(
     "book_covers, expected_result",
@@ -114,8 +151,506 @@ def test_link_book_to_authors(mock_book, mock_work, mock_author, mock_db):
     assert mock_db["books_authors"].count == 1
 
 
+@responses.activate
+def test_fetch_books_and_related_data():
+    isbns = ["0140328726", "9780140328721"]
+
+    # The bulk API only knows about the first ISBN, so the second one falls
+    # back to the ISBN endpoint.
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/api/books",
+            json=openlibrary_responses.BOOKS_API_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/isbn/9780140328721.json",
+            json=openlibrary_responses.BOOK_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL45804W.json",
+            json=openlibrary_responses.WORK_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    results = list(service.fetch_books_and_related_data(isbns, concurrency=2))
+    assert len(results) == 2
+
+    # Both books share a work and author, so they are only fetched once.
+    assert len(responses.calls) == 4
+
+    for book, works, authors in results:
+        assert book.title == BOOK_RESPONSE["title"]
+        assert [work.key for work in works] == ["OL45804W"]
+        assert [author.key for author in authors] == ["OL34184A"]
+
+
+@responses.activate
+def test_fetch_books_and_related_data__missing_isbn():
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/api/books",
+            json=openlibrary_responses.BOOKS_API_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/isbn/0000000000.json",
+            status=404,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL45804W.json",
+            json=openlibrary_responses.WORK_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    missing = []
+    results = list(
+        service.fetch_books_and_related_data(
+            ["0000000000", "0140328726"], on_missing=missing.append
+        )
+    )
+
+    # The unknown ISBN is skipped, without losing the other book.
+    assert missing == ["0000000000"]
+    assert [book.title for book, _works, _authors in results] == [
+        BOOK_RESPONSE["title"]
+    ]
+
+
+@responses.activate
+def test_openlibrary_entity_resolver(mock_db):
+    service.build_database(db=mock_db)
+
+    author = openlibrary.OpenLibraryAuthor.from_data(
+        openlibrary_responses.AUTHOR_RESPONSE
+    )
+    service.upsert_openlibrary_entities([author], db=mock_db)
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL45804W.json",
+            json=openlibrary_responses.WORK_RESPONSE,
+        )
+    )
+
+    with ThreadPoolExecutor() as executor:
+        resolver = service.OpenLibraryEntityResolver(
+            client=openlibrary.OpenLibraryClient(),
+            executor=executor,
+            db=mock_db,
+        )
+        works = resolver.get_works(["OL45804W", "OL45804W"])
+        authors = resolver.get_authors(["OL34184A"])
+
+    # The author is fresh in the database, so only the work is fetched.
+    assert len(responses.calls) == 1
+    assert list(works.keys()) == ["OL45804W"]
+    assert authors["OL34184A"].name == author.name
+
+
+@responses.activate
+def test_openlibrary_entity_resolver__missing(mock_db):
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL45804W.json",
+            json=openlibrary_responses.WORK_RESPONSE,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/works/OL1W.json",
+            status=404,
+        )
+    )
+
+    missing = []
+    with ThreadPoolExecutor() as executor:
+        resolver = service.OpenLibraryEntityResolver(
+            client=openlibrary.OpenLibraryClient(),
+            executor=executor,
+            on_missing=missing.append,
+        )
+        works = resolver.get_works(["OL1W", "OL45804W"])
+
+    # The work that couldn't be fetched doesn't stop the other.
+    assert list(works.keys()) == ["OL45804W"]
+    assert missing == ["OL1W"]
+
+
+@pytest.fixture
+def mock_dump_index(tmp_path) -> openlibrary.OpenLibraryDumpIndex:
+    index = openlibrary.OpenLibraryDumpIndex(path=tmp_path / "index.db")
+    index.import_dump(
+        openlibrary_responses.write_dump(
+            tmp_path / "dump.txt.gz",
+            openlibrary_responses.BOOK_RESPONSE,
+            openlibrary_responses.WORK_RESPONSE,
+        ),
+        processes=1,
+    )
+    return index
+
+
+@responses.activate
+def test_fetch_book_and_related_data__dump_index(mock_dump_index):
+    # The author isn't in the dump index, so it's the only thing fetched.
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    book, works, authors = service.fetch_book_and_related_data(
+        "0140328726", index=mock_dump_index
+    )
+
+    assert len(responses.calls) == 1
+    assert book.key == "OL7353617M"
+    assert [work.key for work in works] == ["OL45804W"]
+    assert [author.key for author in authors] == ["OL34184A"]
+
+
+@responses.activate
+def test_fetch_books_and_related_data__dump_index(mock_dump_index):
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    results = list(
+        service.fetch_books_and_related_data(
+            ["0140328726", "9780140328721"], index=mock_dump_index
+        )
+    )
+
+    # Only the author isn't in the dump index, and it's fetched once.
+    assert len(responses.calls) == 1
+    assert [book.key for book, _works, _authors in results] == [
+        "OL7353617M",
+        "OL7353617M",
+    ]
+
+
+def test_get_fresh_openlibrary_entities(mock_db):
+    service.build_database(db=mock_db)
+
+    author = openlibrary.OpenLibraryAuthor.from_data(
+        openlibrary_responses.AUTHOR_RESPONSE
+    )
+    service.upsert_openlibrary_entities([author], db=mock_db)
+
+    entities = service.get_fresh_openlibrary_entities(
+        ["OL34184A", "OL45804W"], db=mock_db
+    )
+    assert list(entities.keys()) == ["OL34184A"]
+
+    entities = service.get_fresh_openlibrary_entities(
+        ["OL34184A"], db=mock_db, max_age=datetime.timedelta(seconds=-1)
+    )
+    assert entities == {}
+
+
+def test_get_openlibrary_entities__compressed(mock_db):
+    service.build_database(db=mock_db)
+
+    book = openlibrary.OpenLibraryBook.from_data(BOOK_RESPONSE)
+    author = openlibrary.OpenLibraryAuthor.from_data(
+        openlibrary_responses.AUTHOR_RESPONSE
+    )
+    service.upsert_openlibrary_entities([book], db=mock_db)
+
+    compression.compress_table(mock_db, "openlibrary_entities", pk="key")
+
+    # Entities added after the table is compressed are compressed too.
+    service.upsert_openlibrary_entities([author], db=mock_db)
+    assert all(
+        compression.is_compressed(row["data"])
+        for row in mock_db["openlibrary_entities"].rows
+    )
+
+    entities = service.get_openlibrary_entities(
+        [book.key, author.key], db=mock_db
+    )
+    assert entities == {book.key: book.data, author.key: author.data}
+
+    editions = service.get_openlibrary_editions_of_works(
+        ["OL45804W"], db=mock_db
+    )
+    assert editions == {book.key: book.data}
+
+
+def test_upsert_books_and_related_data(mock_db):
+    service.build_database(db=mock_db)
+
+    book = openlibrary.OpenLibraryBook.from_data(BOOK_RESPONSE)
+    work = openlibrary.OpenLibraryWork.from_data(
+        openlibrary_responses.WORK_RESPONSE
+    )
+    author = openlibrary.OpenLibraryAuthor.from_data(
+        openlibrary_responses.AUTHOR_RESPONSE
+    )
+    other_book = openlibrary.OpenLibraryBook(
+        key="IAmABookKey",
+        title="Book Title",
+        publish_date=datetime.date(2023, 12, 31),
+    )
+
+    items = [(book, [work], [author]), (other_book, [], [author])]
+
+    rows = service.upsert_books_and_related_data(items, db=mock_db)
+    assert [row["openlibrary_key"] for row in rows] == [book.key, "IAmABookKey"]
+    assert rows[0]["description"] == work.description
+
+    assert mock_db["books"].count == 2
+    assert mock_db["authors"].count == 1
+    assert mock_db["books_authors"].count == 2
+    assert mock_db["openlibrary_entities"].count == 4
+
+    # Upserting the same books again updates the existing rows.
+    new_rows = service.upsert_books_and_related_data(items, db=mock_db)
+    assert [row["id"] for row in new_rows] == [row["id"] for row in rows]
+    assert new_rows[0]["created_at"] == rows[0]["created_at"]
+
+    assert mock_db["books"].count == 2
+    assert mock_db["authors"].count == 1
+    assert mock_db["books_authors"].count == 2
+
+
+@responses.activate
+def test_refresh_books(mock_db):
+    service.build_database(db=mock_db)
+
+    book = openlibrary.OpenLibraryBook.from_data(BOOK_RESPONSE)
+    work = openlibrary.OpenLibraryWork.from_data(
+        openlibrary_responses.WORK_RESPONSE
+    )
+    author = openlibrary.OpenLibraryAuthor.from_data(
+        openlibrary_responses.AUTHOR_RESPONSE
+    )
+    service.upsert_books_and_related_data(
+        [(book, [work], [author])], db=mock_db
+    )
+
+    # Nothing is stale yet.
+    assert service.refresh_books(db=mock_db) == (0, 0)
+
+    mock_db.execute(
+        "update openlibrary_entities "
+        "set updated_at = '2000-01-01T00:00:00', "
+        "fetched_at = '2000-01-01T00:00:00'"
+    )
+
+    # Only the work has a new revision.
+    new_work_response = deepcopy(openlibrary_responses.WORK_RESPONSE)
+    new_work_response["latest_revision"] += 1
+    new_work_response["description"] = "A new description."
+
+    for url, response_data in (
+        ("https://openlibrary.org/books/OL7353617M.json", BOOK_RESPONSE),
+        ("https://openlibrary.org/works/OL45804W.json", new_work_response),
+        (
+            "https://openlibrary.org/authors/OL34184A.json",
+            openlibrary_responses.AUTHOR_RESPONSE,
+        ),
+    ):
+        responses.add(
+            responses.Response(method="GET", url=url, json=response_data)
+        )
+
+    assert service.refresh_books(db=mock_db) == (3, 1)
+
+    book_row = next(mock_db["books"].rows)
+    assert book_row["description"] == "A new description."
+
+    # The unchanged book and author aren't rewritten, but they were
+    # refetched, so they're fresh again.
+    assert service.get_stale_openlibrary_entities(db=mock_db) == []
+    assert service.get_fresh_openlibrary_entities(
+        ["OL34184A", "OL7353617M"], db=mock_db
+    ).keys() == {"OL34184A", "OL7353617M"}
+
+    updated_at = {
+        row["key"]: row["updated_at"]
+        for row in mock_db["openlibrary_entities"].rows
+    }
+    assert updated_at["OL34184A"] == "2000-01-01T00:00:00"
+    assert updated_at["OL7353617M"] == "2000-01-01T00:00:00"
+    assert updated_at["OL45804W"] != "2000-01-01T00:00:00"
+
+    # Refreshing again within the max age fetches nothing.
+    assert service.refresh_books(db=mock_db) == (0, 0)
+
+
+@responses.activate
+def test_refresh_books__missing(mock_db):
+    service.build_database(db=mock_db)
+
+    book = openlibrary.OpenLibraryBook.from_data(BOOK_RESPONSE)
+    author = openlibrary.OpenLibraryAuthor.from_data(
+        openlibrary_responses.AUTHOR_RESPONSE
+    )
+    service.upsert_openlibrary_entities([book, author], db=mock_db)
+    mock_db.execute(
+        "update openlibrary_entities set fetched_at = '2000-01-01T00:00:00'"
+    )
+
+    # The book has been deleted from OpenLibrary.
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/books/OL7353617M.json",
+            status=404,
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://openlibrary.org/authors/OL34184A.json",
+            json=openlibrary_responses.AUTHOR_RESPONSE,
+        )
+    )
+
+    missing = []
+    assert service.refresh_books(db=mock_db, on_missing=missing.append) == (
+        1,
+        0,
+    )
+    assert missing == ["OL7353617M"]
+
+    # The author is still refreshed, and the book stays stale to be retried.
+    stale_entities = service.get_stale_openlibrary_entities(db=mock_db)
+    assert [row["key"] for row in stale_entities] == ["OL7353617M"]
+
+
 def test_list_books(mock_db):
     service.build_database(db=mock_db)
 
     books = service.list_books(db=mock_db)
     assert len(list(books)) == 0
+
+
+def test_books_listing(mock_book, mock_work, mock_author, mock_db):
+    service.build_database(db=mock_db)
+
+    assert "books_listing_books_ai" in mock_db.triggers_dict
+    assert ["title"] in [
+        index.columns for index in mock_db["books_listing"].indexes
+    ]
+
+    other_book = openlibrary.OpenLibraryBook(
+        key="IAmABookKey",
+        title="A Book Title",
+        publish_date=datetime.date(2023, 12, 31),
+        isbn_13=["9780000000002"],
+    )
+    service.upsert_books_and_related_data(
+        [(mock_book, [mock_work], [mock_author]), (other_book, [], [])],
+        db=mock_db,
+    )
+
+    assert list(service.list_books(db=mock_db)) == [
+        {"isbn": 9780000000002, "title": "A Book Title", "authors": None},
+        {
+            "isbn": None,
+            "title": mock_book.title,
+            "authors": mock_author.name,
+        },
+    ]
+
+    # Renaming an author updates the listing of their books.
+    mock_db["authors"].update(1, {"name": "Someone Else"})
+    assert mock_db["books_listing"].get(1)["authors"] == "Someone Else"
+
+    mock_db["books"].delete(1)
+    assert mock_db["books_listing"].count == 1
+
+
+def test_build_books_listing__existing_books(mock_book, mock_db):
+    service.build_database(db=mock_db)
+    service.upsert_book_from_open_library(mock_book, [], db=mock_db)
+
+    mock_db["books_listing"].drop()
+    service.build_database(db=mock_db)
+
+    assert mock_db["books_listing"].count == 1
+
+
+def test_search_books(mock_db):
+    service.build_database(db=mock_db)
+
+    with mock_db.conn:
+        mock_db["authors"].insert_all(
+            [
+                {"id": 1, "name": "Ursula K. Le Guin", "openlibrary_key": "A1"},
+                {"id": 2, "name": "Someone Else", "openlibrary_key": "A2"},
+            ]
+        )
+        mock_db["books"].insert_all(
+            [
+                {
+                    "id": 1,
+                    "title": "The Dispossessed",
+                    "description": "An anarchist utopia.",
+                    "openlibrary_key": "B1",
+                },
+                {
+                    "id": 2,
+                    "title": "A Book About Utopia",
+                    "description": "Not by Le Guin.",
+                    "openlibrary_key": "B2",
+                },
+            ]
+        )
+        mock_db["books_authors"].insert_all(
+            [{"book_id": 1, "author_id": 1}, {"book_id": 2, "author_id": 2}]
+        )
+
+    def titles(query, **kwargs):
+        books = service.search_books(query, db=mock_db, **kwargs)
+        return [book["title"] for book in books]
+
+    # Matches in the title rank above matches in the description.
+    assert titles("utopia") == ["A Book About Utopia", "The Dispossessed"]
+    # Matches on the authors rank above matches in the description.
+    assert titles("le guin") == ["The Dispossessed", "A Book About Utopia"]
+
+    assert titles("utopia", limit=1) == ["A Book About Utopia"]
+    assert titles("utopia", limit=1, offset=1) == ["The Dispossessed"]
+
+    # Punctuation in the query doesn't break the search.
+    assert titles('dispossessed: "') == ["The Dispossessed"]
+    assert titles("nothing") == []
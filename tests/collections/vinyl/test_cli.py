@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from librarian.collections.vinyl import cli, service
+from librarian.integrations.discogs import DiscogsRelease
+from librarian.utils import compression
+
+from ...integrations.discogs import discogs_responses
+
+
+def test_import_dump(cli_runner, tmp_path):
+    dump_paths = [
+        discogs_responses.write_dump(
+            tmp_path / "discogs_releases.xml.gz",
+            discogs_responses.RELEASES_DUMP,
+        ),
+        discogs_responses.write_dump(
+            tmp_path / "discogs_artists.xml.gz",
+            discogs_responses.ARTISTS_DUMP,
+        ),
+    ]
+
+    result = cli_runner.invoke(cli.import_dump, [str(p) for p in dump_paths])
+    assert result.exit_code == 0
+    assert result.output == (
+        "Imported 2 entities from discogs_releases.xml.gz.\n"
+        "Imported 1 entities from discogs_artists.xml.gz.\n"
+    )
+
+    # The imported releases are used when adding vinyl records.
+    release = service.get_discogs_release_by_isbn("733044")
+    assert release is not None
+    assert release.id == 1
+
+
+def test_compress(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.vinyl.cli.get_database",
+        return_value=mock_db,
+    )
+
+    service.build_database(db=mock_db)
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    service.upsert_releases_and_related_data([release], db=mock_db)
+
+    result = cli_runner.invoke(cli.compress)
+    assert result.exit_code == 0
+    assert result.output == "Rewrote 1 releases and 0 artists.\n"
+    row = mock_db["discogs_releases"].get(release.id)
+    assert compression.is_compressed(row["data"])
+
+    result = cli_runner.invoke(cli.compress, ["--decompress"])
+    assert result.exit_code == 0
+    assert result.output == "Rewrote 1 releases and 0 artists.\n"
+    row = mock_db["discogs_releases"].get(release.id)
+    assert json.loads(row["data"])["id"] == release.id
+
+
+@pytest.mark.parametrize("output_format", ("csv", "json", "jsonl", "markdown"))
+def test_list_vinyl(output_format, mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.vinyl.cli.get_database",
+        return_value=mock_db,
+    )
+
+    result = cli_runner.invoke(cli.list_vinyl, f"--format {output_format}")
+    assert result.exit_code == 0
+
+
+def test_search_vinyl(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.vinyl.cli.get_database",
+        return_value=mock_db,
+    )
+
+    service.build_database(db=mock_db)
+    mock_db["vinyl_records"].insert(
+        {"id": 1, "isbn": "1", "title": "Abbey Road", "year": 1969}
+    )
+
+    result = cli_runner.invoke(cli.search_vinyl, ["abbey", "--format=jsonl"])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {
+        "isbn": "1",
+        "title": "Abbey Road",
+        "year": 1969,
+        "artists": None,
+    }
+
+
+def test_add_vinyls(mocker, cli_runner, mock_db):
+    mocker.patch(
+        "librarian.collections.vinyl.cli.get_database",
+        return_value=mock_db,
+    )
+
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    get_discogs_releases_by_isbns = mocker.patch.object(
+        service,
+        "get_discogs_releases_by_isbns",
+        return_value={"5012394144777": release, "404": None},
+    )
+
+    result = cli_runner.invoke(
+        cli.add_vinyls,
+        "--concurrency=2",
+        input="5012394144777\n\n404\n",
+    )
+    assert result.exit_code == 0
+    assert "Added 1 vinyl records." in result.output
+
+    args, kwargs = get_discogs_releases_by_isbns.call_args
+    assert args[0] == ["5012394144777", "404"]
+    assert kwargs["concurrency"] == 2
+
+    assert mock_db["vinyl_records"].count == 1
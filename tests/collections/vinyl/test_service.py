@@ -1,12 +1,21 @@
+import json
+from copy import deepcopy
+
 import pytest
+import responses
 
 from librarian.collections.vinyl import service
 from librarian.integrations.discogs import (
     DiscogsArtist,
     DiscogsArtistMember,
+    DiscogsDumpIndex,
     DiscogsRelease,
     DiscogsReleaseArtist,
+    get_discogs_dump_index,
 )
+from librarian.settings import Settings
+from librarian.utils import compression
+from librarian.utils.database import CONTENT_HASH_COLUMN, upsert_records
 
 from ...integrations.discogs import discogs_responses
 
@@ -24,6 +33,44 @@ def test_build_database(mock_db):
     assert mock_db["discogs_releases"].exists() is True
     assert mock_db["discogs_artists"].exists() is True
 
+    unique_indexes = [
+        (table, index.columns)
+        for table in ("vinyl_records", "artists")
+        for index in mock_db[table].indexes
+        if index.unique
+    ]
+    assert ("vinyl_records", ["discogs_release_id"]) in unique_indexes
+    assert ("artists", ["discogs_artist_id"]) in unique_indexes
+
+
+def test_build_database__duplicate_keys(mock_db):
+    service.build_database(db=mock_db)
+
+    # Databases from before the unique indexes can have duplicate records.
+    mock_db.execute("drop index idx_vinyl_records_discogs_release_id")
+    mock_db["vinyl_records"].insert_all(
+        [
+            {"id": 1, "discogs_release_id": 10, "updated_at": "2023-06-01"},
+            {"id": 2, "discogs_release_id": 10, "updated_at": "2023-01-01"},
+        ]
+    )
+    mock_db["tracks"].insert_all(
+        [{"id": 1, "vinyl_record_id": 1}, {"id": 2, "vinyl_record_id": 2}]
+    )
+    mock_db["artists"].insert({"id": 1, "discogs_artist_id": 20})
+    mock_db["vinyl_records_artists"].insert(
+        {"vinyl_record_id": 2, "artist_id": 1}
+    )
+
+    service.build_database(db=mock_db)
+
+    # The most recently updated record is kept, with its own tracks.
+    assert [row["id"] for row in mock_db["vinyl_records"].rows] == [1]
+    assert [row["id"] for row in mock_db["tracks"].rows] == [1]
+    assert list(mock_db["vinyl_records_artists"].rows) == [
+        {"vinyl_record_id": 1, "artist_id": 1}
+    ]
+
 
 @pytest.mark.parametrize(
     "release_barcode, isbn, expected_result",
@@ -88,3 +135,520 @@ def test_transform_discogs_artist__discogs_artist_member():
     assert transformed_artist["discogs_artist_id"] == artist.id
     assert "updated_at" in transformed_artist
     assert transformed_artist["name"] == artist.name
+
+
+def test_upsert_artist_from_discogs_artist(mock_db):
+    service.build_database(db=mock_db)
+
+    artist = DiscogsArtist.from_data(discogs_responses.DISCOGS_ARTIST)
+
+    row = service.upsert_artist_from_discogs_artist(artist, db=mock_db)
+    assert row["discogs_artist_id"] == artist.id
+    assert row["profile"] == artist.profile
+
+    member = DiscogsArtistMember(id=artist.id, name="A New Name")
+    new_row = service.upsert_artist_from_discogs_artist(member, db=mock_db)
+    assert new_row["id"] == row["id"]
+    assert new_row["name"] == "A New Name"
+    assert new_row["profile"] == artist.profile
+
+    assert mock_db["artists"].count == 1
+
+
+def test_upsert_vinyl_from_discogs_release(mock_db):
+    service.build_database(db=mock_db)
+
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    artist_rows = [
+        service.upsert_artist_from_discogs_artist(artist, db=mock_db)
+        for artist in release.artists
+    ]
+
+    row = service.upsert_vinyl_from_discogs_release(
+        release, artist_rows, db=mock_db
+    )
+    assert row["discogs_release_id"] == release.id
+    assert row["title"] == release.title
+
+    new_row = service.upsert_vinyl_from_discogs_release(
+        release, artist_rows, db=mock_db
+    )
+    assert new_row["id"] == row["id"]
+    assert new_row["created_at"] == row["created_at"]
+
+    assert mock_db["vinyl_records"].count == 1
+    assert mock_db["vinyl_records_artists"].count == len(artist_rows)
+
+
+@responses.activate
+def test_get_artists_from_discogs():
+    response_data = deepcopy(discogs_responses.DISCOGS_ARTIST)
+    artist_id = response_data["id"]
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url=f"https://api.discogs.com/artists/{artist_id}",
+            json=response_data,
+        )
+    )
+
+    artists = service.get_artists_from_discogs(
+        [artist_id, artist_id], concurrency=2
+    )
+
+    assert len(responses.calls) == 1
+    assert [artist.id for artist in artists] == [artist_id]
+
+
+@responses.activate
+def test_get_artists_from_discogs__dump_index(tmp_path):
+    index = DiscogsDumpIndex(path=tmp_path / "index.db")
+    index.import_dump(
+        discogs_responses.write_dump(
+            tmp_path / "discogs_artists.xml.gz",
+            discogs_responses.ARTISTS_DUMP,
+        )
+    )
+
+    response_data = deepcopy(discogs_responses.DISCOGS_ARTIST)
+    responses.add(
+        responses.Response(
+            method="GET",
+            url=f"https://api.discogs.com/artists/{response_data['id']}",
+            json=response_data,
+        )
+    )
+
+    # Only the artist that isn't in the dump index is fetched from the API.
+    artists = service.get_artists_from_discogs(
+        [1, response_data["id"]], index=index
+    )
+    assert [artist.id for artist in artists] == [1, response_data["id"]]
+    assert artists[0].name_variations == ["Persuader"]
+    assert len(responses.calls) == 1
+
+
+def test_upsert_artists_and_members(mock_db):
+    service.build_database(db=mock_db)
+
+    band = DiscogsArtist.from_data(discogs_responses.DISCOGS_ARTIST)
+    member = DiscogsArtist.from_data(
+        {
+            "id": discogs_responses.DISCOGS_ARTIST_MEMBER["id"],
+            "profile": "I am a band member.",
+        }
+    )
+    other_band = DiscogsArtist(
+        id=1,
+        members=[
+            DiscogsArtistMember.from_data(
+                discogs_responses.DISCOGS_ARTIST_MEMBER
+            )
+        ],
+    )
+
+    service.upsert_artists_and_members([band, member, other_band], db=mock_db)
+    service.upsert_artists_and_members([band, member, other_band], db=mock_db)
+
+    # The band's members, plus the two bands, with the shared member only
+    # added once.
+    assert mock_db["artists"].count == len(band.members) + 2
+    assert mock_db["discogs_artists"].count == 3
+    assert mock_db["bands_members"].count == len(band.members) + 1
+
+    member_row = next(
+        mock_db["artists"].rows_where("discogs_artist_id = ?", [member.id])
+    )
+    assert member_row["name"] == "Chad Kroeger"
+    assert member_row["profile"] == "I am a band member."
+
+
+@responses.activate
+def test_refresh_vinyl(mock_db):
+    service.build_database(db=mock_db)
+
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    service.upsert_release_and_related_data(release, db=mock_db)
+
+    # Nothing is stale yet.
+    assert service.refresh_vinyl(db=mock_db) == (0, 0)
+
+    mock_db.execute(
+        "update discogs_releases "
+        "set updated_at = '2000-01-01T00:00:00', "
+        "fetched_at = '2000-01-01T00:00:00'"
+    )
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url=f"https://api.discogs.com/releases/{release.id}",
+            json=discogs_responses.DISCOGS_RELEASE,
+        )
+    )
+
+    # The release hasn't changed, so only when it was fetched is written.
+    vinyl_record = next(mock_db["vinyl_records"].rows)
+    total_changes = mock_db.conn.total_changes
+    assert service.refresh_vinyl(db=mock_db) == (1, 0)
+    assert mock_db.conn.total_changes == total_changes + 1
+    assert next(mock_db["vinyl_records"].rows) == vinyl_record
+
+    row = mock_db["discogs_releases"].get(release.id)
+    assert row["updated_at"] == "2000-01-01T00:00:00"
+    assert row["fetched_at"] != "2000-01-01T00:00:00"
+
+    # It's fresh again, so refreshing again within the max age fetches
+    # nothing.
+    assert (
+        service.get_stale_discogs_entity_ids("discogs_releases", mock_db) == []
+    )
+    assert service.refresh_vinyl(db=mock_db) == (0, 0)
+
+    # Once it changes, it's rewritten.
+    mock_db.execute(
+        "update discogs_releases set fetched_at = '2000-01-01T00:00:00'"
+    )
+    changed_release = deepcopy(discogs_responses.DISCOGS_RELEASE)
+    changed_release["title"] = "A New Title"
+    responses.replace(
+        responses.GET,
+        f"https://api.discogs.com/releases/{release.id}",
+        json=changed_release,
+    )
+
+    assert service.refresh_vinyl(db=mock_db) == (1, 0)
+    assert (
+        service.get_stale_discogs_entity_ids("discogs_releases", mock_db) == []
+    )
+    assert next(mock_db["vinyl_records"].rows)["title"] == "A New Title"
+
+
+@responses.activate
+def test_refresh_vinyl__skips_dump_index(mock_db, tmp_path):
+    index = DiscogsDumpIndex(path=Settings.DISCOGS_DUMP_INDEX_PATH)
+    for name, dump in (
+        ("releases", discogs_responses.RELEASES_DUMP),
+        ("artists", discogs_responses.ARTISTS_DUMP),
+    ):
+        index.import_dump(
+            discogs_responses.write_dump(
+                tmp_path / f"discogs_{name}.xml.gz", dump
+            )
+        )
+    get_discogs_dump_index.cache_clear()
+
+    service.build_database(db=mock_db)
+    release = service.get_release_from_discogs(1)
+    artist = service.get_artist_from_discogs(1)
+    service.upsert_release_and_related_data(release, db=mock_db)
+    service.upsert_artists_and_members([artist], db=mock_db)
+    for table in ("discogs_releases", "discogs_artists"):
+        mock_db.execute(f"update {table} set fetched_at = '2000-01-01'")
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/releases/1",
+            json={**discogs_responses.DISCOGS_RELEASE, "id": 1},
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/artists/1",
+            json={**discogs_responses.DISCOGS_ARTIST, "id": 1},
+        )
+    )
+
+    # The stale release and artist are both in the dump index, but it's no
+    # fresher than they are, so they're refetched from Discogs' API.
+    assert service.refresh_vinyl(db=mock_db) == (1, 1)
+    assert len(responses.calls) == 2
+    assert (
+        next(mock_db["vinyl_records"].rows)["title"]
+        == discogs_responses.DISCOGS_RELEASE["title"]
+    )
+
+
+@pytest.fixture
+def vinyl_collection(mock_db):
+    service.build_database(db=mock_db)
+
+    with mock_db.conn:
+        mock_db["vinyl_records"].insert_all(
+            [
+                {"id": 1, "isbn": "1", "title": "Abbey Road", "year": 1969},
+                {"id": 2, "isbn": "2", "title": "Let It Be", "year": 1970},
+                {"id": 3, "isbn": "3", "title": "Blue", "year": 1971},
+            ]
+        )
+        mock_db["artists"].insert_all(
+            [
+                {"id": 1, "name": "The Beatles"},
+                {"id": 2, "name": "Joni Mitchell"},
+            ]
+        )
+        mock_db["vinyl_records_artists"].insert_all(
+            [
+                {"vinyl_record_id": 1, "artist_id": 1},
+                {"vinyl_record_id": 2, "artist_id": 1},
+                {"vinyl_record_id": 3, "artist_id": 2},
+            ]
+        )
+        mock_db["tracks"].insert_all(
+            [
+                {"id": 1, "vinyl_record_id": 1, "title": "Come Together"},
+                {"id": 2, "vinyl_record_id": 2, "title": "Let It Be"},
+                {"id": 3, "vinyl_record_id": 3, "title": "River"},
+            ]
+        )
+
+    return mock_db
+
+
+def test_list_vinyl_records(vinyl_collection):
+    assert list(service.list_vinyl_records(vinyl_collection)) == [
+        {
+            "isbn": "1",
+            "title": "Abbey Road",
+            "year": 1969,
+            "artists": "The Beatles",
+        },
+        {
+            "isbn": "3",
+            "title": "Blue",
+            "year": 1971,
+            "artists": "Joni Mitchell",
+        },
+        {
+            "isbn": "2",
+            "title": "Let It Be",
+            "year": 1970,
+            "artists": "The Beatles",
+        },
+    ]
+
+
+@pytest.mark.parametrize(
+    "query, kwargs, expected_titles",
+    (
+        # Artists, titles and tracks are all searched.
+        ("beatles", {}, ["Abbey Road", "Let It Be"]),
+        ("river", {}, ["Blue"]),
+        # Records matching on more indexes rank higher.
+        ("let it be beatles", {}, ["Let It Be", "Abbey Road"]),
+        ("beatles abbey", {}, ["Abbey Road", "Let It Be"]),
+        ("beatles", {"limit": 1, "offset": 1}, ["Let It Be"]),
+        ('"', {}, []),
+        ("nothing", {}, []),
+    ),
+)
+def test_search_vinyl_records(vinyl_collection, query, kwargs, expected_titles):
+    vinyl_records = service.search_vinyl_records(
+        query, vinyl_collection, **kwargs
+    )
+    assert [row["title"] for row in vinyl_records] == expected_titles
+
+
+def test_vinyl_records_and_artists(vinyl_collection):
+    rows = vinyl_collection["vinyl_records_and_artists"].rows
+    assert [(row["title"], row["artists"]) for row in rows] == [
+        ("Abbey Road", "The Beatles"),
+        ("Blue", "Joni Mitchell"),
+        ("Let It Be", "The Beatles"),
+    ]
+
+
+def test_upsert_releases_and_related_data(mock_db):
+    service.build_database(db=mock_db)
+
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    other_release = DiscogsRelease(
+        id=1,
+        title="Another Release",
+        year=2023,
+        barcode="123",
+        artists=release.artists,
+    )
+
+    rows = service.upsert_releases_and_related_data(
+        [release, other_release], db=mock_db
+    )
+    assert [row["discogs_release_id"] for row in rows] == [release.id, 1]
+
+    assert mock_db["discogs_releases"].count == 2
+    assert mock_db["vinyl_records"].count == 2
+    assert mock_db["artists"].count == len(release.artists)
+    assert mock_db["vinyl_records_artists"].count == 2 * len(release.artists)
+    assert mock_db["tracks"].count == len(release.tracks)
+
+    # Upserting the same releases again updates the existing rows.
+    new_rows = service.upsert_releases_and_related_data(
+        [release, other_release], db=mock_db
+    )
+    assert [row["id"] for row in new_rows] == [row["id"] for row in rows]
+    assert new_rows[0]["created_at"] == rows[0]["created_at"]
+
+    assert mock_db["vinyl_records"].count == 2
+    assert mock_db["tracks"].count == len(release.tracks)
+
+
+def test_upsert_releases_and_related_data__compressed(mock_db):
+    service.build_database(db=mock_db)
+
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    service.upsert_releases_and_related_data([release], db=mock_db)
+
+    compression.compress_table(mock_db, "discogs_releases", pk="id")
+
+    # Releases upserted after the table is compressed are compressed too.
+    other_release = DiscogsRelease.from_data(
+        {**discogs_responses.DISCOGS_RELEASE, "id": 1}
+    )
+    service.upsert_releases_and_related_data([other_release], db=mock_db)
+
+    compressor = compression.DataCompressor(mock_db.conn)
+    for row in mock_db["discogs_releases"].rows:
+        assert compression.is_compressed(row["data"])
+        assert compressor.load(row["data"])["title"] == release.title
+
+    assert mock_db.execute(
+        "select json_extract(decompress_data(data), '$.id') "
+        "from discogs_releases order by id"
+    ).fetchall() == [(1,), (release.id,)]
+
+    # Once decompressed, releases upserted afterwards are plain JSON text.
+    compression.decompress_table(mock_db, "discogs_releases", pk="id")
+
+    new_release = DiscogsRelease.from_data(
+        {**discogs_responses.DISCOGS_RELEASE, "id": 2}
+    )
+    service.upsert_releases_and_related_data([new_release], db=mock_db)
+
+    for row in mock_db["discogs_releases"].rows:
+        assert json.loads(row["data"])["title"] == release.title
+
+
+def test_upsert_releases_and_related_data__compressed_unchanged(mock_db):
+    service.build_database(db=mock_db)
+
+    release = DiscogsRelease.from_data(discogs_responses.DISCOGS_RELEASE)
+    service.upsert_releases_and_related_data([release], db=mock_db)
+    content_hash = mock_db["discogs_releases"].get(release.id)["content_hash"]
+
+    compression.compress_table(mock_db, "discogs_releases", pk="id")
+    compression.compress_table(mock_db, "discogs_releases", pk="id")
+
+    # The content hash is of the uncompressed data, so the compressed, and
+    # recompressed, release still matches an unchanged copy of itself.
+    record = service.transform_discogs_entity(
+        release, compression.DataCompressor(mock_db.conn)
+    )
+    assert compression.is_compressed(record["data"])
+    assert record["content_hash"] == content_hash
+
+    total_changes = mock_db.conn.total_changes
+    with mock_db.conn:
+        upsert_records(
+            [record],
+            table=mock_db["discogs_releases"],
+            hash_column=CONTENT_HASH_COLUMN,
+        )
+    assert mock_db.conn.total_changes == total_changes
+
+
+@responses.activate
+def test_get_discogs_releases_by_isbns():
+    release_data = discogs_responses.DISCOGS_RELEASE
+    isbn = release_data["identifiers"][0]["value"]
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/database/search",
+            json={
+                "pagination": {
+                    "per_page": 50,
+                    "pages": 1,
+                    "page": 1,
+                    "urls": {},
+                },
+                "results": [
+                    {**discogs_responses.DISCOGS_SEARCH_RESULT_ONE, "id": 1}
+                ],
+            },
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/releases/1",
+            json=release_data,
+        )
+    )
+
+    releases = service.get_discogs_releases_by_isbns(
+        [isbn, isbn, "404"], concurrency=2
+    )
+    assert list(releases.keys()) == [isbn, "404"]
+    assert releases[isbn].id == release_data["id"]
+    assert releases["404"] is None
+
+
+@responses.activate
+def test_get_discogs_release_by_isbn():
+    release_data = discogs_responses.DISCOGS_RELEASE
+    isbn = release_data["identifiers"][0]["value"]
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/database/search",
+            json={
+                "pagination": {
+                    "per_page": 10,
+                    "pages": 1,
+                    "page": 1,
+                    "urls": {},
+                },
+                "results": [
+                    {"id": 1, "type": "release", "barcode": ["0 12345 67890"]},
+                    {"id": 2, "type": "release"},
+                    {"id": 3, "type": "release", "barcode": [f" {isbn} "]},
+                ],
+            },
+        )
+    )
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/releases/3",
+            json=release_data,
+        )
+    )
+
+    release = service.get_discogs_release_by_isbn(isbn)
+    assert release is not None
+    assert release.id == release_data["id"]
+
+    # Only the search and the winning release are requested.
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_discogs_release_by_isbn__dump_index(tmp_path):
+    index = DiscogsDumpIndex(path=tmp_path / "index.db")
+    index.import_dump(
+        discogs_responses.write_dump(
+            tmp_path / "discogs_releases.xml.gz",
+            discogs_responses.RELEASES_DUMP,
+        )
+    )
+
+    # The release is in the dump index, so Discogs' API isn't used.
+    release = service.get_discogs_release_by_isbn("733044", index=index)
+    assert release is not None
+    assert release.id == 1
+    assert len(responses.calls) == 0
@@ -2,6 +2,16 @@ import pytest
 from click.testing import CliRunner
 from sqlite_utils import Database
 
+from librarian.integrations.discogs.dump import get_discogs_dump_index
+from librarian.integrations.discogs.service import (
+    get_discogs_client,
+    get_discogs_rate_limiter,
+)
+from librarian.integrations.genius.service import get_genius_client
+from librarian.integrations.openlibrary.dump import get_openlibrary_dump_index
+from librarian.integrations.openlibrary.service import get_openlibrary_client
+from librarian.settings import Settings
+
 
 @pytest.fixture
 def cli_runner() -> CliRunner:
@@ -11,3 +21,30 @@ def cli_runner() -> CliRunner:
 @pytest.fixture
 def mock_db() -> Database:
     return Database(memory=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_discogs_rate_limiter():
+    # Each test gets a full Discogs rate limit.
+    get_discogs_rate_limiter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_http_clients():
+    # Each test gets its own process wide clients.
+    get_discogs_client.cache_clear()
+    get_genius_client.cache_clear()
+    get_openlibrary_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_dump_indexes(tmp_path, monkeypatch):
+    # Tests don't use the dump indexes unless they import a dump.
+    monkeypatch.setattr(
+        Settings, "OPENLIBRARY_DUMP_INDEX_PATH", tmp_path / "openlibrary.db"
+    )
+    monkeypatch.setattr(
+        Settings, "DISCOGS_DUMP_INDEX_PATH", tmp_path / "discogs.db"
+    )
+    get_discogs_dump_index.cache_clear()
+    get_openlibrary_dump_index.cache_clear()
@@ -1,4 +1,6 @@
 # ruff: noqa: E501
+import gzip
+from pathlib import Path
 
 DISCOGS_RELEASE_ARTIST = {
     "anv": "",
@@ -357,3 +359,75 @@ DISCOGS_SEARCH_RESULT_TWO = {
     "type": "release",
     "id": 3058947,
 }
+
+RELEASES_DUMP = """<releases>
+<release id="1" status="Accepted">
+  <images>
+    <image height="600" type="primary" uri="" uri150="" width="600"/>
+  </images>
+  <artists>
+    <artist>
+      <id>1</id><name>The Persuader</name><anv/><join/><role/><tracks/>
+    </artist>
+  </artists>
+  <title>Stockholm</title>
+  <extraartists>
+    <artist>
+      <id>239</id><name>Jesper Dahlb&#228;ck</name><anv/><join/>
+      <role>Music By [All Tracks By]</role><tracks/>
+    </artist>
+  </extraartists>
+  <genres><genre>Electronic</genre></genres>
+  <styles><style>Deep House</style></styles>
+  <country>Sweden</country>
+  <released>1999-03-00</released>
+  <tracklist>
+    <track>
+      <position>A</position><title>&#214;stermalm</title>
+      <duration>4:45</duration>
+    </track>
+    <track>
+      <position>B1</position><title>Vasastaden</title>
+      <duration>6:11</duration>
+    </track>
+  </tracklist>
+  <identifiers>
+    <identifier type="Barcode" value="7 33 04 4" description="Text"/>
+    <identifier type="Matrix / Runout" value="SS-001 A"/>
+  </identifiers>
+</release>
+<release id="2" status="Accepted">
+  <artists>
+    <artist><id>2</id><name>Mr. James Barth</name></artist>
+  </artists>
+  <title>Knockin' Boots Vol 2 Of 2</title>
+  <released>Unknown</released>
+  <identifiers/>
+</release>
+</releases>
+"""
+
+ARTISTS_DUMP = """<artists>
+<artist>
+  <images>
+    <image height="450" type="primary" uri="" uri150="" width="600"/>
+  </images>
+  <id>1</id>
+  <name>The Persuader</name>
+  <realname>Jesper Dahlb&#228;ck</realname>
+  <profile>Swedish techno producer.</profile>
+  <namevariations><name>Persuader</name></namevariations>
+  <members><id>239</id><name id="239">Jesper Dahlb&#228;ck</name></members>
+</artist>
+</artists>
+"""
+
+
+def write_dump(path: Path, dump: str) -> Path:
+    """
+    Write a gzipped dump, in the same format as Discogs'.
+    """
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(dump)
+
+    return path
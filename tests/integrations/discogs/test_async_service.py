@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+
+from librarian.integrations.discogs import async_service
+
+from . import discogs_responses
+
+
+def build_client(handler) -> async_service.AsyncDiscogsClient:
+    return async_service.AsyncDiscogsClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+
+def test_async_discogs_client__get_release():
+    release_id = discogs_responses.DISCOGS_RELEASE["id"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == f"/releases/{release_id}"
+        return httpx.Response(
+            200,
+            json=discogs_responses.DISCOGS_RELEASE,
+            headers={"X-Discogs-Ratelimit-Remaining": "0"},
+        )
+
+    client = build_client(handler)
+    release = asyncio.run(client.get_release(release_id))
+
+    assert release.id == release_id
+    # The shared rate limiter was updated from the response's headers.
+    assert client.rate_limiter is not None
+    assert client.rate_limiter.tokens < 1
+
+
+def test_async_discogs_client__search():
+    pages = {
+        "1": {
+            "pagination": {
+                "urls": {
+                    "next": "https://api.discogs.com/database/search?page=2"
+                }
+            },
+            "results": [discogs_responses.DISCOGS_SEARCH_RESULT_ONE],
+        },
+        "2": {
+            "pagination": {"urls": {}},
+            "results": [discogs_responses.DISCOGS_SEARCH_RESULT_TWO],
+        },
+    }
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, json=pages[request.url.params.get("page", "1")]
+        )
+
+    async def search(**kwargs):
+        client = build_client(handler)
+        return [result.id async for result in client.search(**kwargs)]
+
+    assert asyncio.run(search(barcode="123")) == [
+        discogs_responses.DISCOGS_SEARCH_RESULT_ONE["id"],
+        discogs_responses.DISCOGS_SEARCH_RESULT_TWO["id"],
+    ]
+    assert requests[0].url.params["barcode"] == "123"
+
+    # The second page isn't requested once the limit has been reached.
+    requests.clear()
+    assert len(asyncio.run(search(barcode="123", limit=1))) == 1
+    assert len(requests) == 1
+    assert requests[0].url.params["per_page"] == "1"
@@ -48,6 +48,15 @@ def test_discogs_artist__from_data():
     assert len(artist.members) == len(payload["members"])
 
 
+def test_discogs_artist__from_data__no_name_variations():
+    payload = deepcopy(discogs_responses.DISCOGS_ARTIST)
+    del payload["namevariations"]
+
+    # Artists without name variations get an empty list rather than None.
+    artist = data.DiscogsArtist.from_data(payload)
+    assert artist.name_variations == []
+
+
 def test_discogs_release_track_artist__from_data():
     payload = deepcopy(discogs_responses.DISCOGS_RELEASE_TRACK_ARTIST)
 
@@ -0,0 +1,160 @@
+import io
+
+import pytest
+
+from librarian.integrations.discogs import dump
+from librarian.settings import Settings
+
+from . import discogs_responses
+
+
+@pytest.fixture
+def dump_paths(tmp_path):
+    return [
+        discogs_responses.write_dump(
+            tmp_path / "discogs_releases.xml.gz",
+            discogs_responses.RELEASES_DUMP,
+        ),
+        discogs_responses.write_dump(
+            tmp_path / "discogs_artists.xml.gz",
+            discogs_responses.ARTISTS_DUMP,
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "value, expected_result",
+    (("1999-03-00", 1999), ("2001", 2001), ("Unknown", 0), (None, 0)),
+)
+def test_format_year(value, expected_result):
+    assert dump.format_year(value) == expected_result
+
+
+def test_iter_dump():
+    file = io.BytesIO(discogs_responses.RELEASES_DUMP.encode("utf-8"))
+
+    entities = list(dump.iter_dump(file))
+
+    assert [(type, data["id"]) for type, data in entities] == [
+        ("release", 1),
+        ("release", 2),
+    ]
+
+    _, release_data = entities[0]
+    assert release_data["year"] == 1999
+    assert release_data["styles"] == ["Deep House"]
+    assert release_data["artists"][0]["name"] == "The Persuader"
+    assert [track["title"] for track in release_data["tracklist"]] == [
+        "Östermalm",
+        "Vasastaden",
+    ]
+    assert dump.get_barcodes(release_data) == ["733044"]
+
+
+def test_iter_dump_elements__clears_elements():
+    file = io.BytesIO(discogs_responses.RELEASES_DUMP.encode("utf-8"))
+
+    elements = list(dump.iter_dump_elements(file))
+
+    # The elements are cleared once the next one has been read.
+    assert [element.tag for element in elements] == ["release", "release"]
+    assert all(len(element) == 0 for element in elements)
+
+
+def test_discogs_dump_index__import_dump(tmp_path, dump_paths):
+    index = dump.DiscogsDumpIndex(path=tmp_path / "index.db")
+
+    counts = [
+        index.import_dump(dump_path, batch_size=1) for dump_path in dump_paths
+    ]
+
+    assert counts == [2, 1]
+    assert index.releases.count == 2
+    assert index.artists.count == 1
+    assert index.barcodes.count == 1
+
+    # Importing the dump again replaces the entities.
+    index.import_dump(dump_paths[0])
+    assert index.releases.count == 2
+
+
+def test_discogs_dump_index__lookups(tmp_path, dump_paths):
+    index = dump.DiscogsDumpIndex(path=tmp_path / "index.db")
+    for dump_path in dump_paths:
+        index.import_dump(dump_path)
+
+    releases = index.get_releases_by_barcode("733-044")
+    assert [release.id for release in releases] == [1]
+    assert releases[0].title == "Stockholm"
+    assert releases[0].year == 1999
+    assert releases[0].barcode == "7 33 04 4"
+    assert [track.duration for track in releases[0].tracks] == [285, 371]
+
+    assert index.get_releases_by_barcode("0000") == []
+    assert index.get_releases_by_barcode("") == []
+
+    # Only whole barcodes are matched.
+    assert index.get_releases_by_barcode("3304") == []
+
+    release = index.get_release(2)
+    assert release is not None
+    assert release.year == 0
+    assert release.barcode is None
+
+    artist = index.get_artist(1)
+    assert artist is not None
+    assert artist.name_variations == ["Persuader"]
+    assert [member.name for member in artist.members] == ["Jesper Dahlbäck"]
+
+    assert index.get_artist(2) is None
+
+
+@pytest.mark.parametrize(
+    "barcode, expected_result",
+    (
+        ("012345678905", ["012345678905", "0012345678905"]),
+        ("0012345678905", ["0012345678905", "012345678905"]),
+        ("9780140328721", ["9780140328721"]),
+        ("733044", ["733044"]),
+    ),
+)
+def test_get_barcode_variants(barcode, expected_result):
+    assert dump.get_barcode_variants(barcode) == expected_result
+
+
+def test_discogs_dump_index__barcodes(tmp_path):
+    index = dump.DiscogsDumpIndex(path=tmp_path / "index.db")
+
+    def save_release(barcode: str):
+        index.save(
+            [
+                (
+                    "release",
+                    {
+                        **discogs_responses.DISCOGS_RELEASE,
+                        "identifiers": [{"type": "Barcode", "value": barcode}],
+                    },
+                )
+            ]
+        )
+
+    # A UPC-A matches its EAN-13, and the other way around.
+    save_release("0 12345 67890 5")
+    assert len(index.get_releases_by_barcode("0012345678905")) == 1
+    assert len(index.get_releases_by_barcode("012345678905")) == 1
+
+    # Re-importing a release replaces its barcodes.
+    save_release("5 034504 843646")
+    assert index.get_releases_by_barcode("012345678905") == []
+    assert len(index.get_releases_by_barcode("5034504843646")) == 1
+    assert index.barcodes.count == 1
+
+
+def test_get_discogs_dump_index(dump_paths):
+    assert dump.get_discogs_dump_index() is None
+
+    index = dump.DiscogsDumpIndex(Settings.DISCOGS_DUMP_INDEX_PATH)
+    index.import_dump(dump_paths[0])
+    dump.get_discogs_dump_index.cache_clear()
+
+    assert dump.get_discogs_dump_index() is not None
@@ -7,6 +7,7 @@ from responses.matchers import query_param_matcher
 
 from librarian.integrations.discogs import service
 from librarian.settings import Settings
+from librarian.utils.rate_limiter import TokenBucket
 
 from . import discogs_responses
 
@@ -161,3 +162,75 @@ def test_discogs_client__search(query, type, barcode, request_query):
     first_result, second_result = results
     assert first_result.id == result_one["id"]
     assert second_result.id == result_two["id"]
+
+
+@responses.activate
+def test_discogs_client__search__limit():
+    responses.add(
+        responses.Response(
+            method="GET",
+            url="https://api.discogs.com/database/search",
+            json={
+                "pagination": {
+                    "per_page": 2,
+                    "pages": 2,
+                    "page": 1,
+                    "urls": {"next": "https://api.discogs.com/page-2"},
+                },
+                "results": [
+                    discogs_responses.DISCOGS_SEARCH_RESULT_ONE,
+                    discogs_responses.DISCOGS_SEARCH_RESULT_TWO,
+                ],
+            },
+            match=[
+                query_param_matcher(
+                    {"barcode": "123", "per_page": 2}, strict_match=True
+                )
+            ],
+        )
+    )
+
+    client = service.DiscogsClient()
+    results = list(client.search(barcode="123", limit=2))
+
+    # The second page isn't requested once the limit has been reached.
+    assert len(results) == 2
+    assert len(responses.calls) == 1
+    assert results[1].barcodes == ["5 034504 843646"]
+
+    assert list(client.search(barcode="123", limit=0)) == []
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_discogs_client__update_rate_limit():
+    url = "https://api.discogs.com/example"
+
+    responses.add(
+        responses.Response(
+            method="GET",
+            url=url,
+            headers={
+                "X-Discogs-Ratelimit": "25",
+                "X-Discogs-Ratelimit-Used": "22",
+                "X-Discogs-Ratelimit-Remaining": "3",
+            },
+        )
+    )
+
+    rate_limiter = TokenBucket(rate=60, per=60)
+    client = service.DiscogsClient(rate_limiter=rate_limiter)
+    client.request(method="GET", url=url)
+
+    assert rate_limiter.capacity == 25
+    assert rate_limiter.tokens == pytest.approx(3, abs=0.1)
+
+
+def test_get_discogs_client():
+    client = service.get_discogs_client()
+    assert service.get_discogs_client() is client
+
+    other_client = service.get_discogs_client(pool_size=2)
+    assert other_client is not client
+    adapter = other_client.session.get_adapter(other_client.base_url)
+    assert adapter._pool_maxsize == 2  # type: ignore
@@ -0,0 +1,24 @@
+import asyncio
+
+import httpx
+
+from librarian.integrations.genius import async_service
+from librarian.settings import Settings
+
+from . import genius_responses
+
+
+def test_async_genius_client__search(mocker):
+    mocker.patch.object(Settings, "GENIUS_CLIENT_ACCESS_TOKEN", "abc123")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "Bearer abc123"
+        assert request.url.params["q"] == "Kendrick Lamar"
+        return httpx.Response(200, json=genius_responses.GENIUS_SEARCH)
+
+    client = async_service.AsyncGeniusClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    hits = asyncio.run(client.search("Kendrick Lamar"))
+
+    assert len(hits) == len(genius_responses.GENIUS_SEARCH["response"]["hits"])
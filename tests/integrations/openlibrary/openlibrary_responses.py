@@ -1,4 +1,7 @@
 # ruff: noqa: E501
+import gzip
+import json
+from pathlib import Path
 
 AUTHOR_RESPONSE = {
     "remote_ids": {
@@ -244,3 +247,36 @@ BOOK_RESPONSE = {
         "value": "2023-02-11T04:06:46.427081",
     },
 }
+
+BOOKS_API_RESPONSE = {
+    "ISBN:0140328726": {
+        "bib_key": "ISBN:0140328726",
+        "info_url": "https://openlibrary.org/books/OL7353617M/Fantastic_Mr._Fox",
+        "preview": "borrow",
+        "preview_url": "https://archive.org/details/fantasticmrfoxpu00roal",
+        "thumbnail_url": "https://covers.openlibrary.org/b/id/8739161-S.jpg",
+        "details": BOOK_RESPONSE,
+    },
+}
+
+
+def write_dump(path: Path, *entities: dict) -> Path:
+    """
+    Write entities to a gzipped dump, in the same format as OpenLibrary's.
+    """
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for entity in entities:
+            file.write(
+                "\t".join(
+                    [
+                        entity["type"]["key"],
+                        entity["key"],
+                        str(entity.get("revision", 1)),
+                        "2023-01-01T00:00:00.000000",
+                        json.dumps(entity),
+                    ]
+                )
+                + "\n"
+            )
+
+    return path
@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+
+from librarian.integrations.openlibrary import async_service
+
+from . import openlibrary_responses
+
+
+def build_client(handler) -> async_service.AsyncOpenLibraryClient:
+    return async_service.AsyncOpenLibraryClient(
+        client=httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), follow_redirects=True
+        )
+    )
+
+
+def test_async_openlibrary_client__get_book_from_isbn():
+    isbn = "9780140328721"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == f"/isbn/{isbn}.json":
+            return httpx.Response(
+                302, headers={"Location": "/books/OL7353617M.json"}
+            )
+
+        return httpx.Response(200, json=openlibrary_responses.BOOK_RESPONSE)
+
+    client = build_client(handler)
+    book = asyncio.run(client.get_book_from_isbn(isbn))
+
+    assert book.title == openlibrary_responses.BOOK_RESPONSE["title"]
+
+
+def test_async_openlibrary_client__get_books_from_isbns():
+    isbns = list(openlibrary_responses.BOOKS_API_RESPONSE.keys())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["jscmd"] == "details"
+        return httpx.Response(
+            200, json=openlibrary_responses.BOOKS_API_RESPONSE
+        )
+
+    client = build_client(handler)
+    books = asyncio.run(
+        client.get_books_from_isbns(
+            [isbn.removeprefix("ISBN:") for isbn in isbns] + ["404"]
+        )
+    )
+
+    assert len(books) == len(isbns)
+    assert "404" not in books
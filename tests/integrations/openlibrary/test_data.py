@@ -12,6 +12,7 @@ from . import openlibrary_responses
     "value, expected_result",
     (
         ("September 19, 1986", datetime.date(1986, 9, 19)),
+        ("19 September 1986", datetime.date(1986, 9, 19)),
         ("September 1986", datetime.date(1986, 9, 1)),
         ("1986", datetime.date(1986, 1, 1)),
         ("", None),
@@ -131,6 +132,9 @@ def test_openlibrary_link__from_data():
     }
     link = data.OpenLibraryLink.from_data(payload)
 
+    # Parsing doesn't modify the payload.
+    assert "type" in payload
+
     assert link.url == payload["url"]
     assert link.title == payload["title"]
     assert link.type_key == "link"
@@ -0,0 +1,157 @@
+import pytest
+
+from librarian.integrations.openlibrary import dump
+from librarian.settings import Settings
+
+from . import openlibrary_responses
+
+
+@pytest.fixture
+def dump_path(tmp_path):
+    return openlibrary_responses.write_dump(
+        tmp_path / "ol_dump_latest.txt.gz",
+        openlibrary_responses.BOOK_RESPONSE,
+        openlibrary_responses.WORK_RESPONSE,
+        openlibrary_responses.AUTHOR_RESPONSE,
+    )
+
+
+@pytest.mark.parametrize(
+    "isbn, expected_result",
+    (
+        ("0140328726", "0140328726"),
+        ("978-0-14-032872-1", "9780140328721"),
+        ("0 8044 2957 x", "080442957X"),
+    ),
+)
+def test_normalize_isbn(isbn, expected_result):
+    assert dump.normalize_isbn(isbn) == expected_result
+
+
+def test_parse_dump_line():
+    line = (
+        "/type/edition\t/books/OL1M\t3\t2023-01-01T00:00:00\t"
+        '{"key": "/books/OL1M", "isbn_13": ["978-0-14-032872-1"]}\n'
+    )
+
+    entity = dump.parse_dump_line(line)
+
+    assert entity == dump.DumpEntity(
+        key="OL1M",
+        type="edition",
+        data='{"key": "/books/OL1M", "isbn_13": ["978-0-14-032872-1"]}',
+        isbns=["9780140328721"],
+        last_modified="2023-01-01T00:00:00",
+    )
+
+
+@pytest.mark.parametrize(
+    "line",
+    (
+        "/type/redirect\t/books/OL1M\t1\t2023-01-01\t{}\n",
+        "/type/edition\t/books/OL1M\t1\t2023-01-01\tnot json\n",
+        "/type/edition\tnot a key\t1\t2023-01-01\t{}\n",
+        "/type/edition\t/books/OL1M\n",
+    ),
+)
+def test_parse_dump_line__skipped(line):
+    assert dump.parse_dump_line(line) is None
+
+
+def test_partition_dump_lines():
+    lines = [
+        "/type/edition\t/books/OL1M\t1\t2023-01-01\t{}\n",
+        "/type/work\t/works/OL1W\t1\t2023-01-01\t{}\n",
+        "/type/redirect\t/books/OL2M\t1\t2023-01-01\t{}\n",
+    ]
+
+    edition_lines, entities = dump.partition_dump_lines(lines)
+
+    # Only the editions are left to be decoded.
+    assert edition_lines == lines[:1]
+    assert [entity.key for entity in entities] == ["OL1W"]
+
+
+def test_read_dump_chunks(dump_path):
+    with dump.open_dump(dump_path) as file:
+        chunks = list(dump.read_dump_chunks(file, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_openlibrary_dump_index__import_dump(tmp_path, dump_path, processes):
+    index = dump.OpenLibraryDumpIndex(path=tmp_path / "index.db")
+
+    count = index.import_dump(dump_path, processes=processes, chunk_size=2)
+
+    assert count == 3
+    assert index.entities.count == 3
+    assert index.isbns.count == 2
+
+    # Importing the dump again replaces the entities.
+    index.import_dump(dump_path, processes=processes)
+    assert index.entities.count == 3
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_openlibrary_dump_index__shared_isbn(tmp_path, processes):
+    def edition_line(key: str, last_modified: str) -> str:
+        return (
+            f"/type/edition\t/books/{key}\t1\t{last_modified}\t"
+            f'{{"key": "/books/{key}", "isbn_10": ["0140328726"]}}\n'
+        )
+
+    lines = [
+        edition_line("OL2M", "2023-01-01T00:00:00"),
+        edition_line("OL3M", "2024-01-01T00:00:00"),
+        edition_line("OL1M", "2024-01-01T00:00:00"),
+        edition_line("OL4M", "2022-01-01T00:00:00"),
+    ]
+
+    # The ISBN goes to the most recently modified edition, then the lowest
+    # key, however the editions are ordered in the dump.
+    for name, order in (("forwards", lines), ("backwards", lines[::-1])):
+        path = tmp_path / f"{name}.txt"
+        path.write_text("".join(order), encoding="utf-8")
+
+        index = dump.OpenLibraryDumpIndex(path=tmp_path / f"{name}.db")
+        index.import_dump(path, processes=processes, chunk_size=1)
+
+        assert index.isbns.get("0140328726")["key"] == "OL1M"
+
+
+def test_openlibrary_dump_index__lookups(tmp_path, dump_path):
+    index = dump.OpenLibraryDumpIndex(path=tmp_path / "index.db")
+    index.import_dump(dump_path, processes=1)
+
+    book = index.get_book_from_isbn("978-0-14-032872-1")
+    assert book is not None
+    assert book.key == "OL7353617M"
+
+    assert index.get_book("OL7353617M") == book
+    assert index.get_book_from_isbn("0000000000") is None
+
+    books = index.get_books_from_isbns(["0140328726", "0000000000"])
+    assert list(books.keys()) == ["0140328726"]
+
+    work = index.get_work("OL45804W")
+    assert work is not None
+    assert work.title == openlibrary_responses.WORK_RESPONSE["title"]
+
+    author = index.get_author("OL34184A")
+    assert author is not None
+    assert author.name == openlibrary_responses.AUTHOR_RESPONSE["name"]
+
+    # The keys are looked up by type.
+    assert index.get_work("OL34184A") is None
+
+
+def test_get_openlibrary_dump_index(tmp_path, dump_path):
+    assert dump.get_openlibrary_dump_index() is None
+
+    index = dump.OpenLibraryDumpIndex(Settings.OPENLIBRARY_DUMP_INDEX_PATH)
+    index.import_dump(dump_path, processes=1)
+    dump.get_openlibrary_dump_index.cache_clear()
+
+    assert dump.get_openlibrary_dump_index() is not None
@@ -1,4 +1,5 @@
 import responses
+from responses.matchers import query_param_matcher
 
 from librarian.integrations.openlibrary import service
 
@@ -35,6 +36,36 @@ def test_open_library_client__get_book_from_isbn():
     assert book.title == response_data["title"]
 
 
+@responses.activate
+def test_open_library_client__get_books_from_isbns():
+    response_data = openlibrary_responses.BOOKS_API_RESPONSE.copy()
+
+    response = responses.Response(
+        method="GET",
+        url="https://openlibrary.org/api/books",
+        json=response_data,
+        match=[
+            query_param_matcher(
+                {
+                    "bibkeys": "ISBN:0140328726,ISBN:0000000000",
+                    "format": "json",
+                    "jscmd": "details",
+                }
+            )
+        ],
+    )
+    responses.add(response)
+
+    client = service.OpenLibraryClient()
+    books = client.get_books_from_isbns(
+        isbns=["0140328726", "0000000000", "0140328726"]
+    )
+
+    assert len(responses.calls) == 1
+    assert list(books.keys()) == ["0140328726"]
+    assert books["0140328726"].title == "Fantastic Mr. Fox"
+
+
 @responses.activate
 def test_open_library_client__get_author():
     response_data = openlibrary_responses.AUTHOR_RESPONSE.copy()
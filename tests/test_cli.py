@@ -7,3 +7,14 @@ def test_cli(cli_runner):
     result = cli_runner.invoke(cli.cli, ["--version"])
     assert result.exit_code == 0
     assert result.output == f"cli, version {version('librarian')}\n"
+
+
+def test_cli__lazy_commands(cli_runner):
+    result = cli_runner.invoke(cli.cli, ["--help"])
+    assert result.exit_code == 0
+    assert "books" in result.output
+    assert "vinyl" in result.output
+
+    result = cli_runner.invoke(cli.cli, ["books", "--help"])
+    assert result.exit_code == 0
+    assert "Inventory the library's books collection." in result.output
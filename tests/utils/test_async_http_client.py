@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+
+from librarian.utils import async_http_client, http_client
+from librarian.utils.rate_limiter import TokenBucket
+
+
+def build_client(handler, **kwargs) -> async_http_client.AsyncHttpClient:
+    return async_http_client.AsyncHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("method", ("GET", "POST", "PATCH", "DELETE", "PUT"))
+def test_async_http_client__request(method):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    async def main():
+        async with build_client(handler) as client:
+            return await getattr(client, method.lower())(
+                "https://example.com/", params={"a": "b"}
+            )
+
+    request, response = asyncio.run(main())
+    assert response.status_code == 200
+
+    assert requests[0].method == method
+    assert requests[0].url == "https://example.com/?a=b"
+    assert requests[0].headers["User-Agent"] == http_client.get_user_agent()
+
+
+@pytest.mark.parametrize(
+    "max_retries, expected_calls, expected_status_code",
+    ((0, 1, 503), (2, 3, 200)),
+)
+def test_async_http_client__retries(
+    max_retries, expected_calls, expected_status_code
+):
+    status_codes = [503, 429, 200]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(status_codes[len(calls) - 1])
+
+    rate_limiter = TokenBucket(rate=10, per=1)
+
+    async def main():
+        client = build_client(
+            handler,
+            max_retries=max_retries,
+            backoff_factor=0,
+            rate_limiter=rate_limiter,
+        )
+        _, response = await client.get("https://example.com/")
+        return response
+
+    response = asyncio.run(main())
+    assert response.status_code == expected_status_code
+    assert len(calls) == expected_calls
+
+    # Every attempt took a token from the rate limiter.
+    assert rate_limiter.tokens < 10 - expected_calls + 1
+
+
+def test_build_async_client():
+    client = async_http_client.build_async_client(timeout=(1.0, 2.0))
+
+    assert client.timeout.connect == 1.0
+    assert client.timeout.read == 2.0
+    assert client.timeout.pool is None
+    assert client.follow_redirects is True
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from librarian.utils import compression
+
+DOCUMENTS = [
+    {
+        "id": i,
+        "title": f"Release {i}",
+        "artists": [{"id": i // 5, "name": f"Artist {i // 5}", "role": ""}],
+        "tracklist": [
+            {"position": f"A{n}", "title": f"Track {n}", "duration": "3:00"}
+            for n in range(1, 6)
+        ],
+    }
+    for i in range(20)
+]
+
+
+def test_train_dictionary():
+    dictionary = compression.train_dictionary(
+        [json.dumps(document) for document in DOCUMENTS]
+    )
+
+    assert b'"tracklist": ' in dictionary
+    assert b'"duration": ' in dictionary
+    # Fragments that are only in one document are left out.
+    assert b'"Release 1"' not in dictionary
+
+    assert len(compression.train_dictionary(["{}"] * 2, size=0)) == 0
+
+
+@pytest.mark.parametrize("dictionary", [None, b'"title": "tracklist": '])
+def test_compress(dictionary):
+    text = json.dumps(DOCUMENTS[0])
+
+    value = compression.compress(text, dictionary, dictionary_id=1)
+    assert compression.is_compressed(value)
+    assert compression.is_compressed(text) is False
+
+    assert compression.decompress(value, dictionary) == text
+
+
+def test_data_compressor(mock_db):
+    compressor = compression.DataCompressor(mock_db.conn)
+
+    # Nothing is compressed until the table has a dictionary.
+    assert compressor.encode("items", DOCUMENTS[0]) == json.dumps(DOCUMENTS[0])
+    assert compressor.has_dictionaries_table() is False
+
+    dictionary_id = compressor.add_dictionary(
+        "items",
+        compression.train_dictionary(json.dumps(d) for d in DOCUMENTS),
+    )
+
+    value = compressor.encode("items", DOCUMENTS[0])
+    assert compression.is_compressed(value)
+    assert compressor.load(value) == DOCUMENTS[0]
+    assert compressor.encode("others", "{}") == "{}"
+
+    # The dictionaries are read from the database by a new compressor.
+    compressor = compression.DataCompressor(mock_db.conn)
+    assert compressor.get_latest_dictionary("items")[0] == dictionary_id
+    assert compressor.load(value) == DOCUMENTS[0]
+    assert compressor.load('{"id": 1}') == {"id": 1}
+    assert compressor.decode(None) is None
+
+    with pytest.raises(ValueError):
+        compressor.get_dictionary(dictionary_id + 1)
+
+
+def test_register_functions(mock_db):
+    compression.register_functions(mock_db.conn)
+
+    compressor = compression.DataCompressor(mock_db.conn)
+    compressor.add_dictionary("items", b'"title": ')
+
+    row = mock_db.execute(
+        "select json_extract(decompress_data(?), '$.title'), "
+        "decompress_data(?)",
+        [compressor.encode("items", DOCUMENTS[0]), '{"id": 1}'],
+    ).fetchone()
+    assert row == ("Release 0", '{"id": 1}')
+
+
+def test_compress_table(mock_db):
+    table = mock_db["items"]
+    table.insert_all(
+        [{"id": d["id"], "data": json.dumps(d)} for d in DOCUMENTS], pk="id"
+    )
+    plain_size = sum(len(row["data"]) for row in table.rows)
+
+    assert compression.compress_table(mock_db, "items", pk="id", batch_size=3)
+    assert all(compression.is_compressed(row["data"]) for row in table.rows)
+    assert sum(len(row["data"]) for row in table.rows) < plain_size / 2
+
+    compressor = compression.DataCompressor(mock_db.conn)
+    assert [compressor.load(row["data"]) for row in table.rows] == DOCUMENTS
+    value = next(table.rows)["data"]
+
+    # Compressing again only rewrites the rows with the new dictionary.
+    assert compression.compress_table(mock_db, "items", pk="id") == 20
+
+    assert compression.decompress_table(mock_db, "items", pk="id") == 20
+    assert [json.loads(row["data"]) for row in table.rows] == DOCUMENTS
+    assert compression.decompress_table(mock_db, "items", pk="id") == 0
+
+    # The table's data isn't compressed after it's decompressed, but the old
+    # values can still be decoded.
+    compressor = compression.DataCompressor(mock_db.conn)
+    assert compressor.encode("items", DOCUMENTS[0]) == json.dumps(DOCUMENTS[0])
+    assert compressor.load(value) == DOCUMENTS[0]
+
+    # Until it's compressed again.
+    assert compression.compress_table(mock_db, "items", pk="id") == 20
+
+
+def test_compress_table__empty(mock_db):
+    mock_db["items"].create({"id": int, "data": str}, pk="id")
+
+    assert compression.compress_table(mock_db, "items", pk="id") == 0
+    assert compression.DataCompressor(
+        mock_db.conn
+    ).has_dictionaries_table() is (False)
@@ -0,0 +1,215 @@
+import datetime
+
+import pytest
+
+from librarian.utils import database
+
+
+@pytest.mark.parametrize("preset", ["import", "serve"])
+def test_get_database(preset, tmp_path):
+    db = database.get_database(tmp_path / "test.db", preset=preset)
+    pragmas = database.PRAGMA_PRESETS[preset]
+
+    assert db.execute("pragma journal_mode").fetchone()[0] == "wal"
+    assert db.execute("pragma cache_size").fetchone()[0] == (
+        pragmas["cache_size"]
+    )
+    assert db.execute("pragma mmap_size").fetchone()[0] == pragmas["mmap_size"]
+    assert db.execute("pragma busy_timeout").fetchone()[0] == 5_000
+    # SQLite reports the synchronous and temp_store settings as numbers.
+    assert db.execute("pragma synchronous").fetchone()[0] == (
+        1 if preset == "import" else 2
+    )
+    assert db.execute("pragma temp_store").fetchone()[0] == 2
+
+
+def test_get_database__unknown_preset(tmp_path):
+    with pytest.raises(ValueError):
+        database.get_database(tmp_path / "test.db", preset="unknown")
+
+
+def test_get_ids_by_column(mock_db):
+    table = mock_db["items"]
+    table.insert_all(
+        [{"id": 1, "key": "a"}, {"id": 2, "key": "b"}, {"id": 3, "key": "c"}],
+        pk="id",
+    )
+
+    ids = database.get_ids_by_column("key", ["a", "c", "d", "a"], table=table)
+    assert ids == {"a": 1, "c": 3}
+
+
+def test_add_fetched_at_column(mock_db):
+    table = mock_db["items"]
+    table.insert({"id": 1, "updated_at": "2000-01-01T00:00:00"}, pk="id")
+
+    # Existing rows were last fetched when they were last updated.
+    database.add_fetched_at_column(table)
+    assert table.get(1)["fetched_at"] == "2000-01-01T00:00:00"
+
+    with mock_db.conn:
+        database.mark_fetched(
+            [1, 2], table=table, fetched_at=datetime.datetime(2023, 1, 1)
+        )
+
+    assert table.get(1) == {
+        "id": 1,
+        "updated_at": "2000-01-01T00:00:00",
+        "fetched_at": "2023-01-01T00:00:00",
+    }
+
+    # The column is only added, and backfilled, once.
+    database.add_fetched_at_column(table)
+    assert table.get(1)["fetched_at"] == "2023-01-01T00:00:00"
+
+
+def test_create_unique_index(mock_db):
+    items = mock_db["items"]
+    items.insert_all(
+        [
+            {"id": 1, "key": "a", "updated_at": "1"},
+            {"id": 2, "key": "a", "updated_at": "2"},
+            {"id": 3, "key": "b", "updated_at": "1"},
+            {"id": 4, "key": None, "updated_at": "1"},
+            {"id": 5, "key": None, "updated_at": "1"},
+        ],
+        pk="id",
+    )
+    mock_db["links"].insert_all(
+        [{"item_id": 1, "other": 1}, {"item_id": 2, "other": 1}],
+        pk=("item_id", "other"),
+    )
+    mock_db["children"].insert_all(
+        [{"id": 1, "item_id": 1}, {"id": 2, "item_id": 2}], pk="id"
+    )
+
+    database.create_unique_index(
+        items,
+        "key",
+        references=[("links", "item_id")],
+        dependents=[("children", "item_id")],
+    )
+
+    # The newest row for each key is kept, and rows without a key are left.
+    assert [row["id"] for row in items.rows] == [2, 3, 4, 5]
+    assert list(mock_db["links"].rows) == [{"item_id": 2, "other": 1}]
+    assert [row["id"] for row in mock_db["children"].rows] == [2]
+    assert any(index.unique for index in items.indexes)
+
+    # The index is only created once.
+    database.create_unique_index(items, "key")
+    assert len(items.indexes) == 1
+
+
+def test_upsert_records(mock_db):
+    table = mock_db["items"]
+    table.create(
+        {"id": int, "key": str, "created_at": str, "updated_at": str},
+        pk="id",
+    )
+
+    with mock_db.conn:
+        database.upsert_records(
+            [
+                {"id": None, "key": "a", "created_at": "1", "updated_at": "1"},
+                {"id": None, "key": "b", "created_at": "1", "updated_at": "1"},
+            ],
+            table=table,
+        )
+
+    assert table.count == 2
+
+    with mock_db.conn:
+        database.upsert_records(
+            [{"id": 1, "key": "c", "created_at": "2", "updated_at": "2"}],
+            table=table,
+        )
+
+    assert table.count == 2
+    assert table.get(1) == {
+        "id": 1,
+        "key": "c",
+        "created_at": "1",
+        "updated_at": "2",
+    }
+
+    # Unchanged rows aren't updated at all.
+    with mock_db.conn:
+        database.upsert_records(
+            [{"id": 1, "key": "c", "created_at": "3", "updated_at": "3"}],
+            table=table,
+        )
+
+    assert table.get(1)["updated_at"] == "2"
+
+
+def test_upsert_records__hash_column(mock_db):
+    table = mock_db["items"]
+    table.create(
+        {
+            "key": str,
+            "name": str,
+            "data": str,
+            "content_hash": str,
+            "updated_at": str,
+        },
+        pk="key",
+    )
+
+    def upsert(record):
+        with mock_db.conn:
+            database.upsert_records(
+                [record], table=table, pk="key", hash_column="content_hash"
+            )
+        return table.get("a")
+
+    row = upsert({"key": "a", "data": {"b": 1, "c": 2}, "updated_at": "1"})
+    assert row["content_hash"] == database.get_content_hash(
+        {"data": {"c": 2, "b": 1}}
+    )
+
+    # The same content, even in a different order, isn't rewritten.
+    total_changes = mock_db.conn.total_changes
+    row = upsert({"key": "a", "data": {"c": 2, "b": 1}, "updated_at": "2"})
+    assert row["updated_at"] == "1"
+    assert mock_db.conn.total_changes == total_changes
+
+    row = upsert({"key": "a", "data": {"b": 2}, "updated_at": "3"})
+    assert row["updated_at"] == "3"
+    assert row["data"] == '{"b": 2}'
+
+    # A record with only some of the columns has a different hash, but isn't
+    # written unless one of its columns has changed.
+    upsert({"key": "a", "name": "A", "data": {"b": 2}, "updated_at": "4"})
+    row = upsert({"key": "a", "name": "A", "updated_at": "5"})
+    assert row["updated_at"] == "4"
+
+    # A record hashed before it's written keeps its hash.
+    record = database.add_content_hash(
+        {"key": "a", "name": "A", "data": {"b": 2}, "updated_at": "6"},
+        pk="key",
+    )
+    row = upsert({**record, "data": "compressed"})
+    assert row["content_hash"] == database.get_content_hash(
+        {"name": "A", "data": {"b": 2}}
+    )
+
+
+def test_add_missing_columns(mock_db):
+    table = mock_db["items"]
+    table.create({"id": int}, pk="id")
+
+    database.add_missing_columns(table, {"id": int, "content_hash": str})
+    database.add_missing_columns(table, {"content_hash": str})
+
+    assert table.columns_dict == {"id": int, "content_hash": str}
+
+
+def test_upsert_records__without_updated_columns(mock_db):
+    table = mock_db["items"]
+    table.create({"a_id": int, "b_id": int}, pk=("a_id", "b_id"))
+
+    records = [{"a_id": 1, "b_id": 2}, {"a_id": 1, "b_id": 2}]
+    database.upsert_records(records, table=table, pk=("a_id", "b_id"))
+
+    assert table.count == 1
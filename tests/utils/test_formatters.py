@@ -0,0 +1,64 @@
+import json
+
+from librarian.utils import formatters
+
+ROWS = [
+    {"isbn": "9780000000001", "title": "A | B", "authors": "Author One"},
+    {"isbn": "9780000000002", "title": "C, D", "authors": None},
+]
+
+
+def test_format_rows_as_csv():
+    output = "".join(formatters.format_rows_as_csv(iter(ROWS)))
+    assert output.splitlines() == [
+        "isbn,title,authors",
+        "9780000000001,A | B,Author One",
+        '9780000000002,"C, D",',
+    ]
+
+
+def test_format_rows_as_json():
+    assert json.loads("".join(formatters.format_rows_as_json(ROWS))) == ROWS
+    assert json.loads("".join(formatters.format_rows_as_json([]))) == []
+
+
+def test_format_rows_as_json_lines():
+    lines = list(formatters.format_rows_as_json_lines(ROWS))
+    assert [json.loads(line) for line in lines] == ROWS
+
+
+def test_format_rows_as_markdown():
+    output = "".join(formatters.format_rows_as_markdown(ROWS))
+    assert output.splitlines() == [
+        "| isbn | title | authors |",
+        "|---|---|---|",
+        "| 9780000000001 | A \\| B | Author One |",
+        "| 9780000000002 | C, D |  |",
+    ]
+
+
+def test_format_rows_as_table():
+    output = "".join(
+        formatters.format_rows_as_table(
+            ROWS[:1],
+            headers={"isbn": "ISBN", "title": "Title"},
+            widths={"isbn": 13, "title": 3},
+        )
+    )
+    assert output.splitlines() == [
+        "+---------------+-----+",
+        "| ISBN          | Tit |",
+        "|               | le  |",
+        "+===============+=====+",
+        "| 9780000000001 | A | |",
+        "|               | B   |",
+        "+---------------+-----+",
+    ]
+
+
+def test_format_rows__is_lazy():
+    def rows():
+        yield ROWS[0]
+        raise AssertionError("The second row shouldn't have been read.")
+
+    assert next(formatters.format_rows_as_csv(rows())).startswith("isbn")
@@ -0,0 +1,81 @@
+import responses
+
+from librarian.utils import http_cache, http_client
+
+
+@responses.activate
+def test_http_client__cache_hit(tmp_path):
+    url = "https://example.com/"
+
+    responses.add(responses.Response(method="GET", url=url, json={"a": 1}))
+
+    cache = http_cache.HttpCache(path=tmp_path / "http.db")
+    client = http_client.HttpClient(cache=cache)
+
+    _, first_response = client.get(url=url, params={"q": "1"})
+    _, second_response = client.get(url=url, params={"q": "1"})
+
+    assert len(responses.calls) == 1
+    assert first_response.json() == second_response.json() == {"a": 1}
+
+    # Different query parameters are cached separately.
+    client.get(url=url, params={"q": "2"})
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_http_client__cache_revalidation(tmp_path):
+    url = "https://example.com/"
+
+    responses.add(
+        responses.Response(
+            method="GET", url=url, json={"a": 1}, headers={"ETag": '"abc"'}
+        )
+    )
+    responses.add(responses.Response(method="GET", url=url, status=304))
+
+    cache = http_cache.HttpCache(path=tmp_path / "http.db", ttl=0)
+    client = http_client.HttpClient(cache=cache)
+
+    client.get(url=url)
+    _, response = client.get(url=url)
+
+    assert len(responses.calls) == 2
+    assert responses.calls[1].request.headers["If-None-Match"] == '"abc"'
+    assert response.status_code == 200
+    assert response.json() == {"a": 1}
+
+
+@responses.activate
+def test_http_client__cache_eviction(tmp_path):
+    first_url = "https://example.com/one"
+    second_url = "https://example.com/two"
+
+    responses.add(responses.Response(method="GET", url=first_url))
+    responses.add(responses.Response(method="GET", url=second_url))
+
+    cache = http_cache.HttpCache(path=tmp_path / "http.db", max_entries=1)
+    client = http_client.HttpClient(cache=cache)
+
+    client.get(url=first_url)
+    client.get(url=second_url)
+    assert cache.table.count == 1
+
+    client.get(url=first_url)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_http_client__cache_skips_unsafe_methods(tmp_path):
+    url = "https://example.com/"
+
+    responses.add(responses.Response(method="POST", url=url))
+
+    cache = http_cache.HttpCache(path=tmp_path / "http.db")
+    client = http_client.HttpClient(cache=cache)
+
+    client.post(url=url)
+    client.post(url=url)
+
+    assert len(responses.calls) == 2
+    assert cache.table.count == 0
@@ -51,3 +51,53 @@ def test_http_client__class_functions(
 
     assert request.url == url
     assert request.method == http_method
+
+
+@responses.activate
+@pytest.mark.parametrize(
+    "max_retries, expected_calls, expected_status_code",
+    ((0, 1, 503), (1, 2, 429), (2, 3, 200)),
+)
+def test_http_client__retries(
+    mocker, max_retries, expected_calls, expected_status_code
+):
+    url = "https://example.com/"
+    sleep = mocker.patch("librarian.utils.http_client.time.sleep")
+
+    responses.add(responses.Response(method="GET", url=url, status=503))
+    responses.add(
+        responses.Response(
+            method="GET", url=url, status=429, headers={"Retry-After": "7"}
+        )
+    )
+    responses.add(responses.Response(method="GET", url=url, status=200))
+
+    client = http_client.HttpClient(max_retries=max_retries, backoff_factor=2)
+    _, response = client.get(url=url)
+
+    assert len(responses.calls) == expected_calls
+    assert response.status_code == expected_status_code
+
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert delays == [2, 7][: expected_calls - 1]
+
+
+def test_build_session():
+    session = http_client.build_session(pool_size=4)
+
+    adapter = session.get_adapter("https://example.com/")
+    assert adapter._pool_maxsize == 4  # type: ignore
+    assert adapter.max_retries.connect == http_client.CONNECTION_RETRIES
+    assert adapter.max_retries.status == 0
+
+
+@responses.activate
+def test_http_client__timeout():
+    url = "https://example.com/"
+    responses.add(responses.Response(method="GET", url=url))
+
+    client = http_client.HttpClient(timeout=(1.0, 2.0))
+    client.get(url)
+
+    request = responses.calls[0].request  # type: ignore
+    assert request.req_kwargs["timeout"] == (1.0, 2.0)
@@ -0,0 +1,24 @@
+import pytest
+
+from librarian.utils.parsing import Field, pick_fields
+
+
+def test_pick_fields():
+    payload = {"id": 1, "namevariations": ["A"], "uri": "/a", "unused": {}}
+    fields = (
+        Field("id"),
+        Field("namevariations", "name_variations"),
+        Field("uri", "url", lambda value: f"https://example.com{value}"),
+        Field("missing"),
+    )
+
+    assert pick_fields(payload, fields) == {
+        "id": 1,
+        "name_variations": ["A"],
+        "url": "https://example.com/a",
+    }
+
+
+def test_pick_fields__required():
+    with pytest.raises(KeyError):
+        pick_fields({}, (Field("id", required=True),))
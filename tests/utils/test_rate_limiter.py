@@ -0,0 +1,48 @@
+import pytest
+
+from librarian.utils import rate_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def test_token_bucket__acquire():
+    clock = FakeClock()
+    bucket = rate_limiter.TokenBucket(
+        rate=2, per=1, clock=clock, sleep=clock.sleep
+    )
+
+    # The first two requests are a burst, the next is paced.
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.now == 0
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(0.5)
+
+
+def test_token_bucket__update():
+    clock = FakeClock()
+    bucket = rate_limiter.TokenBucket(
+        rate=60, per=60, clock=clock, sleep=clock.sleep
+    )
+
+    bucket.update(limit=30, remaining=0)
+    assert bucket.capacity == 30
+
+    # With nothing remaining, we wait for a token at 30 per minute.
+    bucket.acquire()
+    assert clock.now == pytest.approx(2)
+
+
+def test_token_bucket__invalid_rate():
+    with pytest.raises(ValueError):
+        rate_limiter.TokenBucket(rate=0)